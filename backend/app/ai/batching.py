@@ -0,0 +1,124 @@
+"""
+Micro-Batching
+Coalesces concurrent single-item requests into batched calls on a worker pool
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Set, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Queue items and process them in batches
+
+    A batch is flushed when it reaches max_batch_size or when the oldest
+    queued item has waited max_wait_ms, whichever comes first. The batch
+    function runs on the given executor so the event loop never blocks on
+    it.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Sequence[R]],
+        executor: Executor,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher"
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            process_batch: Blocking function mapping a list of items to results
+                in the same order
+            executor: Executor the batch function runs on
+            max_batch_size: Largest batch to send in one call
+            max_wait_ms: Longest an item waits for the batch to fill
+            name: Name used in logs and stats
+        """
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        self._stats = {"items": 0, "batches": 0, "max_batch": 0}
+
+    async def submit(self, item: T) -> R:
+        """
+        Queue an item and wait for its result
+
+        Args:
+            item: Input item
+
+        Returns:
+            Result for the item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Send the queued items to the executor"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            self._stats["items"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]):
+        """Process one batch and resolve its futures"""
+        # Callers that gave up (e.g. client disconnect) are skipped
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor,
+                self.process_batch,
+                [item for item, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching counters"""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "queued": len(self._pending),
+            "avg_batch": round(self._stats["items"] / batches, 2) if batches else 0.0,
+        }
@@ -0,0 +1,182 @@
+"""
+BM25 Keyword Index
+Inverted index over legal section text for exact-term retrieval
+"""
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Common English words carrying no retrieval signal ("it" stays: IT Act)
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have he her his i in is its me my of on or our
+she that the their them they this to was we were which who whoever will with you your
+shall may any such other than under being been there into upon
+""".split())
+
+# Section numbers such as 66C, 303(2) or 117(2)(b) are kept whole
+_SECTION_NUMBER = re.compile(r"\b\d+[a-z]*(?:\(\w+\))*", re.IGNORECASE)
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms
+
+    Args:
+        text: Section or query text
+
+    Returns:
+        Lower-cased terms without stopwords; section numbers appear both
+        whole ("303(2)") and as their word parts ("303", "2")
+    """
+    text = text.lower()
+    terms = [t for t in _WORD.findall(text) if t not in STOPWORDS]
+    terms.extend(m for m in _SECTION_NUMBER.findall(text) if "(" in m)
+    return terms
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[List[Dict[str, Any]]],
+    k: int = 60,
+    top_k: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked result lists with reciprocal-rank fusion
+
+    Args:
+        result_lists: Ranked {"id", "score", "payload"} lists
+        k: RRF damping constant
+        top_k: Number of fused results
+
+    Returns:
+        Fused results; "score" is the RRF score scaled so that a result
+        ranked first in every list scores 1.0
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results):
+            key = str(result["id"])
+            entry = fused.setdefault(key, {"id": result["id"], "score": 0.0, "payload": result["payload"]})
+            entry["score"] += 1.0 / (k + rank + 1)
+
+    scale = (k + 1) / max(len(result_lists), 1)
+    ranked = sorted(fused.values(), key=lambda r: r["score"], reverse=True)[:top_k]
+    for result in ranked:
+        result["score"] = round(result["score"] * scale, 4)
+    return ranked
+
+
+class BM25Index:
+    """
+    In-memory Okapi BM25 index over section payloads
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize index
+
+        Args:
+            k1: Term-frequency saturation
+            b: Length normalization strength
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @staticmethod
+    def document_text(payload: Dict[str, Any]) -> str:
+        """Indexed text of a section payload"""
+        return " ".join(str(payload.get(field) or "") for field in (
+            "act_name",
+            "section_number",
+            "section_title",
+            "section_title",  # Titles are short and precise; count them twice
+            "section_description",
+        ))
+
+    def upsert(self, doc_id: Any, payload: Dict[str, Any]):
+        """
+        Index or re-index a section
+
+        Args:
+            doc_id: Point id shared with the vector store
+            payload: Section payload
+        """
+        doc_id = str(doc_id)
+        terms = Counter(tokenize(self.document_text(payload)))
+        with self._lock:
+            self._remove(doc_id)
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            length = sum(terms.values())
+            self._lengths[doc_id] = length
+            self._payloads[doc_id] = payload
+            self._total_length += length
+
+    def _remove(self, doc_id: str):
+        """Drop a document's postings (caller holds the lock)"""
+        if doc_id not in self._lengths:
+            return
+        for term in set(tokenize(self.document_text(self._payloads[doc_id]))):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._payloads[doc_id]
+
+    def search(
+        self,
+        query: str,
+        offense_type: Optional[str] = None,
+        top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank sections by BM25 score
+
+        Args:
+            query: Query text
+            offense_type: Optional payload offense_type filter
+            top_k: Number of results
+
+        Returns:
+            Results as {"id", "score", "payload"} dicts, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._lengths)
+            if not count or not terms:
+                return []
+            avg_length = self._total_length / count
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+            if offense_type is not None:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if self._payloads[doc_id].get("offense_type") == offense_type
+                }
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [
+                {"id": doc_id, "score": score, "payload": self._payloads[doc_id]}
+                for doc_id, score in ranked
+            ]
@@ -3,10 +3,13 @@ Incident Classification Model
 Classifies incidents into offense types and categories
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Set
 import re
 
 from app.ai.legal_extraction import IncidentClassification, ExtractedEntity
+from app.ai.keyword_automaton import KeywordAutomaton
+from app.ai.offense_classifier import OffenseClassifier
+from app.config import settings
 from app.core.exceptions import AIProcessingError
 
 logger = logging.getLogger(__name__)
@@ -73,6 +76,14 @@ class ClassificationModel:
     
     def __init__(self):
         """Initialize classification model"""
+        self._batch_matrices: Optional[Dict[str, Any]] = None
+        self.offense_classifier: Optional[OffenseClassifier] = None
+        if settings.OFFENSE_CLASSIFIER_ENABLED:
+            self.offense_classifier = OffenseClassifier(
+                settings.OFFENSE_CLASSIFIER_PATH,
+                min_confidence=settings.OFFENSE_CLASSIFIER_MIN_CONFIDENCE,
+                reload_interval=settings.OFFENSE_CLASSIFIER_RELOAD_INTERVAL
+            )
         logger.info("Classification model initialized")
     
     async def classify(
@@ -90,22 +101,30 @@ class ClassificationModel:
         Returns:
             IncidentClassification
         """
-        text_lower = text.lower()
+        # One pass over the text finds every offense, severity and threat keyword
+        found = KEYWORD_AUTOMATON.find(text.lower())
         
-        # Classify offense type
-        offense_type, confidence = self._classify_offense_type(text_lower)
+        # Classify offense type (trained model, keyword matching as fallback)
+        prediction = None
+        if self.offense_classifier is not None:
+            self.offense_classifier.start_watcher()
+            prediction = self.offense_classifier.predict(text)
+        if prediction is not None:
+            offense_type, confidence = prediction
+        else:
+            offense_type, confidence = self._classify_offense_type(found)
         
         # Determine category
         offense_category = self.CATEGORY_MAPPING.get(offense_type, "criminal")
         
         # Determine severity
-        severity_level = self._determine_severity(text_lower)
+        severity_level = self._determine_severity(found)
         
         # Extract keywords
-        keywords = self._extract_keywords(text_lower)
+        keywords = self._extract_keywords(found)
         
         # Detect threat indicators
-        threat_indicators = self._detect_threats(text_lower)
+        threat_indicators = self._detect_threats(found)
         
         return IncidentClassification(
             offense_type=offense_type,
@@ -116,12 +135,144 @@ class ClassificationModel:
             threat_indicators=threat_indicators
         )
     
-    def _classify_offense_type(self, text: str) -> tuple[str, float]:
+    def classify_batch(self, texts: Sequence[str]) -> List[IncidentClassification]:
+        """
+        Classify many incident texts at once (bulk reclassification)
+        
+        Each text is scanned once by the keyword automaton into a row of a
+        sparse keyword-presence matrix. Offense scores, severities and threat
+        indicators for every text then come from sparse matrix products, as
+        do offense predictions when a trained classifier is loaded. Results
+        match classify() text for text.
+        
+        Args:
+            texts: Incident texts
+            
+        Returns:
+            Classifications in input order
+        """
+        import numpy as np
+        from scipy import sparse
+        
+        if not texts:
+            return []
+        
+        matrices = self._get_batch_matrices()
+        column = matrices["column"]
+        columns: List[int] = []
+        indptr = [0]
+        for text in texts:
+            columns.extend(column[keyword] for keyword in KEYWORD_AUTOMATON.find(text.lower()))
+            indptr.append(len(columns))
+        
+        presence = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.float32), np.asarray(columns, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(texts), len(column))
+        )
+        rows = np.arange(len(texts))
+        
+        # Offense type: highest weighted score, first offense type on ties
+        offense_scores = presence @ matrices["offense"]
+        best = offense_scores.argmax(axis=1)
+        best_score = offense_scores[rows, best].astype(np.float64)
+        confidences = np.minimum(0.5 + best_score * 0.1, 0.95)
+        
+        # Severity: first level (critical to low) with any indicator, else medium
+        severity_hits = (presence @ matrices["severity"]) > 0
+        severity = np.where(severity_hits.any(axis=1), severity_hits.argmax(axis=1), -1)
+        
+        threat_hits = (presence @ matrices["threat"]) > 0
+        
+        if self.offense_classifier is not None:
+            predictions = self.offense_classifier.predict_batch(texts)
+        else:
+            predictions = [None] * len(texts)
+        
+        offense_types = matrices["offense_types"]
+        severity_levels = matrices["severity_levels"]
+        threat_types = matrices["threat_types"]
+        keyword_rank = matrices["keyword_rank"]
+        keywords = KEYWORD_AUTOMATON.keywords
+        
+        results = []
+        for i in range(len(texts)):
+            if predictions[i] is not None:
+                offense_type, confidence = predictions[i]
+            elif best_score[i] > 0:
+                offense_type = offense_types[best[i]]
+                confidence = float(confidences[i])
+            else:
+                offense_type, confidence = "general", 0.5
+            
+            row = columns[indptr[i]:indptr[i + 1]]
+            ranked = sorted((keyword_rank[c], c) for c in row if keyword_rank[c] >= 0)[:10]
+            
+            results.append(IncidentClassification(
+                offense_type=offense_type,
+                offense_category=self.CATEGORY_MAPPING.get(offense_type, "criminal"),
+                severity_level=severity_levels[severity[i]] if severity[i] >= 0 else "medium",
+                confidence_score=confidence,
+                keywords=[keywords[c] for _, c in ranked],
+                threat_indicators=[threat_types[j] for j in np.flatnonzero(threat_hits[i])]
+            ))
+        
+        return results
+    
+    def _get_batch_matrices(self) -> Dict[str, Any]:
+        """
+        Keyword-to-label weight matrices for classify_batch (built once)
+        
+        Returns:
+            Dict with the keyword column index, offense weight matrix,
+            severity and threat indicator matrices, label orders and the
+            rank of each keyword in keyword-extraction order
+        """
+        if self._batch_matrices is not None:
+            return self._batch_matrices
+        
+        import numpy as np
+        
+        keywords = KEYWORD_AUTOMATON.keywords
+        column = {keyword: i for i, keyword in enumerate(keywords)}
+        
+        def indicator(table: Dict[str, List[str]], weighted: bool = False) -> np.ndarray:
+            matrix = np.zeros((len(keywords), len(table)), dtype=np.float32)
+            for j, table_keywords in enumerate(table.values()):
+                for keyword in table_keywords:
+                    if weighted:
+                        # Weight longer keywords higher, as in _classify_offense_type
+                        matrix[column[keyword], j] += len(keyword.split())
+                    else:
+                        matrix[column[keyword], j] = 1
+            return matrix
+        
+        # Offense keywords in _extract_keywords order (first occurrence wins)
+        keyword_rank = [-1] * len(keywords)
+        rank = 0
+        for offense_keywords in self.OFFENSE_KEYWORDS.values():
+            for keyword in offense_keywords:
+                if keyword_rank[column[keyword]] < 0:
+                    keyword_rank[column[keyword]] = rank
+                    rank += 1
+        
+        self._batch_matrices = {
+            "column": column,
+            "offense": indicator(self.OFFENSE_KEYWORDS, weighted=True),
+            "severity": indicator(self.SEVERITY_INDICATORS),
+            "threat": indicator(self.THREAT_KEYWORDS),
+            "offense_types": list(self.OFFENSE_KEYWORDS),
+            "severity_levels": list(self.SEVERITY_INDICATORS),
+            "threat_types": list(self.THREAT_KEYWORDS),
+            "keyword_rank": keyword_rank,
+        }
+        return self._batch_matrices
+    
+    def _classify_offense_type(self, found: Set[str]) -> tuple[str, float]:
         """
         Classify the offense type
         
         Args:
-            text: Lowercase incident text
+            found: Keywords present in the incident text
             
         Returns:
             Tuple of (offense_type, confidence_score)
@@ -131,7 +282,7 @@ class ClassificationModel:
         for offense_type, keywords in self.OFFENSE_KEYWORDS.items():
             score = 0
             for keyword in keywords:
-                if keyword in text:
+                if keyword in found:
                     # Weight longer keywords higher
                     score += len(keyword.split())
             
@@ -150,29 +301,29 @@ class ClassificationModel:
         
         return offense_type, confidence
     
-    def _determine_severity(self, text: str) -> str:
+    def _determine_severity(self, found: Set[str]) -> str:
         """
         Determine severity level
         
         Args:
-            text: Lowercase incident text
+            found: Keywords present in the incident text
             
         Returns:
             Severity level
         """
         for severity, keywords in self.SEVERITY_INDICATORS.items():
             for keyword in keywords:
-                if keyword in text:
+                if keyword in found:
                     return severity
         
         return "medium"
     
-    def _extract_keywords(self, text: str) -> List[str]:
+    def _extract_keywords(self, found: Set[str]) -> List[str]:
         """
         Extract important keywords
         
         Args:
-            text: Lowercase incident text
+            found: Keywords present in the incident text
             
         Returns:
             List of keywords
@@ -181,17 +332,17 @@ class ClassificationModel:
         
         for offense_keywords in self.OFFENSE_KEYWORDS.values():
             for keyword in offense_keywords:
-                if keyword in text and keyword not in keywords:
+                if keyword in found and keyword not in keywords:
                     keywords.append(keyword)
         
         return keywords[:10]  # Limit to top 10
     
-    def _detect_threats(self, text: str) -> List[str]:
+    def _detect_threats(self, found: Set[str]) -> List[str]:
         """
         Detect threat indicators
         
         Args:
-            text: Lowercase incident text
+            found: Keywords present in the incident text
             
         Returns:
             List of threat types detected
@@ -200,9 +351,22 @@ class ClassificationModel:
         
         for threat_type, keywords in self.THREAT_KEYWORDS.items():
             for keyword in keywords:
-                if keyword in text:
+                if keyword in found:
                     if threat_type not in threats:
                         threats.append(threat_type)
                     break
         
         return threats
+
+
+# Every keyword table compiled once at import
+KEYWORD_AUTOMATON = KeywordAutomaton(
+    keyword
+    for table in (
+        ClassificationModel.OFFENSE_KEYWORDS,
+        ClassificationModel.SEVERITY_INDICATORS,
+        ClassificationModel.THREAT_KEYWORDS,
+    )
+    for keywords in table.values()
+    for keyword in keywords
+)
@@ -0,0 +1,331 @@
+"""
+Embedding Cache
+In-memory LRU in front of a persistent memory-mapped vector store
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Cache of text embeddings for one encoder model
+
+    Vectors live in a memory-mapped file (one row per text) with the row
+    order recorded in an append-only key log, so the store survives
+    restarts and is shared through the page cache by every worker. A row
+    is written before its key is logged, so a crash never leaves a key
+    pointing at an unwritten row. Writers from different worker processes
+    serialize on a file lock and pick up each other's rows from the log.
+
+    get() only reads memory and never waits on file I/O, so it is safe on
+    the event loop. Picking up other processes' rows (load_many) and
+    storing (put_many) touch files and locks and belong on a worker thread.
+    """
+
+    DTYPES = ("float16", "float32")
+
+    def __init__(
+        self,
+        directory: str,
+        model_name: str,
+        dtype: str = "float16",
+        lru_size: int = 4096,
+        initial_capacity: int = 1024
+    ):
+        """
+        Initialize embedding cache
+
+        Args:
+            directory: Root directory for cache files
+            model_name: Encoder model name (each model gets its own store)
+            dtype: On-disk vector precision ("float16" or "float32")
+            lru_size: Vectors kept in the in-memory LRU
+            initial_capacity: Rows allocated when the store is created
+        """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unknown embedding cache dtype: {dtype}")
+
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.lru_size = lru_size
+        self.initial_capacity = initial_capacity
+        self.path = os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._rows: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._dimension: Optional[int] = None
+        self._keys_offset = 0
+        self._logged_rows = 0
+        # Guards the in-memory state; never held across file I/O
+        self._lock = threading.Lock()
+        # Serializes this process's file work (sync, load, writes)
+        self._io_lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        os.makedirs(self.path, exist_ok=True)
+        # Another worker may be resetting or writing the store
+        with self._io_lock, self._write_lock():
+            self._load()
+
+    @staticmethod
+    def key(text: str) -> str:
+        """Hash a text into its cache key"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.bin")
+
+    @property
+    def _keys_path(self) -> str:
+        return os.path.join(self.path, "keys.log")
+
+    def _load(self):
+        """Open an existing store, discarding it if its format does not match (call under both I/O locks)"""
+        try:
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if meta.get("model") != self.model_name or meta.get("dtype") != self.dtype.name:
+            logger.info(f"Embedding cache format changed, rebuilding {self.path}")
+            self._reset()
+            return
+
+        self._dimension = meta["dimension"]
+        self._sync()
+        logger.info(f"Loaded {len(self._rows)} cached embeddings for {self.model_name}")
+
+    def _sync(self):
+        """Map any rows grown and read any keys logged by other processes (call under _io_lock)"""
+        row_bytes = self._dimension * self.dtype.itemsize
+        capacity = os.path.getsize(self._vectors_path) // row_bytes
+        vectors = self._vectors
+        if vectors is None or vectors.shape[0] != capacity:
+            vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self._dimension))
+
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # Only consume complete lines; a concurrent append may be mid-write
+        data = data[:data.rfind(b"\n") + 1]
+        self._keys_offset += len(data)
+        logged = {}
+        for line in data.splitlines():
+            key = line.decode("ascii", "ignore").strip()
+            if self._logged_rows < capacity:
+                logged.setdefault(key, self._logged_rows)
+            self._logged_rows += 1
+
+        with self._lock:
+            self._vectors = vectors
+            for key, row in logged.items():
+                self._rows.setdefault(key, row)
+
+    def _refresh(self):
+        """Pick up rows other processes stored, or a store they created (call under _io_lock)"""
+        if self._vectors is not None:
+            self._sync()
+        elif os.path.exists(self._meta_path):
+            with self._write_lock():
+                self._load()
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive lock across worker processes sharing the store"""
+        with open(os.path.join(self.path, ".lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reset(self):
+        """Remove the on-disk store (call under both I/O locks)"""
+        for path in (self._meta_path, self._vectors_path, self._keys_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with self._lock:
+            self._rows.clear()
+            self._vectors = None
+        self._dimension = None
+        self._keys_offset = 0
+        self._logged_rows = 0
+
+    def _create(self, dimension: int):
+        """Create an empty store for vectors of the given dimension"""
+        self._dimension = dimension
+        with open(self._meta_path, "w") as f:
+            json.dump({"model": self.model_name, "dtype": self.dtype.name, "dimension": dimension}, f)
+        open(self._keys_path, "w").close()
+        vectors = np.memmap(
+            self._vectors_path,
+            dtype=self.dtype,
+            mode="w+",
+            shape=(self.initial_capacity, dimension)
+        )
+        with self._lock:
+            self._vectors = vectors
+
+    def _grow(self):
+        """Double the store's row capacity"""
+        capacity = self._vectors.shape[0] * 2
+        self._vectors.flush()
+        with open(self._vectors_path, "r+b") as f:
+            f.truncate(capacity * self._dimension * self.dtype.itemsize)
+        # Readers holding the old map still see every row it covers
+        vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self._dimension))
+        with self._lock:
+            self._vectors = vectors
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU, evicting the least recently used vector"""
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        """Find a key in the LRU or the rows known so far, counting hits"""
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return vector
+
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            vector = np.array(self._vectors[row], dtype=np.float32)
+            self._remember(key, vector)
+            self._stats["disk_hits"] += 1
+            return vector
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding of a text among the rows already known
+
+        Never touches files or waits on a writer, so it can run on the
+        event loop. A None may still be stored by another process;
+        load_many() checks for that off the loop.
+
+        Args:
+            text: Encoded text
+
+        Returns:
+            float32 embedding, or None if not known to this process
+        """
+        return self._lookup(self.key(text))
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up several texts among the rows already known (None for each)"""
+        return [self.get(text) for text in texts]
+
+    def load_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up texts after picking up rows other processes stored
+
+        Reads the key log and may take the file lock, so call it from a
+        worker thread.
+
+        Args:
+            texts: Encoded texts
+
+        Returns:
+            float32 embeddings, None for each miss
+        """
+        with self._io_lock:
+            self._refresh()
+
+        vectors = [self._lookup(self.key(text)) for text in texts]
+        misses = sum(vector is None for vector in vectors)
+        with self._lock:
+            self._stats["misses"] += misses
+        return vectors
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]):
+        """
+        Store embeddings
+
+        Args:
+            texts: Encoded texts
+            vectors: Their embeddings, in the same order
+        """
+        with self._io_lock, self._write_lock():
+            if self._vectors is None and os.path.exists(self._meta_path):
+                self._load()
+            elif self._vectors is not None:
+                self._sync()
+
+            keyed = [(self.key(text), np.asarray(vector, dtype=np.float32)) for text, vector in zip(texts, vectors)]
+            new_rows = {}
+            for key, vector in keyed:
+                if key in self._rows or key in new_rows:
+                    continue
+
+                if self._vectors is None:
+                    self._create(vector.shape[-1])
+                if vector.shape[-1] != self._dimension:
+                    logger.warning(f"Embedding dimension {vector.shape[-1]} does not match cache ({self._dimension})")
+                    continue
+
+                row = self._logged_rows + len(new_rows)
+                if row >= self._vectors.shape[0]:
+                    self._grow()
+                self._vectors[row] = vector
+                new_rows[key] = row
+
+            if new_rows:
+                self._vectors.flush()
+                with open(self._keys_path, "ab") as f:
+                    f.write("".join(k + "\n" for k in new_rows).encode("ascii"))
+                    self._keys_offset = f.tell()
+                self._logged_rows += len(new_rows)
+
+            # Rows are published only after they are written
+            with self._lock:
+                self._rows.update(new_rows)
+                for key, vector in keyed:
+                    self._remember(key, vector)
+                self._stats["writes"] += len(new_rows)
+
+    def put(self, text: str, vector: np.ndarray):
+        """Store one embedding"""
+        self.put_many([text], [vector])
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters (misses are counted by load_many)"""
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        hits = lookups - self._stats["misses"]
+        return {
+            **self._stats,
+            "memory_size": len(self._lru),
+            "disk_size": len(self._rows),
+            "dtype": self.dtype.name,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,201 @@
+"""
+Embedding Service
+Batched, non-blocking query embeddings on a dedicated thread pool
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.ai.batching import MicroBatcher
+from app.ai.embedding_cache import EmbeddingCache
+from app.ai.encoder import get_encoder
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """
+    Encode texts with the shared encoder, batching concurrent requests
+
+    One forward pass over a batch of N short queries costs far less than N
+    single-query passes on CPU, so requests arriving within a few
+    milliseconds of each other are encoded together. Texts seen before are
+    served from the embedding cache without touching the encoder.
+
+    The encoder is resolved on first use on the worker pool (load()), so
+    building the service never loads model weights on the event loop.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        threads: int = 1,
+        cache: Optional[EmbeddingCache] = None
+    ):
+        """
+        Initialize embedding service
+
+        Args:
+            model_name: SentenceTransformer model name (defaults to ENCODER_MODEL)
+            max_batch_size: Largest batch per encode call
+            max_wait_ms: Longest a request waits for its batch to fill
+            threads: Worker threads running encode calls
+            cache: Optional embedding cache
+        """
+        self.model_name = model_name or settings.ENCODER_MODEL
+        self.encoder = None
+        self._encoder_resolved = False
+        self.cache = cache
+        # The encoder is already multi-threaded internally; one worker avoids oversubscription
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="embedding")
+        self.batcher = MicroBatcher(
+            self._encode_batch,
+            self.executor,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            name="embeddings"
+        )
+
+    @property
+    def available(self) -> bool:
+        """Check whether an encoder is loaded"""
+        return self.encoder is not None
+
+    async def load(self) -> bool:
+        """
+        Resolve the encoder off the event loop, loading it on first use
+
+        Returns:
+            True when an encoder is available
+        """
+        if not self._encoder_resolved:
+            loop = asyncio.get_running_loop()
+            self.encoder = await loop.run_in_executor(self.executor, get_encoder, self.model_name)
+            self._encoder_resolved = True
+        return self.encoder is not None
+
+    def _encode_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Encode a batch of texts (runs on the worker pool)
+
+        Texts another worker process already stored are read from the
+        cache instead of encoded; this is where the cache touches files.
+        """
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        if self.cache is not None:
+            try:
+                vectors = self.cache.load_many(texts)
+            except Exception as e:
+                logger.warning(f"Failed to read embeddings from cache: {e}")
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = list(self.encoder.encode(missing_texts, batch_size=len(missing_texts)))
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+            if self.cache is not None:
+                try:
+                    self.cache.put_many(missing_texts, encoded)
+                except Exception as e:
+                    logger.warning(f"Failed to store embeddings in cache: {e}")
+        return vectors
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Encode one text
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Embedding vector, or None when the encoder is unavailable
+        """
+        if not await self.load():
+            return None
+        if self.cache is not None:
+            # Memory only; misses are re-checked against disk on the worker
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
+        return await self.batcher.submit(text)
+
+    async def embed_many(self, texts: List[str]) -> Optional[List[np.ndarray]]:
+        """
+        Encode a batch of texts in one call (bulk ingestion)
+
+        Cached texts are skipped; the rest bypass the micro-batcher since
+        they already form a full batch.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Embeddings in input order, or None when the encoder is unavailable
+        """
+        if not await self.load():
+            return None
+
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        if self.cache is not None:
+            vectors = self.cache.get_many(texts)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            loop = asyncio.get_running_loop()
+            encoded = await loop.run_in_executor(
+                self.executor,
+                self._encode_batch,
+                [texts[i] for i in missing]
+            )
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+        return vectors
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching counters"""
+        return {
+            "model": self.model_name,
+            **self.batcher.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+# Singleton instance
+_embedding_service: Optional[EmbeddingService] = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """
+    Get singleton instance of the embedding service
+
+    Returns:
+        EmbeddingService instance
+    """
+    global _embedding_service
+    if _embedding_service is None:
+        cache = None
+        if settings.EMBEDDING_CACHE_ENABLED:
+            try:
+                cache = EmbeddingCache(
+                    settings.EMBEDDING_CACHE_DIR,
+                    settings.ENCODER_MODEL,
+                    dtype=settings.EMBEDDING_CACHE_DTYPE,
+                    lru_size=settings.EMBEDDING_CACHE_LRU_SIZE
+                )
+            except Exception as e:
+                logger.warning(f"Embedding cache unavailable: {e}")
+
+        _embedding_service = EmbeddingService(
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+            threads=settings.EMBEDDING_THREADS,
+            cache=cache
+        )
+    return _embedding_service
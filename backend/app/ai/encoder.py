@@ -0,0 +1,117 @@
+"""
+Shared Sentence Encoder
+Loads the SentenceTransformer model once per process and tracks warm-up
+"""
+import gc
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Representative inputs for the warm-up batch
+WARMUP_TEXTS = [
+    "Someone stole my phone from my bag at the bus stand yesterday evening.",
+    "I received a call asking for my OTP and money was debited from my account.",
+    "My neighbour threatened to beat me and damaged my car.",
+    "The seller refuses to replace a defective refrigerator under warranty.",
+]
+
+_encoders: Dict[str, Any] = {}
+_lock = threading.Lock()
+_status = {"state": "cold", "model": None, "error": None}
+
+
+def get_encoder(model_name: Optional[str] = None):
+    """
+    Get the process-wide encoder, loading it on first use
+
+    Args:
+        model_name: SentenceTransformer model name (defaults to ENCODER_MODEL)
+
+    Returns:
+        SentenceTransformer instance, or None if it cannot be loaded
+    """
+    model_name = model_name or settings.ENCODER_MODEL
+    encoder = _encoders.get(model_name)
+    if encoder is not None:
+        return encoder
+
+    with _lock:
+        if model_name in _encoders:
+            return _encoders[model_name]
+        try:
+            from sentence_transformers import SentenceTransformer
+            logger.info(f"Loading sentence encoder: {model_name}")
+            encoder = SentenceTransformer(model_name)
+        except Exception as e:
+            logger.error(f"Failed to load sentence encoder {model_name}: {e}")
+            _status.update(state="failed", model=model_name, error=str(e))
+            return None
+        _encoders[model_name] = encoder
+        if _status["state"] != "loading":
+            _status.update(state="ready", model=model_name, error=None)
+        return encoder
+
+
+def warm_up(model_name: Optional[str] = None) -> bool:
+    """
+    Load the encoder and run a warm-up batch (blocking)
+
+    The first encode call allocates buffers and initializes kernels, so it
+    is paid here rather than by the first user request.
+
+    Args:
+        model_name: SentenceTransformer model name (defaults to ENCODER_MODEL)
+
+    Returns:
+        True when the encoder is ready
+    """
+    model_name = model_name or settings.ENCODER_MODEL
+    _status.update(state="loading", model=model_name, error=None)
+
+    encoder = get_encoder(model_name)
+    if encoder is None:
+        return False
+
+    try:
+        batch_size = max(1, settings.ENCODER_WARMUP_BATCH_SIZE)
+        texts = (WARMUP_TEXTS * (batch_size // len(WARMUP_TEXTS) + 1))[:batch_size]
+        encoder.encode(texts, batch_size=batch_size)
+    except Exception as e:
+        logger.error(f"Encoder warm-up failed: {e}")
+        _status.update(state="failed", error=str(e))
+        return False
+
+    _status["state"] = "ready"
+    logger.info(f"Sentence encoder {model_name} warmed up")
+    return True
+
+
+def preload():
+    """
+    Load the encoder before workers fork
+
+    With a preloading process manager (e.g. gunicorn --preload with uvicorn
+    workers) the model weights are then shared copy-on-write. Freezing the
+    garbage collector keeps the collector from touching, and so copying,
+    those pages in every worker.
+    """
+    if warm_up():
+        gc.freeze()
+
+
+def is_ready() -> bool:
+    """Check whether requests can be served without a cold encoder load"""
+    if not settings.ENCODER_WARMUP_ENABLED:
+        return True
+    # A failed load degrades vector search to fallbacks but should not block traffic
+    return _status["state"] in ("ready", "failed")
+
+
+def encoder_status() -> Dict[str, Any]:
+    """Get encoder load state"""
+    return dict(_status)
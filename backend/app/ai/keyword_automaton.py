@@ -0,0 +1,81 @@
+"""
+Keyword Automaton
+Single-pass multi-keyword matching for incident classification
+"""
+import re
+from typing import Dict, Iterable, List, Set
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex source for a keyword trie
+
+    Shared prefixes are factored out, so re follows one path per character
+    instead of trying every keyword at each position. Optional tails are
+    greedy, which makes each match the longest keyword at its position.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """
+    Find which of a fixed set of keywords occur in a text
+
+    All keywords are compiled into one trie-shaped pattern that re runs in
+    a single pass. A keyword only matches where it starts a word ("hit"
+    no longer fires inside "white"), but it may run into a longer word, so
+    stems such as "harass" still match "harassed".
+
+    Because matches are anchored at word starts, every keyword found at a
+    position is a prefix of the longest keyword found there, so the failure
+    links of a full Aho-Corasick automaton are not needed.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile the keyword set
+
+        Args:
+            keywords: Keywords (lowercase, starting with a word character)
+        """
+        self.keywords = sorted(set(keywords))
+        # Keywords implied by a longest match: itself and every keyword it starts with
+        self._implied: Dict[str, List[str]] = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+        self._pattern = re.compile(r"\b(?=(" + _trie_pattern(self.keywords) + "))")
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Keywords occurring in text
+
+        Args:
+            text: Lowercase text
+
+        Returns:
+            Set of matched keywords
+        """
+        found: Set[str] = set()
+        for match in self._pattern.finditer(text):
+            longest = match.group(1)
+            if longest not in found:
+                found.update(self._implied[longest])
+        return found
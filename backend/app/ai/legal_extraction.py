@@ -2,13 +2,22 @@
 Legal Section Extraction Engine
 Combines NER, Classification, Vector Search, and LLM Reasoning
 """
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+from dataclasses import dataclass, field
+import hashlib
 import re
 
 from app.config import settings
 from app.core.exceptions import AIProcessingError
+from app.ai.pipeline import StageGraph
+from app.ai.singleflight import SingleFlight
+
+try:
+    from app.ai.prompts_config import ANALYSIS_MODE
+except ImportError:
+    ANALYSIS_MODE = "MULTI_CALL"
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +67,7 @@ class LegalAnalysisResult:
     required_documents: List[str]
     next_steps: List[str]
     ai_summary: str
+    previous_judgments: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class LegalExtractionEngine:
@@ -65,12 +75,18 @@ class LegalExtractionEngine:
     Main engine for legal section extraction and analysis
     """
     
+    # Use a specific phrase that only appears in refusal, not in polite intros
+    REFUSAL_MARKER = "I cannot assist with general conversation"
+    
     def __init__(self):
         """Initialize the legal extraction engine"""
         self.ner_model = None
         self.classification_model = None
         self.vector_search = None
         self.llm_client = None
+        self.semantic_cache = None
+        self.inflight = SingleFlight("analyze_incident", copy_results=True)
+        self.analysis_mode = ANALYSIS_MODE
         self._initialize_models()
     
     def _initialize_models(self):
@@ -87,6 +103,15 @@ class LegalExtractionEngine:
             self.vector_search = VectorSearch()
             self.llm_client = LLMReasoning()
             
+            if settings.SEMANTIC_CACHE_ENABLED:
+                from app.ai.semantic_cache import SemanticCache
+                self.semantic_cache = SemanticCache(
+                    capacity=settings.SEMANTIC_CACHE_CAPACITY,
+                    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                    ttl_seconds=settings.SEMANTIC_CACHE_TTL,
+                    eviction_policy=settings.SEMANTIC_CACHE_EVICTION
+                )
+            
             logger.info("Legal extraction engine initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize legal extraction engine: {e}")
@@ -116,70 +141,440 @@ class LegalExtractionEngine:
             # Step 1: Preprocess text
             cleaned_text = self._preprocess_text(incident_text)
             
-            # Step 2: Extract entities
+            # Duplicate submissions (double-clicks, client retries) share one run
+            request_key = hashlib.sha256("\x1f".join([
+                cleaned_text.lower(),
+                location or "",
+                incident_date or "",
+                police_station_context
+            ]).encode("utf-8")).hexdigest()
+            
+            return await self.inflight.do(
+                request_key,
+                lambda: self._run_analysis(cleaned_text, location, incident_date, police_station_context)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error analyzing incident: {e}", exc_info=True)
+            raise AIProcessingError(f"Failed to analyze incident: {str(e)}")
+    
+    async def _run_analysis(
+        self,
+        cleaned_text: str,
+        location: Optional[str],
+        incident_date: Optional[str],
+        police_station_context: str
+    ) -> LegalAnalysisResult:
+        """
+        Run the analysis pipeline for preprocessed text
+        
+        Args:
+            cleaned_text: Preprocessed incident text
+            location: Optional location information
+            incident_date: Optional incident date
+            police_station_context: Nearest police station hint
+            
+        Returns:
+            LegalAnalysisResult
+        """
+        cache_hit, initial_results, embedding, cache_partition = await self._lookup_semantic_cache(
+            cleaned_text,
+            location,
+            incident_date,
+            police_station_context
+        )
+        
+        # Steps 2-7 run as a dependency graph so independent LLM calls overlap
+        graph = self._build_analysis_graph(
+            cleaned_text,
+            location,
+            incident_date,
+            police_station_context,
+            cached_sections=cache_hit
+        )
+        results = await graph.run(initial_results=initial_results)
+        result = self._assemble_result(results)
+        
+        if embedding is not None and not cache_hit:
+            self._insert_semantic_cache(embedding, result, cache_partition)
+        
+        return result
+    
+    async def _lookup_semantic_cache(
+        self,
+        cleaned_text: str,
+        location: Optional[str],
+        incident_date: Optional[str],
+        police_station_context: str
+    ) -> Tuple[bool, Dict[str, Any], Any, str]:
+        """
+        Check the semantic cache for a near-identical previous analysis
+        
+        Entities and classification are local and cheap, so with the cache
+        enabled they run up front and a cached analysis is only reused for the
+        same offense type and request context. Only the legal sections and
+        judgments are reused: the summary and guidance quote the incident
+        (names, amounts, places), so they are always generated for this text.
+        
+        Args:
+            cleaned_text: Preprocessed incident text
+            location: Optional location information
+            incident_date: Optional incident date
+            police_station_context: Nearest police station hint
+            
+        Returns:
+            Tuple of (cache hit, precomputed stage results, embedding or
+            None, cache partition)
+        """
+        if self.semantic_cache is None:
+            return False, {}, None, ""
+        
+        embedding = await self.vector_search.embed(cleaned_text)
+        if embedding is None:
+            return False, {}, None, ""
+        
+        entities = await self._extract_entities(cleaned_text)
+        classification = await self._classify_incident(cleaned_text, entities)
+        initial_results = {"entities": entities, "classification": classification}
+        cache_partition = "|".join([
+            classification.offense_type,
+            location or "",
+            incident_date or "",
+            police_station_context
+        ])
+        
+        cached = self.semantic_cache.lookup(embedding, cache_partition)
+        if cached is not None:
+            logger.info("Semantic cache hit, reusing previous legal sections")
+            initial_results.update(cached)
+        
+        return cached is not None, initial_results, embedding, cache_partition
+    
+    def _insert_semantic_cache(self, embedding: Any, result: LegalAnalysisResult, cache_partition: str):
+        """
+        Cache the incident-independent parts of an analysis
+        
+        Args:
+            embedding: Incident embedding
+            result: Completed analysis
+            cache_partition: Partition from _lookup_semantic_cache
+        """
+        if result.classification.offense_type == "non-legal":
+            return
+        self.semantic_cache.insert(
+            embedding,
+            {"sections": result.legal_sections, "judgments": result.previous_judgments},
+            cache_partition
+        )
+    
+    async def analyze_incident_stream(
+        self,
+        incident_text: str,
+        location: Optional[str] = None,
+        incident_date: Optional[str] = None,
+        police_station_context: str = ""
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Analyze an incident, yielding partial results as each stage completes
+        
+        Args:
+            incident_text: Incident description in plain text
+            location: Optional location information
+            incident_date: Optional incident date
+            police_station_context: Nearest police station hint
+            
+        Yields:
+            (event, payload) tuples: "entities", "classification", "sections",
+            "summary_delta" / "summary_fallback" text chunks, and finally
+            "complete" with the full LegalAnalysisResult (including judgments)
+        """
+        logger.info("Starting streaming incident analysis")
+        cleaned_text = self._preprocess_text(incident_text)
+        
+        cache_hit, initial_results, embedding, cache_partition = await self._lookup_semantic_cache(
+            cleaned_text,
+            location,
+            incident_date,
+            police_station_context
+        )
+        
+        for name in ("entities", "classification", "sections"):
+            if name in initial_results:
+                yield name, initial_results[name]
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def streaming_summary_stage(classification, sections=None):
+            chunks = []
+            async for event, text in self.llm_client.stream_analysis_summary(
+                cleaned_text,
+                classification,
+                sections or [],
+                location=location,
+                incident_date=incident_date
+            ):
+                if event == "fallback":
+                    chunks = [text]
+                    queue.put_nowait(("summary_fallback", text))
+                else:
+                    chunks.append(text)
+                    queue.put_nowait(("summary_delta", text))
+            return "".join(chunks)
+        
+        # A single-shot summary arrives whole with the structured response
+        single_shot = self.analysis_mode == "SINGLE_SHOT" and not cache_hit
+        graph = self._build_analysis_graph(
+            cleaned_text,
+            location,
+            incident_date,
+            police_station_context,
+            summary_stage=None if single_shot else streaming_summary_stage,
+            cached_sections=cache_hit
+        )
+        
+        # Guidance and judgments are discarded on refusal, so they wait for the final result
+        streamed_stages = {"entities", "classification", "sections"}
+        
+        def on_stage_complete(name: str, result: Any):
+            if name in streamed_stages:
+                queue.put_nowait((name, result))
+            elif name == "summary" and single_shot:
+                queue.put_nowait(("summary_fallback", result))
+        
+        done = object()
+        run = asyncio.create_task(
+            graph.run(on_stage_complete=on_stage_complete, initial_results=initial_results)
+        )
+        run.add_done_callback(lambda _: queue.put_nowait((done, None)))
+        
+        try:
+            while True:
+                event, payload = await queue.get()
+                if event is done:
+                    break
+                yield event, payload
+            
+            try:
+                results = run.result()
+            except Exception as e:
+                logger.error(f"Error analyzing incident: {e}", exc_info=True)
+                raise AIProcessingError(f"Failed to analyze incident: {str(e)}")
+            
+            result = self._assemble_result(results)
+            if embedding is not None and not cache_hit:
+                self._insert_semantic_cache(embedding, result, cache_partition)
+            
+            yield "complete", result
+        finally:
+            if not run.done():
+                run.cancel()
+    
+    def _build_analysis_graph(
+        self,
+        cleaned_text: str,
+        location: Optional[str],
+        incident_date: Optional[str],
+        police_station_context: str,
+        summary_stage: Optional[Callable[..., Awaitable[str]]] = None,
+        cached_sections: bool = False
+    ) -> StageGraph:
+        """
+        Build the analysis stage graph
+        
+        Guidance, summary and judgments only depend on the classification (and
+        judgments on the sections), so they run alongside section refinement.
+        When the classification has no legal keywords, guidance and judgments
+        first wait for the summary and are skipped if it refuses the query.
+        In SINGLE_SHOT mode sections, summary and guidance come from one
+        structured LLM response instead of three calls, unless the sections
+        and judgments come from the semantic cache; then only summary and
+        guidance run.
+        
+        Args:
+            cleaned_text: Preprocessed incident text
+            location: Optional location information
+            incident_date: Optional incident date
+            police_station_context: Nearest police station hint
+            summary_stage: Optional replacement for the summary stage (streaming,
+                MULTI_CALL mode or cached sections only)
+            cached_sections: Sections and judgments are passed as initial results
+            
+        Returns:
+            StageGraph ready to run
+        """
+        async def entities_stage():
             entities = await self._extract_entities(cleaned_text)
             logger.info(f"Extracted {len(entities)} entities")
-            
-            # Step 3: Classify incident
+            return entities
+        
+        async def classification_stage(entities):
             classification = await self._classify_incident(cleaned_text, entities)
             logger.info(f"Classified as: {classification.offense_type}")
-            
-            # Step 4: Find relevant legal sections
+            return classification
+        
+        async def sections_stage(classification, entities):
             legal_sections = await self._find_legal_sections(
                 cleaned_text,
                 classification,
                 entities
             )
             logger.info(f"Found {len(legal_sections)} relevant legal sections")
-            
-            # Step 5: Generate AI summary and recommendations
-            ai_summary = await self._generate_summary(
+            return legal_sections
+        
+        async def default_summary_stage(classification, sections=None):
+            return await self._generate_summary(
                 cleaned_text,
                 classification,
-                legal_sections
+                sections or [],
+                location=location,
+                incident_date=incident_date
             )
-
-            # CHECK FOR REFUSAL: If AI refuses, clear all other fields
-            # Use a specific phrase that only appears in refusal, not in polite intros
-            refusal_marker = "I cannot assist with general conversation"
-            if refusal_marker in ai_summary:
-                logger.info("AI refused to analyze non-legal query")
-                legal_sections = []
-                required_documents = []
-                next_steps = []
-                # Mark classification as invalid to prevent downstream judgment search
-                classification.offense_type = "non-legal"
-                classification.offense_category = "invalid"
-            else:
-                # Step 6 & 7: Generate practical guidance via LLM (Only if valid)
-                guidance = await self.llm_client.generate_practical_guidance(
+        
+        # Guidance and judgments are discarded when the summary refuses a
+        # non-legal query. If the classification found no legal signal they
+        # wait for the summary instead of spending LLM calls alongside it.
+        summary_done = asyncio.get_running_loop().create_future()
+        
+        def track_summary(stage: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+            async def tracked_summary_stage(**inputs):
+                try:
+                    summary = await stage(**inputs)
+                except BaseException:
+                    if not summary_done.done():
+                        summary_done.cancel()
+                    raise
+                if not summary_done.done():
+                    summary_done.set_result(summary)
+                return summary
+            return tracked_summary_stage
+        
+        async def refused(classification) -> bool:
+            if classification.keywords or classification.offense_type != "general":
+                return False
+            try:
+                summary = await asyncio.shield(summary_done)
+            except asyncio.CancelledError:
+                if summary_done.cancelled():
+                    return False
+                raise
+            return self.REFUSAL_MARKER in summary
+        
+        async def guidance_stage(classification):
+            if await refused(classification):
+                return {}
+            return await self.llm_client.generate_practical_guidance(
+                cleaned_text,
+                classification,
+                police_station_context
+            )
+        
+        async def judgments_stage(classification, sections):
+            if await refused(classification):
+                return []
+            return await self.llm_client.generate_relevant_judgments(
+                incident_text=cleaned_text,
+                offense_type=classification.offense_type,
+                legal_sections=[
+                    {'act_name': s.act_name, 'section_number': s.section_number}
+                    for s in sections
+                ]
+            )
+        
+        graph = StageGraph()
+        graph.add("entities", entities_stage)
+        graph.add("classification", classification_stage, depends_on=("entities",))
+        
+        if self.analysis_mode == "SINGLE_SHOT" and not cached_sections:
+            async def retrieval_stage(classification):
+                return await self._retrieve_candidates(cleaned_text, classification)
+            
+            async def structured_stage(classification, retrieval):
+                return await self.llm_client.generate_structured_analysis(
                     cleaned_text,
                     classification,
-                    police_station_context
+                    retrieval,
+                    location=location,
+                    incident_date=incident_date,
+                    police_station_context=police_station_context
                 )
-                
-                required_documents = guidance.get('required_documents', [])
-                next_steps = guidance.get('next_steps', [])
-                
-                # Fallback to rule-based if LLM extraction failed
-                if not required_documents:
-                    required_documents = self._get_required_documents(classification, legal_sections)
-                
-                if not next_steps:
-                    next_steps = self._generate_next_steps(classification, legal_sections)
-            
-            return LegalAnalysisResult(
-                classification=classification,
-                entities=entities,
-                legal_sections=legal_sections,
-                required_documents=required_documents,
-                next_steps=next_steps,
-                ai_summary=ai_summary
-            )
             
-        except Exception as e:
-            logger.error(f"Error analyzing incident: {e}", exc_info=True)
-            raise AIProcessingError(f"Failed to analyze incident: {str(e)}")
+            async def structured_sections_stage(structured):
+                logger.info(f"Found {len(structured['legal_sections'])} relevant legal sections")
+                return structured["legal_sections"]
+            
+            async def structured_summary_stage(structured):
+                return structured["ai_summary"]
+            
+            async def structured_guidance_stage(structured):
+                return {
+                    "next_steps": structured["next_steps"],
+                    "required_documents": structured["required_documents"]
+                }
+            
+            graph.add("retrieval", retrieval_stage, depends_on=("classification",))
+            graph.add("structured", structured_stage, depends_on=("classification", "retrieval"))
+            graph.add("sections", structured_sections_stage, depends_on=("structured",))
+            graph.add("summary", track_summary(structured_summary_stage), depends_on=("structured",))
+            graph.add("guidance", structured_guidance_stage, depends_on=("structured",))
+        else:
+            # The LLM summary does not read the sections; only the offline fallback does
+            summary_deps = ("classification",)
+            if self.llm_client.provider == "fallback":
+                summary_deps = ("classification", "sections")
+            
+            graph.add("sections", sections_stage, depends_on=("classification", "entities"))
+            graph.add("summary", track_summary(summary_stage or default_summary_stage), depends_on=summary_deps)
+            graph.add("guidance", guidance_stage, depends_on=("classification",))
+        
+        graph.add("judgments", judgments_stage, depends_on=("classification", "sections"))
+        return graph
+    
+    def _assemble_result(self, results: Dict[str, Any]) -> LegalAnalysisResult:
+        """
+        Combine stage results into the final analysis
+        
+        Args:
+            results: Stage name to result mapping from the analysis graph
+            
+        Returns:
+            LegalAnalysisResult
+        """
+        classification = results["classification"]
+        legal_sections = results["sections"]
+        ai_summary = results["summary"]
+        
+        # CHECK FOR REFUSAL: If AI refuses, clear all other fields
+        if self.REFUSAL_MARKER in ai_summary:
+            logger.info("AI refused to analyze non-legal query")
+            legal_sections = []
+            required_documents = []
+            next_steps = []
+            previous_judgments = []
+            # Mark classification as invalid to prevent downstream judgment search
+            classification.offense_type = "non-legal"
+            classification.offense_category = "invalid"
+        else:
+            guidance = results["guidance"]
+            required_documents = guidance.get('required_documents', [])
+            next_steps = guidance.get('next_steps', [])
+            previous_judgments = results["judgments"]
+            
+            # Fallback to rule-based if LLM extraction failed
+            if not required_documents:
+                required_documents = self._get_required_documents(classification, legal_sections)
+            
+            if not next_steps:
+                next_steps = self._generate_next_steps(classification, legal_sections)
+        
+        return LegalAnalysisResult(
+            classification=classification,
+            entities=results["entities"],
+            legal_sections=legal_sections,
+            required_documents=required_documents,
+            next_steps=next_steps,
+            ai_summary=ai_summary,
+            previous_judgments=previous_judgments
+        )
     
     def _preprocess_text(self, text: str) -> str:
         """
@@ -284,11 +679,38 @@ class LegalExtractionEngine:
             logger.error(f"Legal section search failed: {e}")
             return []
     
+    async def _retrieve_candidates(
+        self,
+        text: str,
+        classification: IncidentClassification
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve candidate legal sections from the vector store
+        
+        Args:
+            text: Incident text
+            classification: Incident classification
+            
+        Returns:
+            Vector search results (empty on failure)
+        """
+        try:
+            return await self.vector_search.search_legal_sections(
+                text,
+                classification.offense_type,
+                top_k=10
+            )
+        except Exception as e:
+            logger.error(f"Legal section retrieval failed: {e}")
+            return []
+    
     async def _generate_summary(
         self,
         text: str,
         classification: IncidentClassification,
-        legal_sections: List[LegalSection]
+        legal_sections: List[LegalSection],
+        location: Optional[str] = None,
+        incident_date: Optional[str] = None
     ) -> str:
         """
         Generate AI summary of the legal analysis
@@ -297,6 +719,8 @@ class LegalExtractionEngine:
             text: Incident text
             classification: Classification result
             legal_sections: Found legal sections
+            location: Optional location information
+            incident_date: Optional incident date
             
         Returns:
             AI-generated summary
@@ -305,7 +729,9 @@ class LegalExtractionEngine:
             summary = await self.llm_client.generate_analysis_summary(
                 text,
                 classification,
-                legal_sections
+                legal_sections,
+                location=location,
+                incident_date=incident_date
             )
             return summary
         except Exception as e:
@@ -437,3 +863,14 @@ def get_legal_extraction_engine() -> LegalExtractionEngine:
     if _legal_extraction_engine is None:
         _legal_extraction_engine = LegalExtractionEngine()
     return _legal_extraction_engine
+
+
+async def close_legal_extraction_engine():
+    """Release the engine's vector store connections and background tasks (called on application shutdown)"""
+    if _legal_extraction_engine is None:
+        return
+    classification_model = _legal_extraction_engine.classification_model
+    if classification_model is not None and classification_model.offense_classifier is not None:
+        classification_model.offense_classifier.stop_watcher()
+    if _legal_extraction_engine.vector_search is not None:
+        await _legal_extraction_engine.vector_search.close()
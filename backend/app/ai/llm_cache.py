@@ -0,0 +1,238 @@
+"""
+LLM Response Cache
+Two-tier content-addressed cache: in-process LRU in front of Redis
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryCacheBackend:
+    """
+    Dict-backed stand-in for Redis (development and tests)
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[str], Optional[float]]:
+        value = await self.get(key)
+        if value is None:
+            return None, None
+        return value, self._data[key][0] - time.monotonic()
+
+    async def set(self, key: str, value: str, ttl: int):
+        self._data[key] = (time.monotonic() + ttl, value)
+
+
+class RedisCacheBackend:
+    """
+    Shared Redis tier
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[str], Optional[float]]:
+        """Get a value and its remaining lifetime in seconds (None if it never expires)"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            value, pttl = await pipe.get(key).pttl(key).execute()
+        if value is None:
+            return None, None
+        return value, pttl / 1000 if pttl >= 0 else None
+
+    async def set(self, key: str, value: str, ttl: int):
+        await self.client.set(key, value, ex=ttl)
+
+
+class LLMResponseCache:
+    """
+    Cache for rendered-prompt -> completion lookups
+    """
+
+    KEY_PREFIX = "llm:v1:"
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        local_maxsize: int = 512,
+        ttls: Optional[Dict[str, int]] = None,
+        default_ttl: int = 3600
+    ):
+        """
+        Initialize cache
+
+        Args:
+            backend: Remote tier with async get/set (Redis or in-memory); None for local-only
+            local_maxsize: Maximum entries in the in-process LRU
+            ttls: Per-method TTLs in seconds (0 disables caching for that method)
+            default_ttl: TTL for methods not listed in ttls
+        """
+        self.backend = backend
+        self.local_maxsize = local_maxsize
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    @classmethod
+    def make_key(
+        cls,
+        provider: str,
+        model: str,
+        temperature: float,
+        prompt: str,
+        json_mode: bool = False
+    ) -> str:
+        """
+        Build a content-addressed cache key
+
+        Args:
+            provider: Provider name
+            model: Model name
+            temperature: Sampling temperature
+            prompt: Fully rendered prompt
+            json_mode: Whether the provider was asked for a JSON object response
+
+        Returns:
+            Cache key
+        """
+        material = json.dumps([provider, model, temperature, prompt, json_mode], ensure_ascii=False)
+        return cls.KEY_PREFIX + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, method: str) -> int:
+        """Get TTL for a reasoning method"""
+        return self.ttls.get(method, self.default_ttl)
+
+    async def get(self, key: str, method: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key
+            method: Reasoning method name (caps the TTL of a remote hit copied locally)
+
+        Returns:
+            Cached response text or None
+        """
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at >= time.monotonic():
+                self._local.move_to_end(key)
+                self._stats["local_hits"] += 1
+                return value
+            self._local.pop(key, None)
+
+        if self.backend is not None:
+            try:
+                value, remaining = await self.backend.get_with_ttl(key)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"LLM cache backend get failed: {e}")
+                value = None
+            if value is not None:
+                self._stats["remote_hits"] += 1
+                # The local copy must not outlive the shared entry
+                ttl = self.ttl_for(method)
+                if remaining is not None:
+                    ttl = min(ttl, remaining)
+                self._store_local(key, value, ttl)
+                return value
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, method: str):
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_key
+            value: Response text
+            method: Reasoning method name (selects the TTL)
+        """
+        ttl = self.ttl_for(method)
+        if ttl <= 0 or not value:
+            return
+
+        self._store_local(key, value, ttl)
+        self._stats["sets"] += 1
+
+        if self.backend is not None:
+            try:
+                await self.backend.set(key, value, ttl)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"LLM cache backend set failed: {e}")
+
+    def _store_local(self, key: str, value: str, ttl: float):
+        """Insert into the in-process LRU, evicting the oldest entry when full"""
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_maxsize:
+            self._local.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self._stats["local_hits"] + self._stats["remote_hits"] + self._stats["misses"]
+        hits = self._stats["local_hits"] + self._stats["remote_hits"]
+        return {
+            **self._stats,
+            "local_size": len(self._local),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get singleton LLM response cache
+
+    Returns:
+        LLMResponseCache, or None when caching is disabled
+    """
+    global _llm_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        backend = None
+        if settings.LLM_CACHE_BACKEND == "redis" and settings.REDIS_URL:
+            try:
+                backend = RedisCacheBackend(settings.REDIS_URL)
+            except Exception as e:
+                logger.warning(f"Redis unavailable for LLM cache, using local tier only: {e}")
+        elif settings.LLM_CACHE_BACKEND == "memory":
+            backend = InMemoryCacheBackend()
+
+        _llm_cache = LLMResponseCache(
+            backend=backend,
+            local_maxsize=settings.LLM_CACHE_LOCAL_MAXSIZE,
+            ttls=settings.LLM_CACHE_TTLS,
+            default_ttl=settings.REDIS_CACHE_TTL
+        )
+    return _llm_cache
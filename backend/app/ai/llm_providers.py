@@ -0,0 +1,346 @@
+"""
+Async LLM Provider Clients
+Non-blocking wrappers around the Groq, OpenAI and Google Gemini SDKs
+"""
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT = (
+    "You are a legal expert specializing in Indian law (BNS/BNSS). You must ONLY answer questions "
+    "related to Indian legal matters. If the user asks personal questions, general knowledge questions, "
+    "or anything unrelated to law, you must politely refuse and redirect them to legal topics. "
+    "Do not Hallucinate details."
+)
+
+
+# Shared connection pool for every HTTP-based provider in this process
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide async HTTP client used by the provider SDKs
+
+    Returns:
+        Shared httpx.AsyncClient with pooled keep-alive connections
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE
+            )
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (called on application shutdown)"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+class LLMProvider(ABC):
+    """
+    Base class for async LLM providers
+    """
+
+    name: str = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @abstractmethod
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> str:
+        """
+        Generate a completion for a prompt
+
+        Args:
+            prompt: Rendered user prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_mode: Constrain the response to a JSON object where supported
+
+        Returns:
+            Generated text
+        """
+
+    @abstractmethod
+    def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks
+
+        Args:
+            prompt: Rendered user prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Async iterator of text chunks as the provider produces them
+        """
+
+
+async def _iterate_in_thread(factory: Callable[[], Iterable]) -> AsyncIterator:
+    """
+    Consume a blocking iterator on a worker thread
+
+    When the consumer stops early (e.g. the client disconnected), the
+    worker is told to stop at its next item and is not waited for.
+
+    Args:
+        factory: Callable returning the blocking iterable
+
+    Yields:
+        Items from the iterable
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop already closed
+            stop.set()
+
+    def pump():
+        iterator = iter(factory())
+        try:
+            for item in iterator:
+                if stop.is_set():
+                    break
+                put(item)
+        except Exception as e:
+            put(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if stop.is_set() and close is not None:
+                close()
+            put(done)
+
+    loop.run_in_executor(None, pump)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+class OpenAIChatProvider(LLMProvider):
+    """
+    Provider for OpenAI-compatible chat completion APIs (OpenAI and Groq)
+    """
+
+    def __init__(self, name: str, client, model: str):
+        super().__init__(model)
+        self.name = name
+        self.client = client
+
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> str:
+        """Call the chat completions endpoint without blocking the event loop"""
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra
+        )
+        return response.choices[0].message.content
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """Stream chat completion deltas"""
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class GeminiProvider(LLMProvider):
+    """
+    Provider for Google Gemini
+    """
+
+    name = "google"
+
+    def __init__(self, client, model: str):
+        super().__init__(model)
+        self.client = client
+
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> str:
+        """Call Gemini natively async when supported, otherwise on a worker thread"""
+        # This SDK version has no JSON response mode; the prompt carries the schema
+        generation_config = {"temperature": temperature, "max_output_tokens": max_tokens}
+
+        generate_async = getattr(self.client, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt, generation_config=generation_config)
+        else:
+            response = await asyncio.to_thread(
+                self.client.generate_content,
+                prompt,
+                generation_config=generation_config
+            )
+        return response.text
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """Stream Gemini response chunks"""
+        generation_config = {"temperature": temperature, "max_output_tokens": max_tokens}
+
+        generate_async = getattr(self.client, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt, generation_config=generation_config, stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+            return
+
+        chunks = _iterate_in_thread(
+            lambda: self.client.generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
+        )
+        async for chunk in chunks:
+            if chunk.text:
+                yield chunk.text
+
+
+def _provider_model(name: str, configured: str, primary: bool) -> Optional[str]:
+    """
+    Model id to send to a provider
+
+    Model ids are vendor specific, so AI_MODEL only stands in for the
+    primary provider (the single provider used before routing existed).
+
+    Args:
+        name: Provider name
+        configured: The provider's own model setting
+        primary: No provider has been built before this one
+
+    Returns:
+        Model id, or None to leave the provider out
+    """
+    if configured:
+        return configured
+    if primary:
+        return settings.AI_MODEL
+    logger.warning(f"{name} API key set without {name.upper()}_MODEL, leaving {name} out of failover")
+    return None
+
+
+def build_providers() -> List[LLMProvider]:
+    """
+    Build every provider that has an API key and a model configured
+
+    Returns:
+        Providers in priority order (Groq, OpenAI, Google)
+    """
+    providers: List[LLMProvider] = []
+
+    model = _provider_model("groq", settings.GROQ_MODEL, not providers) if settings.GROQ_API_KEY else None
+    if model:
+        try:
+            from groq import AsyncGroq
+            client = AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                base_url=settings.GROQ_BASE_URL or None,
+                http_client=get_http_client()
+            )
+            providers.append(OpenAIChatProvider("groq", client, model))
+            logger.info("Initialized Groq client")
+        except Exception as e:
+            logger.error(f"Failed to initialize Groq client: {e}")
+
+    model = _provider_model("openai", settings.OPENAI_MODEL, not providers) if settings.OPENAI_API_KEY else None
+    if model:
+        try:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
+                http_client=get_http_client()
+            )
+            providers.append(OpenAIChatProvider("openai", client, model))
+            logger.info("Initialized OpenAI client")
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI client: {e}")
+
+    if settings.GOOGLE_AI_API_KEY:
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=settings.GOOGLE_AI_API_KEY)
+            client = genai.GenerativeModel(settings.GOOGLE_AI_MODEL)
+            providers.append(GeminiProvider(client, settings.GOOGLE_AI_MODEL))
+            logger.info("Initialized Google AI client")
+        except Exception as e:
+            logger.error(f"Failed to initialize Google AI client: {e}")
+
+    return providers
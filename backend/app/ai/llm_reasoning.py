@@ -1,12 +1,17 @@
 """
 LLM Reasoning for Legal Analysis
-Uses OpenAI GPT-4 or Google Gemini for contextual reasoning
+Uses Groq, OpenAI GPT-4 or Google Gemini for contextual reasoning
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable, Tuple
 import json
 
 from app.config import settings
+from app.ai.llm_providers import build_providers
+from app.ai.llm_router import ProviderRouter, llm_call_kind
+from app.ai.llm_scheduler import llm_priority, schedule_providers
+from app.ai.llm_cache import LLMResponseCache, get_llm_cache
+from app.ai.singleflight import SingleFlight
 from app.ai.legal_extraction import LegalSection, IncidentClassification
 from app.core.exceptions import AIProcessingError
 
@@ -25,9 +30,19 @@ try:
 except ImportError:
     # Fallback if prompts_config doesn't exist
     LEGAL_ANALYSIS_PROMPT = None
+    SIMPLE_ANALYSIS_PROMPT = None
+    CUSTOM_PROMPT_TEMPLATE = None
+    FIR_DRAFT_PROMPT = None
+    SECTION_REFINEMENT_PROMPT = None
+    NEXT_STEPS_PROMPT = None
     CLIENT_INTAKE_PROMPT = None
     ACTIVE_PROMPT = "DEFAULT"
 
+try:
+    from app.ai.prompts_config import SINGLE_SHOT_ANALYSIS_PROMPT
+except ImportError:
+    SINGLE_SHOT_ANALYSIS_PROMPT = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,27 +55,38 @@ class LLMReasoning:
         """Initialize LLM client"""
         self.client = None
         self.model = settings.AI_MODEL
+        self.temperature = 0.3
+        self.max_tokens = 2000
+        self.cache = get_llm_cache()
+        self.inflight = SingleFlight("llm_call")
         self._initialize_client()
     
     def _initialize_client(self):
-        """Initialize LLM client (OpenAI or Google AI)"""
+        """Initialize async LLM client (Groq, OpenAI and/or Google AI)"""
         try:
-            if settings.GROQ_API_KEY:
-                from groq import Groq
-                self.client = Groq(api_key=settings.GROQ_API_KEY)
-                self.provider = "groq"
-                logger.info("Initialized Groq client")
-            elif settings.OPENAI_API_KEY:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-                self.provider = "openai"
-                logger.info("Initialized OpenAI client")
-            elif settings.GOOGLE_AI_API_KEY:
-                import google.generativeai as genai
-                genai.configure(api_key=settings.GOOGLE_AI_API_KEY)
-                self.client = genai.GenerativeModel('gemini-pro')
-                self.provider = "google"
-                logger.info("Initialized Google AI client")
+            providers = build_providers()
+            if settings.LLM_SCHEDULER_ENABLED:
+                providers = schedule_providers(providers)
+            if len(providers) > 1 and settings.LLM_ROUTER_ENABLED:
+                self.client = ProviderRouter(
+                    providers,
+                    hedge_enabled=settings.LLM_HEDGE_ENABLED,
+                    hedge_quantile=settings.LLM_HEDGE_QUANTILE,
+                    hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+                    breaker_options={
+                        "failure_rate": settings.LLM_BREAKER_FAILURE_RATE,
+                        "min_requests": settings.LLM_BREAKER_MIN_REQUESTS,
+                        "window": settings.LLM_BREAKER_WINDOW,
+                        "cooldown_seconds": settings.LLM_BREAKER_COOLDOWN
+                    }
+                )
+                self.provider = self.client.name
+                self.model = self.client.model
+                logger.info(f"Routing LLM calls across: {', '.join(p.name for p in providers)}")
+            elif providers:
+                self.client = providers[0]
+                self.provider = self.client.name
+                self.model = self.client.model
             else:
                 logger.warning("No AI API key configured, LLM reasoning will use fallback")
                 self.provider = "fallback"
@@ -97,12 +123,7 @@ class LLMReasoning:
             )
             
             # Get LLM response
-            if self.provider == "openai":
-                response = await self._call_openai(prompt)
-            elif self.provider == "groq":
-                response = await self._call_groq(prompt)
-            else:
-                response = await self._call_google(prompt)
+            response = await self._call_llm(prompt, "refine_legal_sections")
             
             # Parse response
             sections = self._parse_section_response(response, vector_results)
@@ -113,11 +134,86 @@ class LLMReasoning:
             logger.error(f"LLM refinement failed: {e}")
             return self._fallback_refine_sections(vector_results)
     
+    async def generate_structured_analysis(
+        self,
+        incident_text: str,
+        classification: IncidentClassification,
+        vector_results: List[Dict[str, Any]],
+        location: str = None,
+        incident_date: str = None,
+        police_station_context: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Generate sections, summary and practical guidance in one LLM call
+        
+        Args:
+            incident_text: Incident description
+            classification: Classification result
+            vector_results: Results from vector search
+            location: Optional location information
+            incident_date: Optional incident date
+            police_station_context: Nearest police station hint
+            
+        Returns:
+            Dict with legal_sections (List[LegalSection]), ai_summary,
+            next_steps and required_documents
+        """
+        if self.provider == "fallback" or not SINGLE_SHOT_ANALYSIS_PROMPT:
+            return self._fallback_structured_analysis(classification, vector_results)
+        
+        try:
+            prompt = SINGLE_SHOT_ANALYSIS_PROMPT.format(
+                incident_text=incident_text,
+                location=location or "Not specified",
+                incident_date=incident_date or "Not specified",
+                police_station_context=police_station_context or "User location unknown.",
+                offense_type=classification.offense_type,
+                offense_category=classification.offense_category,
+                severity_level=classification.severity_level,
+                sections_list=self._format_sections_list(vector_results)
+            )
+            
+            response = await self._call_llm(prompt, "generate_structured_analysis", json_mode=True)
+            parsed = self._extract_json(response, '{', '}')
+            
+            try:
+                legal_sections = self._sections_from_items(parsed.get('legal_sections', []), vector_results)
+            except Exception as e:
+                logger.warning(f"Failed to parse structured sections: {e}")
+                legal_sections = self._fallback_refine_sections(vector_results)
+            
+            return {
+                "legal_sections": legal_sections,
+                "ai_summary": parsed.get('summary') or self._fallback_summary(classification, legal_sections),
+                "next_steps": parsed.get('next_steps', []),
+                "required_documents": parsed.get('required_documents', [])
+            }
+            
+        except Exception as e:
+            logger.error(f"Structured analysis failed: {e}")
+            return self._fallback_structured_analysis(classification, vector_results)
+    
+    def _fallback_structured_analysis(
+        self,
+        classification: IncidentClassification,
+        vector_results: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Fallback single-shot analysis without LLM"""
+        legal_sections = self._fallback_refine_sections(vector_results)
+        return {
+            "legal_sections": legal_sections,
+            "ai_summary": self._fallback_summary(classification, legal_sections),
+            "next_steps": [],
+            "required_documents": []
+        }
+    
     async def generate_analysis_summary(
         self,
         incident_text: str,
         classification: IncidentClassification,
-        legal_sections: List[LegalSection]
+        legal_sections: List[LegalSection],
+        location: str = None,
+        incident_date: str = None
     ) -> str:
         """
         Generate AI summary of legal analysis
@@ -125,7 +221,9 @@ class LLMReasoning:
         Args:
             incident_text: Incident description
             classification: Classification result
-            legal_sections: Legal sections found
+            legal_sections: Legal sections found (used by the fallback summary)
+            location: Optional location information
+            incident_date: Optional incident date
             
         Returns:
             AI-generated summary
@@ -134,14 +232,14 @@ class LLMReasoning:
             return self._fallback_summary(classification, legal_sections)
         
         try:
-            prompt = self._create_summary_prompt(incident_text, classification, legal_sections)
+            prompt = self._create_summary_prompt(
+                incident_text,
+                classification,
+                location=location,
+                incident_date=incident_date
+            )
             
-            if self.provider == "openai":
-                summary = await self._call_openai(prompt)
-            elif self.provider == "groq":
-                summary = await self._call_groq(prompt)
-            else:
-                summary = await self._call_google(prompt)
+            summary = await self._call_llm(prompt, "generate_analysis_summary")
             
             return summary
             
@@ -149,6 +247,44 @@ class LLMReasoning:
             logger.error(f"Summary generation failed: {e}")
             return self._fallback_summary(classification, legal_sections)
     
+    async def stream_analysis_summary(
+        self,
+        incident_text: str,
+        classification: IncidentClassification,
+        legal_sections: List[LegalSection],
+        location: str = None,
+        incident_date: str = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream the AI summary of legal analysis
+        
+        Args:
+            incident_text: Incident description
+            classification: Classification result
+            legal_sections: Legal sections found (used by the fallback summary)
+            location: Optional location information
+            incident_date: Optional incident date
+            
+        Yields:
+            ("delta", text) chunks, or a single ("fallback", text) replacing
+            anything streamed so far
+        """
+        def fallback() -> str:
+            return self._fallback_summary(classification, legal_sections)
+        
+        if self.provider == "fallback":
+            yield "fallback", fallback()
+            return
+        
+        prompt = self._create_summary_prompt(
+            incident_text,
+            classification,
+            location=location,
+            incident_date=incident_date
+        )
+        async for event in self._stream_with_fallback(prompt, "generate_analysis_summary", fallback):
+            yield event
+    
     async def generate_fir_draft(
         self,
         incident_text: str,
@@ -179,12 +315,7 @@ class LLMReasoning:
                 user_details
             )
             
-            if self.provider == "openai":
-                fir_draft = await self._call_openai(prompt)
-            elif self.provider == "groq":
-                fir_draft = await self._call_groq(prompt)
-            else:
-                fir_draft = await self._call_google(prompt)
+            fir_draft = await self._call_llm(prompt, "generate_fir_draft")
             
             return fir_draft
             
@@ -192,6 +323,42 @@ class LLMReasoning:
             logger.error(f"FIR draft generation failed: {e}")
             return self._fallback_fir_draft(incident_text, user_details)
 
+    async def stream_fir_draft(
+        self,
+        incident_text: str,
+        classification: IncidentClassification,
+        legal_sections: List[LegalSection],
+        user_details: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream FIR draft
+        
+        Args:
+            incident_text: Incident description
+            classification: Classification result
+            legal_sections: Legal sections
+            user_details: User information
+            
+        Yields:
+            ("delta", text) chunks, or a single ("fallback", text) replacing
+            anything streamed so far
+        """
+        def fallback() -> str:
+            return self._fallback_fir_draft(incident_text, user_details)
+        
+        if self.provider == "fallback":
+            yield "fallback", fallback()
+            return
+        
+        prompt = self._create_fir_draft_prompt(
+            incident_text,
+            classification,
+            legal_sections,
+            user_details
+        )
+        async for event in self._stream_with_fallback(prompt, "generate_fir_draft", fallback):
+            yield event
+
     async def generate_practical_guidance(
         self,
         incident_text: str,
@@ -214,12 +381,7 @@ class LLMReasoning:
                 police_station_context=police_station_context or "User location unknown."
             )
             
-            if self.provider == "openai":
-                response = await self._call_openai(prompt)
-            elif self.provider == "groq":
-                response = await self._call_groq(prompt)
-            else:
-                response = await self._call_google(prompt)
+            response = await self._call_llm(prompt, "generate_practical_guidance")
                 
             # Parse JSON
             try:
@@ -281,12 +443,7 @@ Return ONLY JSON:
             if CLIENT_INTAKE_PROMPT:
                 prompt = CLIENT_INTAKE_PROMPT.format(conversation_text=conversation_text)
 
-            if self.provider == "openai":
-                response = await self._call_openai(prompt)
-            elif self.provider == "groq":
-                response = await self._call_groq(prompt)
-            else:
-                response = await self._call_google(prompt)
+            response = await self._call_llm(prompt, "analyze_client_intake")
                 
             # Parse JSON
             try:
@@ -349,12 +506,7 @@ Return ONLY JSON:
               }}
             ]"""
 
-            if self.provider == "openai":
-                response = await self._call_openai(prompt)
-            elif self.provider == "groq":
-                response = await self._call_groq(prompt)
-            else:
-                response = await self._call_google(prompt)
+            response = await self._call_llm(prompt, "generate_relevant_judgments")
 
             # Parse JSON
             try:
@@ -376,11 +528,7 @@ Return ONLY JSON:
         vector_results: List[Dict[str, Any]]
     ) -> str:
         """Create prompt for section refinement"""
-        sections_text = "\n".join([
-            f"{i+1}. {r['payload']['act_name']} Section {r['payload']['section_number']}: "
-            f"{r['payload']['section_title']}"
-            for i, r in enumerate(vector_results[:10])
-        ])
+        sections_text = self._format_sections_list(vector_results)
         
         if SECTION_REFINEMENT_PROMPT:
             return SECTION_REFINEMENT_PROMPT.format(
@@ -422,6 +570,14 @@ Return ONLY a JSON array with this structure:
 
 Focus on the most relevant 3-5 sections."""
     
+    def _format_sections_list(self, vector_results: List[Dict[str, Any]]) -> str:
+        """Format vector search candidates as a numbered prompt list"""
+        return "\n".join([
+            f"{i+1}. {r['payload']['act_name']} Section {r['payload']['section_number']}: "
+            f"{r['payload']['section_title']}"
+            for i, r in enumerate(vector_results[:10])
+        ])
+    
     def _create_summary_prompt(
         self,
         incident_text: str,
@@ -521,48 +677,121 @@ Format the FIR professionally with:
 
 Use formal legal language appropriate for Indian police stations."""
     
-    async def _call_openai(self, prompt: str) -> str:
-        """Call OpenAI API"""
+    async def _call_llm(self, prompt: str, method: str, json_mode: bool = False) -> str:
+        """
+        Call the configured LLM provider
+        
+        Identical prompts are served from cache, and concurrent identical
+        prompts share a single provider request. Provider requests queue in
+        the method's priority lane (LLM_METHOD_PRIORITIES), and the router
+        hedges them on the method's own latency history.
+        
+        Args:
+            prompt: Rendered prompt
+            method: Calling reasoning method (selects the cache TTL)
+            json_mode: Ask the provider for a JSON object response
+            
+        Returns:
+            Response text
+        """
+        cache_key = LLMResponseCache.make_key(self.provider, self.model, self.temperature, prompt, json_mode)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key, method)
+            if cached is not None:
+                return cached
+        
+        token = llm_priority.set(settings.LLM_METHOD_PRIORITIES.get(method, "interactive"))
+        kind_token = llm_call_kind.set(method)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a legal expert specializing in Indian law (BNS/BNSS). You must ONLY answer questions related to Indian legal matters. If the user asks personal questions, general knowledge questions, or anything unrelated to law, you must politely refuse and redirect them to legal topics. Do not Hallucinate details."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
+            return await self.inflight.do(
+                cache_key,
+                lambda: self._complete_and_cache(prompt, cache_key, method, json_mode)
             )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"OpenAI API call failed: {e}")
-            raise
+        finally:
+            llm_call_kind.reset(kind_token)
+            llm_priority.reset(token)
     
-    async def _call_groq(self, prompt: str) -> str:
-        """Call Groq API"""
+    async def _complete_and_cache(
+        self,
+        prompt: str,
+        cache_key: str,
+        method: str,
+        json_mode: bool = False
+    ) -> str:
+        """Call the provider and store the response"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a legal expert specializing in Indian law (BNS/BNSS). You must ONLY answer questions related to Indian legal matters. If the user asks personal questions, general knowledge questions, or anything unrelated to law, you must politely refuse and redirect them to legal topics. Do not Hallucinate details."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
+            response = await self.client.complete(
+                prompt,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                json_mode=json_mode
             )
-            return response.choices[0].message.content
         except Exception as e:
-            logger.error(f"Groq API call failed: {e}")
+            logger.error(f"{self.provider} API call failed: {e}")
             raise
-
-    async def _call_google(self, prompt: str) -> str:
-        """Call Google AI API"""
+        
+        if self.cache is not None:
+            await self.cache.set(cache_key, response, method)
+        return response
+    
+    async def _stream_llm(self, prompt: str, method: str) -> AsyncIterator[str]:
+        """
+        Stream a provider response, serving identical prompts from cache
+        
+        Args:
+            prompt: Rendered prompt
+            method: Calling reasoning method (selects the cache TTL)
+            
+        Yields:
+            Response text chunks
+        """
+        # Streams are never requested in JSON mode
+        cache_key = LLMResponseCache.make_key(self.provider, self.model, self.temperature, prompt, json_mode=False)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key, method)
+            if cached is not None:
+                yield cached
+                return
+        
+        chunks = []
         try:
-            response = self.client.generate_content(prompt)
-            return response.text
+            async for chunk in self.client.stream(
+                prompt,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            ):
+                chunks.append(chunk)
+                yield chunk
         except Exception as e:
-            logger.error(f"Google AI API call failed: {e}")
+            logger.error(f"{self.provider} streaming API call failed: {e}")
             raise
+        
+        if self.cache is not None:
+            await self.cache.set(cache_key, "".join(chunks), method)
+    
+    async def _stream_with_fallback(
+        self,
+        prompt: str,
+        method: str,
+        fallback: Callable[[], str]
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream a response, switching to fallback text if the provider fails
+        
+        Args:
+            prompt: Rendered prompt
+            method: Calling reasoning method
+            fallback: Produces the offline replacement text
+            
+        Yields:
+            ("delta", text) chunks, then ("fallback", text) if the stream breaks
+        """
+        try:
+            async for chunk in self._stream_llm(prompt, method):
+                yield "delta", chunk
+        except Exception as e:
+            logger.error(f"{method} streaming failed, using fallback: {e}")
+            yield "fallback", fallback()
     
     def _parse_section_response(
         self,
@@ -571,43 +800,52 @@ Use formal legal language appropriate for Indian police stations."""
     ) -> List[LegalSection]:
         """Parse LLM response into legal sections"""
         try:
-            # Extract JSON from response
-            json_start = response.find('[')
-            json_end = response.rfind(']') + 1
-            json_str = response[json_start:json_end]
-            
-            parsed = json.loads(json_str)
-            
-            sections = []
-            for item in parsed:
-                # Find matching section from vector results
-                matching = next(
-                    (r for r in vector_results 
-                     if r['payload']['section_number'] == item['section_number']),
-                    None
-                )
-                
-                if matching:
-                    payload = matching['payload']
-                    sections.append(LegalSection(
-                        act_name=payload['act_name'],
-                        section_number=payload['section_number'],
-                        section_title=payload.get('section_title', ''),
-                        section_description=payload.get('section_description', ''),
-                        relevance_score=item.get('relevance_score', 0.7),
-                        reasoning=item.get('reasoning', ''),
-                        is_cognizable=payload.get('is_cognizable'),
-                        is_bailable=payload.get('is_bailable'),
-                        punishment_description=payload.get('punishment_description'),
-                        court_fees=item.get('court_fees')
-                    ))
-            
-            return sections
+            parsed = self._extract_json(response, '[', ']')
+            return self._sections_from_items(parsed, vector_results)
             
         except Exception as e:
             logger.warning(f"Failed to parse LLM response: {e}")
             return self._fallback_refine_sections(vector_results)
     
+    def _extract_json(self, response: str, open_char: str, close_char: str) -> Any:
+        """Extract the outermost JSON array or object from an LLM response"""
+        json_start = response.find(open_char)
+        json_end = response.rfind(close_char) + 1
+        json_str = response[json_start:json_end]
+        return json.loads(json_str)
+    
+    def _sections_from_items(
+        self,
+        items: List[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]]
+    ) -> List[LegalSection]:
+        """Match LLM-selected sections against vector results"""
+        sections = []
+        for item in items:
+            # Find matching section from vector results
+            matching = next(
+                (r for r in vector_results 
+                 if r['payload']['section_number'] == item['section_number']),
+                None
+            )
+            
+            if matching:
+                payload = matching['payload']
+                sections.append(LegalSection(
+                    act_name=payload['act_name'],
+                    section_number=payload['section_number'],
+                    section_title=payload.get('section_title', ''),
+                    section_description=payload.get('section_description', ''),
+                    relevance_score=item.get('relevance_score', 0.7),
+                    reasoning=item.get('reasoning', ''),
+                    is_cognizable=payload.get('is_cognizable'),
+                    is_bailable=payload.get('is_bailable'),
+                    punishment_description=payload.get('punishment_description'),
+                    court_fees=item.get('court_fees')
+                ))
+        
+        return sections
+    
     def _fallback_refine_sections(
         self,
         vector_results: List[Dict[str, Any]]
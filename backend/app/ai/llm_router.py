@@ -0,0 +1,353 @@
+"""
+Multi-Provider LLM Router
+Failover, hedged requests and circuit breakers across configured providers
+"""
+import asyncio
+import bisect
+import contextvars
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.ai.llm_providers import LLMProvider
+from app.ai.llm_scheduler import SchedulerTimeout
+
+logger = logging.getLogger(__name__)
+
+
+# Kind of LLM call being made in the current task (the reasoning method);
+# latencies, and so hedge delays, are tracked per kind
+llm_call_kind: contextvars.ContextVar[str] = contextvars.ContextVar("llm_call_kind", default="default")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with approximate quantiles
+    """
+
+    # Bucket upper bounds in seconds
+    BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 60.0, 120.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.total = 0
+
+    def record(self, seconds: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate quantile (bucket upper bound)
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Latency in seconds, or None without observations
+        """
+        if not self.total:
+            return None
+        target = q * self.total
+        running = 0
+        for i, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else self.BUCKETS[-1] * 2
+        return self.BUCKETS[-1] * 2
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding window of calls
+
+    closed -> open when the failure rate over the window exceeds the
+    threshold; open -> half_open after the cooldown, letting one probe
+    through; the probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_requests: int = 5,
+        window: int = 20,
+        cooldown_seconds: float = 30.0
+    ):
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.cooldown_seconds = cooldown_seconds
+        self.outcomes: deque = deque(maxlen=window)
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Check whether a call may be attempted"""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        """Record a successful call"""
+        self.outcomes.append(True)
+        if self.state == "half_open":
+            logger.info("Circuit closed after successful probe")
+            self.state = "closed"
+            self.outcomes.clear()
+
+    def record_failure(self):
+        """Record a failed call"""
+        self.outcomes.append(False)
+        if self.state == "half_open":
+            self._open()
+            return
+        failures = self.outcomes.count(False)
+        if len(self.outcomes) >= self.min_requests and failures / len(self.outcomes) >= self.failure_rate:
+            self._open()
+
+    def record_cancelled(self):
+        """Release the half-open probe slot when a call is cancelled or never sent"""
+        if self.state == "half_open":
+            self._probe_in_flight = False
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+
+class ProviderRouter(LLMProvider):
+    """
+    Route completions across providers
+
+    Providers are tried in priority order, skipping any whose circuit is
+    open. If the active request has not answered within that provider's
+    observed latency quantile for the same kind of call (llm_call_kind),
+    a hedged request is sent to the next provider and the first successful
+    answer wins. Calls of a kind with too few samples are not hedged, so
+    long completions never hedge on a guessed delay.
+    """
+
+    name = "router"
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedge_enabled: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        breaker_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize router
+
+        Args:
+            providers: Providers in priority order
+            hedge_enabled: Send hedged requests to the next provider when slow
+            hedge_quantile: Latency quantile that triggers the hedge
+            hedge_min_samples: Samples of a call kind needed before it is hedged
+            breaker_options: CircuitBreaker keyword arguments
+        """
+        super().__init__("+".join(p.model for p in providers))
+        self.providers = providers
+        self.hedge_enabled = hedge_enabled
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.breakers = {p.name: CircuitBreaker(**(breaker_options or {})) for p in providers}
+        self.latencies = {p.name: LatencyHistogram() for p in providers}
+        # (provider name, call kind) -> latencies of that kind of call
+        self.call_latencies: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._stats = {p.name: {"success": 0, "failure": 0, "hedged": 0, "wins": 0} for p in providers}
+
+    def _claim_next(self, start: int) -> Tuple[Optional[LLMProvider], int]:
+        """
+        Claim the next provider whose circuit allows a call
+
+        Args:
+            start: Index in the priority list to start from
+
+        Returns:
+            Tuple of (provider or None, index to continue from)
+        """
+        for i in range(start, len(self.providers)):
+            if self.breakers[self.providers[i].name].allow():
+                return self.providers[i], i + 1
+        return None, len(self.providers)
+
+    def _record_latency(self, provider: LLMProvider, kind: str, seconds: float):
+        """Record a successful call's latency overall and for its call kind"""
+        self.latencies[provider.name].record(seconds)
+        histogram = self.call_latencies.get((provider.name, kind))
+        if histogram is None:
+            histogram = self.call_latencies[(provider.name, kind)] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def _hedge_delay(self, provider: LLMProvider, kind: str) -> Optional[float]:
+        """Delay before hedging past a provider (None: too few samples, don't hedge)"""
+        histogram = self.call_latencies.get((provider.name, kind))
+        if histogram is None or histogram.total < self.hedge_min_samples:
+            return None
+        return histogram.quantile(self.hedge_quantile)
+
+    async def _attempt(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        kind: str
+    ) -> str:
+        """Call one provider, recording latency and circuit outcome"""
+        started = time.perf_counter()
+        try:
+            response = await provider.complete(
+                prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                json_mode=json_mode
+            )
+        except (asyncio.CancelledError, SchedulerTimeout):
+            # Lost a hedge, or queued locally without reaching the provider
+            self.breakers[provider.name].record_cancelled()
+            raise
+        except Exception:
+            self.breakers[provider.name].record_failure()
+            self._stats[provider.name]["failure"] += 1
+            raise
+        self._record_latency(provider, kind, time.perf_counter() - started)
+        self.breakers[provider.name].record_success()
+        self._stats[provider.name]["success"] += 1
+        return response
+
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> str:
+        """Return the first successful completion across providers"""
+        pending: Dict[asyncio.Task, LLMProvider] = {}
+        last_error: Optional[BaseException] = None
+        next_index = 0
+        kind = llm_call_kind.get()
+
+        def launch(provider: Optional[LLMProvider] = None) -> Optional[LLMProvider]:
+            nonlocal next_index
+            if provider is None:
+                provider, next_index = self._claim_next(next_index)
+                if provider is None:
+                    return None
+            task = asyncio.create_task(
+                self._attempt(provider, prompt, temperature, max_tokens, json_mode, kind)
+            )
+            pending[task] = provider
+            return provider
+
+        active = launch()
+        if active is None:
+            # Every circuit is open; trying the primary beats failing outright
+            logger.warning("All LLM provider circuits open, trying primary provider")
+            active = launch(self.providers[0])
+
+        try:
+            while pending:
+                timeout = None
+                if self.hedge_enabled and next_index < len(self.providers):
+                    timeout = self._hedge_delay(active, kind)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    hedge = launch()
+                    if hedge is not None:
+                        logger.info(f"{active.name} slower than p{int(self.hedge_quantile * 100)}, hedging to {hedge.name}")
+                        self._stats[hedge.name]["hedged"] += 1
+                        active = hedge
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        self._stats[provider.name]["wins"] += 1
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning(f"{provider.name} call failed: {last_error}")
+
+                # Fail over immediately when nothing else is in flight
+                if not pending:
+                    active = launch() or active
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error or RuntimeError("No LLM provider available")
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """
+        Stream from the first healthy provider
+
+        Streams are not hedged; failover only happens before the first chunk.
+        """
+        last_error: Optional[BaseException] = None
+        kind = llm_call_kind.get()
+        provider, next_index = self._claim_next(0)
+        if provider is None:
+            logger.warning("All LLM provider circuits open, trying primary provider")
+            provider = self.providers[0]
+
+        while provider is not None:
+            started = time.perf_counter()
+            emitted = False
+            try:
+                async for chunk in provider.stream(prompt, temperature=temperature, max_tokens=max_tokens):
+                    emitted = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                self.breakers[provider.name].record_cancelled()
+                raise
+            except Exception as e:
+                if isinstance(e, SchedulerTimeout):
+                    self.breakers[provider.name].record_cancelled()
+                else:
+                    self.breakers[provider.name].record_failure()
+                    self._stats[provider.name]["failure"] += 1
+                if emitted:
+                    raise
+                last_error = e
+                logger.warning(f"{provider.name} stream failed, failing over: {e}")
+                provider, next_index = self._claim_next(next_index)
+                continue
+            self._record_latency(provider, kind, time.perf_counter() - started)
+            self.breakers[provider.name].record_success()
+            self._stats[provider.name]["success"] += 1
+            self._stats[provider.name]["wins"] += 1
+            return
+
+        raise last_error or RuntimeError("No LLM provider available")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider counters, circuit state and latency quantiles"""
+        return {
+            p.name: {
+                **self._stats[p.name],
+                "circuit": self.breakers[p.name].state,
+                "p50_seconds": self.latencies[p.name].quantile(0.5),
+                "p95_seconds": self.latencies[p.name].quantile(0.95),
+            }
+            for p in self.providers
+        }
@@ -0,0 +1,356 @@
+"""
+LLM Request Scheduler
+Per-provider rate budgets, priority lanes and adaptive concurrency
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.ai.llm_providers import LLMProvider
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Lower value is served first
+PRIORITIES = {"interactive": 0, "background": 1}
+
+# Priority of the LLM call being made in the current task
+llm_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request waits longer than the scheduler allows"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether a provider error is an HTTP 429 / quota response
+
+    Args:
+        error: Exception raised by a provider SDK
+
+    Returns:
+        True for rate-limit errors
+    """
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    return type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (0 if available now)"""
+        self._refill()
+        # Requests larger than the whole bucket wait for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        """Consume tokens (call after wait_time returned 0)"""
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        """Return unused tokens"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class ProviderScheduler:
+    """
+    Admission control for one provider
+
+    Requests queue in priority lanes and are admitted when the provider has
+    request and token budget left (per-minute token buckets) and a free
+    concurrency slot. The concurrency limit follows AIMD: it grows by one
+    slot per limit's worth of successful calls and halves on a 429; other
+    failures leave it unchanged.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        initial_concurrency: int = 8,
+        max_concurrency: int = 32,
+        max_wait_seconds: float = 30.0
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            name: Provider name
+            requests_per_minute: Request budget (0 for unlimited)
+            tokens_per_minute: Token budget (0 for unlimited)
+            initial_concurrency: Starting concurrency limit
+            max_concurrency: Upper bound for the concurrency limit
+            max_wait_seconds: Longest a request may queue before failing
+        """
+        self.name = name
+        self.rpm = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tpm = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.limit = float(initial_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_wait_seconds = max_wait_seconds
+        self.in_flight = 0
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._last_decrease = 0.0
+        self._stats = {"admitted": 0, "timeouts": 0, "rate_limited": 0}
+
+    async def acquire(self, priority: str, tokens: int):
+        """
+        Wait for admission
+
+        Args:
+            priority: Lane name from PRIORITIES
+            tokens: Estimated tokens the request will consume
+
+        Raises:
+            SchedulerTimeout: If not admitted within max_wait_seconds
+        """
+        future = asyncio.get_running_loop().create_future()
+        entry = [PRIORITIES.get(priority, 0), next(self._sequence), tokens, future]
+        heapq.heappush(self._queue, entry)
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Admitted just as we gave up; hand the slot back
+                self.release(tokens, 0, succeeded=False)
+            else:
+                future.cancel()
+                self._dispatch()
+            if isinstance(e, asyncio.TimeoutError):
+                self._stats["timeouts"] += 1
+                raise SchedulerTimeout(f"{self.name} request queued longer than {self.max_wait_seconds}s")
+            raise
+
+    def release(
+        self,
+        reserved_tokens: int,
+        used_tokens: int,
+        succeeded: bool,
+        rate_limited: bool = False
+    ):
+        """
+        Release a concurrency slot and settle the token reservation
+
+        Args:
+            reserved_tokens: Tokens reserved at admission
+            used_tokens: Tokens actually consumed (estimated)
+            succeeded: The call completed (only successes widen the limit)
+            rate_limited: The provider answered with a 429
+        """
+        self.in_flight -= 1
+        if self.tpm is not None:
+            if reserved_tokens > used_tokens:
+                self.tpm.give(reserved_tokens - used_tokens)
+            elif used_tokens > reserved_tokens:
+                # Longer completion than reserved: charge the rest to the budget
+                self.tpm.take(used_tokens - reserved_tokens)
+
+        if rate_limited:
+            self._stats["rate_limited"] += 1
+            now = time.monotonic()
+            # One multiplicative decrease per burst of 429s
+            if now - self._last_decrease > 1.0:
+                self.limit = max(1.0, self.limit / 2)
+                self._last_decrease = now
+                logger.warning(f"{self.name} rate limited, concurrency limit now {int(self.limit)}")
+        elif succeeded:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit queued requests in priority order while budget allows"""
+        while self._queue:
+            _, _, tokens, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= int(self.limit):
+                return
+
+            wait = 0.0
+            if self.rpm is not None:
+                wait = max(wait, self.rpm.wait_time(1))
+            if self.tpm is not None:
+                wait = max(wait, self.tpm.wait_time(tokens))
+            if wait > 0:
+                self._schedule_wakeup(wait)
+                return
+
+            heapq.heappop(self._queue)
+            if self.rpm is not None:
+                self.rpm.take(1)
+            if self.tpm is not None:
+                self.tpm.take(tokens)
+            self.in_flight += 1
+            self._stats["admitted"] += 1
+            future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float):
+        """Re-run dispatch once the buckets have refilled"""
+        if self._wakeup is not None and not self._wakeup.cancelled():
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get admission counters and current limits"""
+        return {
+            **self._stats,
+            "in_flight": self.in_flight,
+            "queued": sum(1 for entry in self._queue if not entry[3].done()),
+            "concurrency_limit": int(self.limit),
+        }
+
+
+class ScheduledProvider(LLMProvider):
+    """
+    Provider wrapper that routes every call through a ProviderScheduler
+    """
+
+    def __init__(self, provider: LLMProvider, scheduler: ProviderScheduler):
+        super().__init__(provider.model)
+        self.name = provider.name
+        self.provider = provider
+        self.scheduler = scheduler
+
+    def _reserve(self, prompt: str, max_tokens: int) -> int:
+        """
+        Tokens to reserve at admission
+
+        max_tokens is only a ceiling; reserving it would let a small
+        per-minute budget admit one or two calls at a time. The typical
+        completion is reserved instead and release() settles the difference.
+        """
+        return estimate_tokens(prompt) + min(max_tokens, settings.LLM_COMPLETION_TOKEN_ESTIMATE)
+
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> str:
+        """Complete once the scheduler admits the request"""
+        reserved = self._reserve(prompt, max_tokens)
+        await self.scheduler.acquire(llm_priority.get(), reserved)
+
+        used, succeeded, rate_limited = reserved, False, False
+        try:
+            response = await self.provider.complete(
+                prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                json_mode=json_mode
+            )
+            used = estimate_tokens(prompt) + estimate_tokens(response or "")
+            succeeded = True
+            return response
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            raise
+        finally:
+            self.scheduler.release(reserved, used, succeeded, rate_limited)
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """Stream once the scheduler admits the request, holding the slot until done"""
+        reserved = self._reserve(prompt, max_tokens)
+        await self.scheduler.acquire(llm_priority.get(), reserved)
+
+        generated, succeeded, rate_limited = [], False, False
+        try:
+            async for chunk in self.provider.stream(prompt, temperature=temperature, max_tokens=max_tokens):
+                generated.append(chunk)
+                yield chunk
+            succeeded = True
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            raise
+        finally:
+            used = estimate_tokens(prompt) + estimate_tokens("".join(generated))
+            self.scheduler.release(reserved, used, succeeded, rate_limited)
+
+
+# Process-wide schedulers, shared by every LLMReasoning instance
+_schedulers: Dict[str, ProviderScheduler] = {}
+
+
+def get_provider_scheduler(name: str) -> ProviderScheduler:
+    """
+    Get the scheduler for a provider
+
+    Args:
+        name: Provider name (groq, openai, google)
+
+    Returns:
+        ProviderScheduler instance
+    """
+    if name not in _schedulers:
+        limits = settings.LLM_RATE_LIMITS.get(name, {})
+        _schedulers[name] = ProviderScheduler(
+            name,
+            requests_per_minute=limits.get("rpm", 0),
+            tokens_per_minute=limits.get("tpm", 0),
+            initial_concurrency=settings.LLM_CONCURRENCY_INITIAL,
+            max_concurrency=settings.LLM_CONCURRENCY_MAX,
+            max_wait_seconds=settings.LLM_SCHEDULER_MAX_WAIT
+        )
+    return _schedulers[name]
+
+
+def schedule_providers(providers: List[LLMProvider]) -> List[LLMProvider]:
+    """
+    Wrap providers with their schedulers
+
+    Args:
+        providers: Providers from build_providers()
+
+    Returns:
+        Scheduled providers in the same order
+    """
+    return [ScheduledProvider(p, get_provider_scheduler(p.name)) for p in providers]
+
+
+def scheduler_stats() -> Dict[str, Any]:
+    """Stats for every provider scheduler created so far"""
+    return {name: scheduler.stats() for name, scheduler in _schedulers.items()}
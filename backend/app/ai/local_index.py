@@ -0,0 +1,550 @@
+"""
+Local Vector Index
+In-process cosine-similarity index persisted to memory-mapped files
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    """
+    Embedded vector index for single-node deployments
+
+    Vectors are unit-normalized rows in a memory-mapped float32 file, so
+    small corpora are searched exactly with one matrix-vector product.
+    Rows are partitioned by offense type, so a filtered search only scores
+    the rows of that offense.
+    Past hnsw_threshold points (and with hnswlib installed) an HNSW graph
+    is built over the same rows for approximate search. Payloads are kept
+    in an append-only JSON-lines log; replaying it rebuilds the id -> row
+    mapping, and a re-added id overwrites its row in place (upsert).
+
+    Several processes (uvicorn workers, the ingestion script) may share
+    the files: writers serialize on a file lock and replay records other
+    processes logged before assigning rows, and readers pick up new
+    records before each lookup.
+
+    With int8 quantization, exact scans of at least quantization_min_points
+    rows read per-row scaled int8 codes (a quarter of the float32 bytes)
+    and only the best candidates are rescored against their float32 rows.
+    Converting codes costs more than it saves on small scans: measured
+    with scripts/benchmark_quantization.py at 384 dimensions, int8 was
+    about 2x slower at 20k rows and only broke even around 50k-100k, so
+    smaller scans stay on float32. The float32 rows are kept for
+    rescoring, so int8 adds codes and scales next to them (about 1.25x the
+    float32 storage); it reduces bytes scanned per query, not disk or
+    page-cache footprint.
+    """
+
+    QUANTIZATIONS = ("none", "int8")
+
+    # Rows converted to float32 per step of an int8 scan (fits in L2 cache)
+    SCAN_BLOCK = 512
+
+    def __init__(
+        self,
+        directory: str,
+        dimension: int = 384,
+        hnsw_threshold: int = 20000,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
+        initial_capacity: int = 1024,
+        quantization: str = "none",
+        rescore_oversampling: float = 4.0,
+        quantization_min_points: int = 100000
+    ):
+        """
+        Initialize local index
+
+        Args:
+            directory: Directory for index files
+            dimension: Vector dimension
+            hnsw_threshold: Point count from which HNSW search is used
+            hnsw_m: HNSW graph degree
+            hnsw_ef_construction: HNSW build-time candidate list size
+            hnsw_ef_search: HNSW query-time candidate list size
+            initial_capacity: Rows allocated when the index is created
+            quantization: "none" or "int8" (scan int8 codes, rescore in float32)
+            rescore_oversampling: Candidates rescored per requested result (int8)
+            quantization_min_points: Smallest scan that uses the int8 codes
+        """
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantization}")
+
+        self.directory = directory
+        self.dimension = dimension
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.initial_capacity = initial_capacity
+        self.quantization = quantization
+        self.rescore_oversampling = rescore_oversampling
+        self.quantization_min_points = quantization_min_points
+
+        self._ids: List[str] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._offense_codes = np.zeros(0, dtype=np.int32)
+        self._offense_lookup: Dict[Optional[str], int] = {None: 0}
+        self._partitions: Dict[int, np.ndarray] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._codes: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._hnsw = None
+        self._records_offset = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _records_path(self) -> str:
+        return os.path.join(self.directory, "records.jsonl")
+
+    @property
+    def _hnsw_path(self) -> str:
+        return os.path.join(self.directory, "hnsw.bin")
+
+    @property
+    def _codes_path(self) -> str:
+        return os.path.join(self.directory, "vectors.i8")
+
+    @property
+    def _scales_path(self) -> str:
+        return os.path.join(self.directory, "scales.f32")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _open_vectors(self, capacity: int, mode: str = "r+"):
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode=mode, shape=(capacity, self.dimension))
+        if self.quantization == "int8":
+            self._codes = np.memmap(self._codes_path, dtype=np.int8, mode=mode, shape=(capacity, self.dimension))
+            self._scales = np.memmap(self._scales_path, dtype=np.float32, mode=mode, shape=(capacity,))
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive lock across processes sharing the index files"""
+        with open(os.path.join(self.directory, ".lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        """Replay the record log and map the vector file"""
+        with self._write_lock():
+            if self.quantization == "none":
+                # Codes written earlier would miss rows added from now on
+                for path in (self._codes_path, self._scales_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+            if not os.path.exists(self._vectors_path):
+                self._open_vectors(self.initial_capacity, mode="w+")
+                return
+
+            if self.quantization == "int8" and not os.path.exists(self._codes_path):
+                self._build_codes()
+
+            self._sync()
+            logger.info(f"Loaded local vector index with {len(self)} points")
+
+            if len(self) >= self.hnsw_threshold:
+                self._load_hnsw()
+
+    def _sync(self) -> List[int]:
+        """
+        Apply records logged since the last sync (by any process)
+
+        Returns:
+            Rows that were added or replaced
+        """
+        try:
+            with open(self._records_path, "rb") as f:
+                f.seek(self._records_offset)
+                data = f.read()
+        except OSError:
+            data = b""
+        # Only consume complete lines; a concurrent append may be mid-write
+        data = data[:data.rfind(b"\n") + 1]
+        self._records_offset += len(data)
+
+        # Writers grow the vector file before logging, so measuring it after
+        # reading the log covers every row read
+        capacity = os.path.getsize(self._vectors_path) // (self.dimension * 4)
+        if self._vectors is None or self._vectors.shape[0] != capacity:
+            self._open_vectors(capacity)
+
+        rows = []
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn line from an interrupted write
+                continue
+            if record["row"] < capacity:
+                self._apply(record["id"], record["row"], record["payload"])
+                rows.append(record["row"])
+
+        if rows:
+            self._update_codes(rows)
+            if self._hnsw is not None:
+                self._hnsw_add(rows, np.asarray(self._vectors[rows]), save=False)
+        return rows
+
+    def _refresh(self):
+        """Pick up records other processes appended since the last sync"""
+        try:
+            size = os.path.getsize(self._records_path)
+        except OSError:
+            return
+        if size > self._records_offset:
+            self._sync()
+
+    def _apply(self, point_id: str, row: int, payload: Dict[str, Any]):
+        """Apply one record to the in-memory id/payload tables"""
+        if row == len(self._ids):
+            self._ids.append(point_id)
+            self._payloads.append(payload)
+        else:
+            self._ids[row] = point_id
+            self._payloads[row] = payload
+        self._rows[point_id] = row
+
+    def _update_codes(self, rows: List[int]):
+        """Refresh the offense codes of changed rows"""
+        codes = self._offense_codes
+        if len(self) > len(codes):
+            codes = np.concatenate([codes, np.zeros(len(self) - len(codes), dtype=np.int32)])
+        for row in rows:
+            codes[row] = self._offense_code(self._payloads[row].get("offense_type"))
+        self._offense_codes = codes
+        self._partitions.clear()
+
+    def _offense_code(self, offense_type: Optional[str]) -> int:
+        """Small integer code for an offense type (0 for none)"""
+        if offense_type not in self._offense_lookup:
+            self._offense_lookup[offense_type] = len(self._offense_lookup)
+        return self._offense_lookup[offense_type]
+
+    def _build_codes(self):
+        """Quantize every stored float32 row (first start with int8 enabled)"""
+        capacity = os.path.getsize(self._vectors_path) // (self.dimension * 4)
+        vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(capacity, self.dimension))
+        codes = np.memmap(self._codes_path, dtype=np.int8, mode="w+", shape=(capacity, self.dimension))
+        scales = np.memmap(self._scales_path, dtype=np.float32, mode="w+", shape=(capacity,))
+        for start in range(0, capacity, 65536):
+            codes[start:start + 65536], scales[start:start + 65536] = self._quantize(vectors[start:start + 65536])
+        codes.flush()
+        scales.flush()
+        logger.info(f"Quantized {capacity} local index rows to int8")
+
+    @staticmethod
+    def _quantize(vectors: np.ndarray):
+        """
+        Symmetric per-row int8 quantization
+
+        Args:
+            vectors: float32 rows
+
+        Returns:
+            Tuple of (int8 codes, float32 per-row scales)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def _grow(self, needed: int):
+        """Grow the vector file to hold at least needed rows"""
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._vectors.flush()
+        self._vectors = None
+        files = [(self._vectors_path, self.dimension * 4)]
+        if self._codes is not None:
+            self._codes.flush()
+            self._scales.flush()
+            self._codes = self._scales = None
+            files += [(self._codes_path, self.dimension), (self._scales_path, 4)]
+        for path, row_bytes in files:
+            with open(path, "r+b") as f:
+                f.truncate(capacity * row_bytes)
+        self._open_vectors(capacity)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        """
+        Insert or replace points
+
+        Args:
+            ids: Point ids
+            vectors: Vectors, one row per id
+            payloads: Payloads, one per id
+        """
+        vectors = self._normalize(vectors)
+        with self._lock, self._write_lock():
+            # Rows other processes added must not be handed out again
+            self._sync()
+
+            rows = []
+            assigned: Dict[str, int] = {}
+            next_row = len(self._ids)
+            for point_id in ids:
+                point_id = str(point_id)
+                row = self._rows.get(point_id, assigned.get(point_id))
+                if row is None:
+                    row = next_row
+                    next_row += 1
+                assigned[point_id] = row
+                rows.append(row)
+
+            self._grow(next_row)
+            self._vectors[rows] = vectors
+            self._vectors.flush()
+            if self._codes is not None:
+                self._codes[rows], self._scales[rows] = self._quantize(vectors)
+                self._codes.flush()
+                self._scales.flush()
+
+            with open(self._records_path, "ab") as f:
+                # Terminate a torn line left by an interrupted writer
+                if f.tell() > self._records_offset:
+                    f.write(b"\n")
+                f.write("".join(
+                    json.dumps({"id": str(point_id), "row": row, "payload": payload}) + "\n"
+                    for point_id, row, payload in zip(ids, rows, payloads)
+                ).encode("utf-8"))
+                self._records_offset = f.tell()
+
+            for point_id, row, payload in zip(ids, rows, payloads):
+                self._apply(str(point_id), row, payload)
+            self._update_codes(rows)
+
+            if self._hnsw is not None:
+                self._hnsw_add(rows, vectors)
+            elif len(self) >= self.hnsw_threshold:
+                self._load_hnsw()
+
+    def points(self) -> List[tuple]:
+        """Snapshot of all (id, payload) pairs"""
+        with self._lock:
+            self._refresh()
+            return list(zip(self._ids, self._payloads))
+
+    def get_payloads(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up stored payloads
+
+        Args:
+            ids: Point ids
+
+        Returns:
+            Mapping of id to payload for the ids that exist
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                str(point_id): self._payloads[self._rows[str(point_id)]]
+                for point_id in ids
+                if str(point_id) in self._rows
+            }
+
+    def search(
+        self,
+        vector: np.ndarray,
+        offense_type: Optional[str] = None,
+        top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the most similar points
+
+        Args:
+            vector: Query vector
+            offense_type: Optional payload offense_type filter
+            top_k: Number of results
+
+        Returns:
+            Results as {"id", "score", "payload"} dicts, best first
+        """
+        query = self._normalize(vector)[0]
+        with self._lock:
+            self._refresh()
+            count = len(self)
+            if count == 0:
+                return []
+
+            subset = None
+            code = None
+            if offense_type is not None:
+                code = self._offense_lookup.get(offense_type)
+                if code is None:
+                    return []
+                subset = self._partition(code)
+                if len(subset) == 0:
+                    return []
+
+            # A partition small enough for an exact scan beats filtered graph traversal
+            if self._hnsw is not None and (subset is None or len(subset) > self.hnsw_threshold):
+                rows, scores = self._hnsw_search(query, code, top_k)
+            elif self._codes is not None and (count if subset is None else len(subset)) >= self.quantization_min_points:
+                rows, scores = self._quantized_search(query, subset, top_k)
+            else:
+                rows, scores = self._exact_search(query, subset, top_k)
+
+            return [
+                {"id": self._ids[row], "score": score, "payload": self._payloads[row]}
+                for row, score in zip(rows, scores)
+            ]
+
+    def _partition(self, code: int) -> np.ndarray:
+        """Sorted rows of one offense type (cached until the next upsert)"""
+        rows = self._partitions.get(code)
+        if rows is None:
+            rows = np.flatnonzero(self._offense_codes[:len(self)] == code)
+            self._partitions[code] = rows
+        return rows
+
+    @staticmethod
+    def _top(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Positions of the top_k scores, best first"""
+        k = min(top_k, len(scores))
+        positions = np.argpartition(-scores, k - 1)[:k]
+        return positions[np.argsort(-scores[positions])]
+
+    def _exact_search(self, query: np.ndarray, subset: Optional[np.ndarray], top_k: int):
+        """Score every row (or every row of a partition) in float32"""
+        if subset is None:
+            scores = self._vectors[:len(self)] @ query
+            rows = self._top(scores, top_k)
+            return [int(r) for r in rows], [float(scores[r]) for r in rows]
+
+        scores = self._vectors[subset] @ query
+        positions = self._top(scores, top_k)
+        return [int(subset[p]) for p in positions], [float(scores[p]) for p in positions]
+
+    def _quantized_search(self, query: np.ndarray, subset: Optional[np.ndarray], top_k: int):
+        """Scan int8 codes (of every row or a partition), then rescore the best in float32"""
+        count = len(self) if subset is None else len(subset)
+        approx = np.empty(count, dtype=np.float32)
+        block = np.empty((self.SCAN_BLOCK, self.dimension), dtype=np.float32)
+        for start in range(0, count, self.SCAN_BLOCK):
+            end = min(start + self.SCAN_BLOCK, count)
+            n = end - start
+            codes = self._codes[start:end] if subset is None else self._codes[subset[start:end]]
+            np.copyto(block[:n], codes, casting="unsafe")
+            np.dot(block[:n], query, out=approx[start:end])
+        approx *= self._scales[:count] if subset is None else self._scales[subset]
+
+        candidates = min(count, max(top_k, int(top_k * self.rescore_oversampling)))
+        rows = np.argpartition(-approx, candidates - 1)[:candidates]
+        if subset is not None:
+            rows = subset[rows]
+        rows = np.sort(rows)
+
+        exact = self._vectors[rows] @ query
+        order = np.argsort(-exact)[:top_k]
+        return [int(rows[i]) for i in order], [float(exact[i]) for i in order]
+
+    def _load_hnsw(self):
+        """Load the persisted HNSW graph, rebuilding it if missing or stale"""
+        if hnswlib is None:
+            logger.info("hnswlib not installed, local index stays on exact search")
+            return
+
+        index = hnswlib.Index(space="ip", dim=self.dimension)
+        if os.path.exists(self._hnsw_path):
+            try:
+                index.load_index(self._hnsw_path, max_elements=max(len(self) * 2, self.hnsw_threshold))
+                if index.get_current_count() == len(self):
+                    index.set_ef(self.hnsw_ef_search)
+                    self._hnsw = index
+                    return
+            except Exception as e:
+                logger.warning(f"Could not load HNSW graph, rebuilding: {e}")
+            index = hnswlib.Index(space="ip", dim=self.dimension)
+
+        logger.info(f"Building HNSW graph over {len(self)} points")
+        index.init_index(
+            max_elements=max(len(self) * 2, self.hnsw_threshold),
+            M=self.hnsw_m,
+            ef_construction=self.hnsw_ef_construction
+        )
+        index.add_items(np.asarray(self._vectors[:len(self)]), np.arange(len(self)))
+        index.set_ef(self.hnsw_ef_search)
+        index.save_index(self._hnsw_path)
+        self._hnsw = index
+
+    def _hnsw_add(self, rows: List[int], vectors: np.ndarray, save: bool = True):
+        """Insert or replace rows in the HNSW graph (saved only under the write lock)"""
+        if len(self) > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(len(self) * 2)
+        self._hnsw.add_items(vectors, np.asarray(rows))
+        if save:
+            self._hnsw.save_index(self._hnsw_path)
+
+    def _hnsw_search(self, query: np.ndarray, code: Optional[int], top_k: int):
+        """Approximate search, filtering on offense code during traversal"""
+        k = min(top_k, len(self))
+        filter_fn = None
+        if code is not None:
+            codes = self._offense_codes
+            filter_fn = lambda row: codes[row] == code
+            k = min(k, int(np.count_nonzero(codes[:len(self)] == code)))
+        if k == 0:
+            return [], []
+        labels, distances = self._hnsw.knn_query(query, k=k, filter=filter_fn)
+        # Inner-product distance is 1 - similarity
+        return [int(r) for r in labels[0]], [float(1.0 - d) for d in distances[0]]
+
+    def _scans_codes(self) -> bool:
+        """Check whether an unfiltered exact scan reads the int8 codes"""
+        return self._codes is not None and len(self) >= self.quantization_min_points
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and mode"""
+        return {
+            "points": len(self),
+            "capacity": self._vectors.shape[0] if self._vectors is not None else 0,
+            "mode": "hnsw" if self._hnsw is not None else "exact",
+            "quantization": self.quantization,
+            "scan_bytes": len(self) * self.dimension * (1 if self._scans_codes() else 4),
+        }
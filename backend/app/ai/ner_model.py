@@ -8,6 +8,8 @@ import re
 from datetime import datetime
 
 from app.ai.legal_extraction import ExtractedEntity
+from app.ai.entity_scanner import EntityScanner
+from app.ai.ner_service import get_ner_service
 from app.core.exceptions import AIProcessingError
 
 logger = logging.getLogger(__name__)
@@ -21,21 +23,20 @@ class NERModel:
     def __init__(self):
         """Initialize NER model"""
         self.nlp = None
+        self.service = None
+        self.rule_scanner = EntityScanner()
         self._load_model()
     
     def _load_model(self):
-        """Load spaCy model"""
+        """Load spaCy model (shared, NER components only)"""
         try:
-            import spacy
+            self.service = get_ner_service()
+            self.nlp = self.service.nlp
             
-            # Try to load English model
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except OSError:
+            if self.nlp is None:
                 logger.warning("spaCy model not found, using rule-based extraction")
-                self.nlp = None
-                
-            logger.info("NER model loaded successfully")
+            else:
+                logger.info("NER model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load NER model: {e}")
             self.nlp = None
@@ -54,7 +55,7 @@ class NERModel:
         
         # Use spaCy if available
         if self.nlp:
-            entities.extend(self._extract_with_spacy(text))
+            entities.extend(await self._extract_with_spacy(text))
         
         # Always use rule-based extraction as fallback/supplement
         entities.extend(self._extract_with_rules(text))
@@ -64,10 +65,13 @@ class NERModel:
         
         return entities
     
-    def _extract_with_spacy(self, text: str) -> List[ExtractedEntity]:
+    async def _extract_with_spacy(self, text: str) -> List[ExtractedEntity]:
         """
         Extract entities using spaCy
         
+        Runs on the NER service's worker thread, batched with concurrent
+        requests.
+        
         Args:
             text: Input text
             
@@ -77,16 +81,16 @@ class NERModel:
         entities = []
         
         try:
-            doc = self.nlp(text)
+            spans = await self.service.extract(text)
             
-            for ent in doc.ents:
-                entity_type = self._map_spacy_entity_type(ent.label_)
+            for label, value, start, end in spans:
+                entity_type = self._map_spacy_entity_type(label)
                 if entity_type:
                     entities.append(ExtractedEntity(
                         entity_type=entity_type,
-                        entity_value=ent.text,
-                        start_pos=ent.start_char,
-                        end_pos=ent.end_char,
+                        entity_value=value,
+                        start_pos=start,
+                        end_pos=end,
                         confidence=0.8
                     ))
         except Exception as e:
@@ -104,102 +108,7 @@ class NERModel:
         Returns:
             List of entities
         """
-        entities = []
-        
-        # Extract money amounts
-        money_pattern = r'(?:Rs\.?|INR|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)'
-        for match in re.finditer(money_pattern, text, re.IGNORECASE):
-            entities.append(ExtractedEntity(
-                entity_type="MONEY",
-                entity_value=match.group(0),
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.9
-            ))
-        
-        # Extract dates
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # DD/MM/YYYY or DD-MM-YYYY
-            r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',    # YYYY/MM/DD
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',
-        ]
-        for pattern in date_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                entities.append(ExtractedEntity(
-                    entity_type="DATE",
-                    entity_value=match.group(0),
-                    start_pos=match.start(),
-                    end_pos=match.end(),
-                    confidence=0.85
-                ))
-        
-        # Extract phone numbers
-        phone_pattern = r'(?:\+91|0)?[6-9]\d{9}'
-        for match in re.finditer(phone_pattern, text):
-            entities.append(ExtractedEntity(
-                entity_type="PHONE",
-                entity_value=match.group(0),
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.9
-            ))
-        
-        # Extract email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        for match in re.finditer(email_pattern, text):
-            entities.append(ExtractedEntity(
-                entity_type="EMAIL",
-                entity_value=match.group(0),
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.95
-            ))
-        
-        # Extract Aadhaar numbers (masked for privacy)
-        aadhaar_pattern = r'\b\d{4}\s?\d{4}\s?\d{4}\b'
-        for match in re.finditer(aadhaar_pattern, text):
-            entities.append(ExtractedEntity(
-                entity_type="AADHAAR",
-                entity_value="XXXX XXXX " + match.group(0)[-4:],  # Mask for privacy
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.8
-            ))
-        
-        # Extract PAN numbers
-        pan_pattern = r'\b[A-Z]{5}\d{4}[A-Z]\b'
-        for match in re.finditer(pan_pattern, text):
-            entities.append(ExtractedEntity(
-                entity_type="PAN",
-                entity_value=match.group(0),
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.9
-            ))
-        
-        # Extract vehicle numbers
-        vehicle_pattern = r'\b[A-Z]{2}\s?\d{1,2}\s?[A-Z]{1,2}\s?\d{4}\b'
-        for match in re.finditer(vehicle_pattern, text):
-            entities.append(ExtractedEntity(
-                entity_type="VEHICLE_NUMBER",
-                entity_value=match.group(0),
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.85
-            ))
-        
-        # Extract case numbers
-        case_pattern = r'\b(?:FIR|Case|Complaint)\s*(?:No\.?|Number)?\s*(\d+/\d{4}|\d+)\b'
-        for match in re.finditer(case_pattern, text, re.IGNORECASE):
-            entities.append(ExtractedEntity(
-                entity_type="CASE_NUMBER",
-                entity_value=match.group(0),
-                start_pos=match.start(),
-                end_pos=match.end(),
-                confidence=0.9
-            ))
-        
-        return entities
+        return self.rule_scanner.scan(text)
     
     def _map_spacy_entity_type(self, spacy_label: str) -> str:
         """
@@ -0,0 +1,166 @@
+"""
+NER Service
+Trimmed spaCy pipeline with batched, off-loop entity recognition
+"""
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.ai.batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+# en_core_web_sm components doc.ents does not depend on
+UNUSED_COMPONENTS = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer")
+
+# (label, text, start_char, end_char)
+EntitySpan = Tuple[str, str, int, int]
+
+
+def load_ner_pipeline(model_name: str):
+    """
+    Load a spaCy model with only tokenization, tok2vec and ner
+
+    Args:
+        model_name: Installed spaCy package name
+
+    Returns:
+        Language pipeline, or None when spaCy or the model is unavailable
+    """
+    try:
+        import spacy
+    except ImportError:
+        logger.warning("spaCy not installed, NER service disabled")
+        return None
+
+    try:
+        # Excluded components are never loaded, unlike disabled ones
+        nlp = spacy.load(model_name, exclude=list(UNUSED_COMPONENTS))
+    except OSError:
+        logger.warning(f"spaCy model {model_name} not found, NER service disabled")
+        return None
+    except Exception as e:
+        logger.error(f"Failed to load spaCy model {model_name}: {e}")
+        return None
+
+    logger.info(f"Loaded spaCy {model_name} with components: {', '.join(nlp.pipe_names)}")
+    return nlp
+
+
+class NERService:
+    """
+    Run spaCy NER on a worker thread, batching concurrent requests
+
+    Texts submitted within a few milliseconds of each other go through a
+    single nlp.pipe call, which amortizes per-call overhead and keeps the
+    event loop free while the model runs.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        threads: int = 1,
+        latency_window: int = 1024
+    ):
+        """
+        Initialize NER service
+
+        Args:
+            model_name: spaCy package name (defaults to NER_SPACY_MODEL)
+            max_batch_size: Largest batch per nlp.pipe call
+            max_wait_ms: Longest a request waits for its batch to fill
+            threads: Worker threads running nlp.pipe
+            latency_window: Recent requests kept for latency percentiles
+        """
+        self.model_name = model_name or settings.NER_SPACY_MODEL
+        self.nlp = load_ner_pipeline(self.model_name)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ner")
+        self.batcher = MicroBatcher(
+            self._process_batch,
+            self.executor,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            name="ner"
+        )
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._docs = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Check whether a spaCy pipeline is loaded"""
+        return self.nlp is not None
+
+    def _process_batch(self, texts: List[str]) -> List[List[EntitySpan]]:
+        """Recognize entities in a batch of texts (runs on the worker pool)"""
+        started = time.perf_counter()
+        results = [
+            [(ent.label_, ent.text, ent.start_char, ent.end_char) for ent in doc.ents]
+            for doc in self.nlp.pipe(texts, batch_size=len(texts))
+        ]
+        self._busy_seconds += time.perf_counter() - started
+        self._docs += len(texts)
+        return results
+
+    async def extract(self, text: str) -> List[EntitySpan]:
+        """
+        Recognize entities in one text
+
+        Args:
+            text: Input text
+
+        Returns:
+            Entity spans, or an empty list when the service is unavailable
+        """
+        if self.nlp is None:
+            return []
+        started = time.perf_counter()
+        try:
+            return await self.batcher.submit(text)
+        finally:
+            self._latencies.append((time.perf_counter() - started) * 1000.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching, latency and throughput counters"""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+        return {
+            "model": self.model_name,
+            "components": list(self.nlp.pipe_names) if self.nlp is not None else [],
+            **self.batcher.stats(),
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p95": percentile(0.95),
+            "docs_per_second": round(self._docs / self._busy_seconds, 1) if self._busy_seconds else 0.0,
+        }
+
+
+# Singleton instance
+_ner_service: Optional[NERService] = None
+
+
+def get_ner_service() -> NERService:
+    """
+    Get singleton instance of the NER service
+
+    Returns:
+        NERService instance
+    """
+    global _ner_service
+    if _ner_service is None:
+        _ner_service = NERService(
+            max_batch_size=settings.NER_BATCH_MAX_SIZE,
+            max_wait_ms=settings.NER_BATCH_MAX_WAIT_MS,
+            threads=settings.NER_THREADS
+        )
+    return _ner_service
@@ -0,0 +1,279 @@
+"""
+Offense Classifier
+TF-IDF + logistic regression offense type scoring from a versioned artifact
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Same tokenization as sklearn's TfidfVectorizer default; the trainer passes
+# this pattern explicitly so serving and training cannot drift apart
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+ARTIFACT_FORMAT = 1
+
+# (offense_type, probability)
+Prediction = Tuple[str, float]
+
+
+class ClassifierArtifact:
+    """
+    A trained model loaded from an .npz artifact
+
+    The artifact holds the TF-IDF vocabulary and idf weights and the
+    logistic regression coefficients as plain arrays, so scoring needs
+    only NumPy (no scikit-learn or pickle at serving time).
+    """
+
+    def __init__(self, path: str):
+        """
+        Load an artifact
+
+        Args:
+            path: .npz file written by scripts/train_offense_classifier.py
+        """
+        with np.load(path, allow_pickle=False) as data:
+            self.meta: Dict[str, Any] = json.loads(str(data["meta"]))
+            if self.meta.get("format") != ARTIFACT_FORMAT:
+                raise ValueError(f"Unsupported artifact format {self.meta.get('format')}")
+            terms = data["terms"].tolist()
+            self.idf = data["idf"].astype(np.float64)
+            # (terms, classes), so a text's terms select contiguous rows
+            self.coef = np.ascontiguousarray(data["coef"].T, dtype=np.float64)
+            self.intercept = data["intercept"].astype(np.float64)
+            self.labels: List[str] = data["labels"].tolist()
+
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.version = self.meta.get("version", "unknown")
+        self.ngram_max = int(self.meta.get("ngram_max", 1))
+        self.sublinear_tf = bool(self.meta.get("sublinear_tf", False))
+        self._token = re.compile(self.meta.get("token_pattern", TOKEN_PATTERN))
+
+    def features(self, text: str) -> Tuple[List[int], np.ndarray]:
+        """
+        L2-normalized TF-IDF features of text
+
+        Args:
+            text: Incident text
+
+        Returns:
+            Vocabulary columns and their weights (empty when no term is known)
+        """
+        tokens = self._token.findall(text.lower())
+        terms = list(tokens)
+        for n in range(2, self.ngram_max + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+        counts = Counter(self.vocabulary[term] for term in terms if term in self.vocabulary)
+        if not counts:
+            return [], np.empty(0)
+
+        columns = list(counts)
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.sublinear_tf:
+            tf = 1.0 + np.log(tf)
+        weights = tf * self.idf[columns]
+        return columns, weights / math.sqrt(float(weights @ weights))
+
+    def probabilities(self, columns: List[int], weights: np.ndarray) -> np.ndarray:
+        """Class probabilities for one feature vector"""
+        logits = weights @ self.coef[columns] + self.intercept
+        logits = np.exp(logits - logits.max())
+        return logits / logits.sum()
+
+
+class OffenseClassifier:
+    """
+    Predict offense types with a trained model, reloaded when its file changes
+
+    A background task checks the artifact path every reload_interval
+    seconds on a worker thread, and a changed file is loaded and swapped
+    in without a restart; a failed load keeps the current model. predict()
+    never touches the file or the lock. It returns None when no model is
+    loaded, the text has no known terms or the model is less sure than
+    min_confidence, so callers can fall back to keyword matching.
+    """
+
+    def __init__(self, path: str, min_confidence: float = 0.5, reload_interval: float = 5.0):
+        """
+        Initialize offense classifier
+
+        Args:
+            path: Active artifact path
+            min_confidence: Lowest probability accepted from the model
+            reload_interval: Seconds between artifact change checks (0 disables)
+        """
+        self.path = path
+        self.min_confidence = min_confidence
+        self.reload_interval = reload_interval
+        self.artifact: Optional[ClassifierArtifact] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+        self._predictions = 0
+        self._fallbacks = 0
+        self._reloads = 0
+        self._seconds = 0.0
+        self.reload()
+
+    @property
+    def available(self) -> bool:
+        """Check whether a model is loaded"""
+        return self.artifact is not None
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load the artifact if it changed since the last load
+
+        Blocks on file I/O, so call it from a worker thread once the
+        server is running.
+
+        Args:
+            force: Reload even if the file is unchanged
+
+        Returns:
+            True if a new model was swapped in
+        """
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                if self._mtime is None:
+                    logger.info(f"No offense classifier artifact at {self.path}, using keyword matching")
+                    self._mtime = -1.0
+                return False
+
+            if mtime == self._mtime and not force:
+                return False
+            self._mtime = mtime
+
+            try:
+                artifact = ClassifierArtifact(self.path)
+            except Exception as e:
+                logger.error(f"Failed to load offense classifier from {self.path}: {e}")
+                return False
+
+            # Single reference assignment: requests in flight keep the old model
+            self.artifact = artifact
+            self._reloads += 1
+            logger.info(
+                f"Loaded offense classifier {artifact.version} "
+                f"({len(artifact.vocabulary)} terms, {len(artifact.labels)} classes)"
+            )
+            return True
+
+    def start_watcher(self):
+        """Start the periodic artifact check on the running event loop (idempotent)"""
+        if self.reload_interval > 0 and self._watcher is None:
+            self._watcher = asyncio.get_running_loop().create_task(self._watch())
+
+    async def _watch(self):
+        """Check the artifact for changes off the event loop"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await asyncio.to_thread(self.reload)
+
+    def stop_watcher(self):
+        """Cancel the periodic artifact check"""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def _accept(self, artifact: ClassifierArtifact, probabilities: np.ndarray) -> Optional[Prediction]:
+        """Most probable class, or None when below min_confidence"""
+        best = int(probabilities.argmax())
+        if probabilities[best] < self.min_confidence:
+            return None
+        # Rounded so single and batched scoring (different summation order) agree
+        return artifact.labels[best], round(float(probabilities[best]), 4)
+
+    def predict(self, text: str) -> Optional[Prediction]:
+        """
+        Predict the offense type of one text
+
+        Args:
+            text: Incident text
+
+        Returns:
+            (offense_type, probability), or None to fall back to keywords
+        """
+        artifact = self.artifact
+        if artifact is None:
+            return None
+
+        started = time.perf_counter()
+        columns, weights = artifact.features(text)
+        prediction = self._accept(artifact, artifact.probabilities(columns, weights)) if columns else None
+        self._seconds += time.perf_counter() - started
+        self._predictions += 1
+        if prediction is None:
+            self._fallbacks += 1
+        return prediction
+
+    def predict_batch(self, texts: Sequence[str]) -> List[Optional[Prediction]]:
+        """
+        Predict offense types for many texts with one matrix product
+
+        Args:
+            texts: Incident texts
+
+        Returns:
+            Predictions in input order (None entries fall back to keywords)
+        """
+        artifact = self.artifact
+        if artifact is None:
+            return [None] * len(texts)
+
+        started = time.perf_counter()
+        features = [artifact.features(text) for text in texts]
+        known = [i for i, (columns, _) in enumerate(features) if columns]
+        predictions: List[Optional[Prediction]] = [None] * len(texts)
+        if known:
+            from scipy import sparse
+
+            indptr = np.cumsum([0] + [len(features[i][0]) for i in known])
+            matrix = sparse.csr_matrix(
+                (
+                    np.concatenate([features[i][1] for i in known]),
+                    np.concatenate([features[i][0] for i in known]),
+                    indptr
+                ),
+                shape=(len(known), len(artifact.vocabulary))
+            )
+            logits = matrix @ artifact.coef + artifact.intercept
+            logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities = logits / logits.sum(axis=1, keepdims=True)
+            for row, i in enumerate(known):
+                predictions[i] = self._accept(artifact, probabilities[row])
+
+        self._seconds += time.perf_counter() - started
+        self._predictions += len(texts)
+        self._fallbacks += sum(prediction is None for prediction in predictions)
+        return predictions
+
+    def stats(self) -> Dict[str, Any]:
+        """Get model version and prediction counters"""
+        artifact = self.artifact
+        return {
+            "path": self.path,
+            "version": artifact.version if artifact else None,
+            "trained_at": artifact.meta.get("trained_at") if artifact else None,
+            "reloads": self._reloads,
+            "predictions": self._predictions,
+            "keyword_fallbacks": self._fallbacks,
+            "avg_predict_us": (
+                round(self._seconds / self._predictions * 1e6, 1) if self._predictions else 0.0
+            ),
+        }
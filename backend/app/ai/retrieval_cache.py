@@ -0,0 +1,129 @@
+"""
+Retrieval Result Cache
+Memoizes section search results for semantically equivalent queries
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalCache:
+    """
+    Search result cache keyed by locality-sensitive hash buckets
+
+    Query embeddings are hashed with random hyperplanes (SimHash): nearby
+    queries fall into the same bucket with high probability. Each bucket
+    keeps the embedding it was filled with, and a hit also requires the
+    new query to be within min_similarity of it, so a bucket collision
+    between unrelated queries is a miss rather than a wrong answer.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 384,
+        bits: int = 12,
+        min_similarity: float = 0.92,
+        ttl_seconds: int = 600,
+        capacity: int = 2048,
+        seed: int = 0
+    ):
+        """
+        Initialize retrieval cache
+
+        Args:
+            dimension: Embedding dimension
+            bits: Hyperplanes per hash (more bits, finer buckets)
+            min_similarity: Cosine similarity required for a hit
+            ttl_seconds: Entry lifetime
+            capacity: Maximum cached result lists
+            seed: Hyperplane seed (fixed so every worker buckets identically)
+        """
+        self.bits = bits
+        self.min_similarity = min_similarity
+        self.ttl_seconds = ttl_seconds
+        self.capacity = capacity
+        self._planes = np.random.default_rng(seed).standard_normal((bits, dimension)).astype(np.float32)
+        self._weights = 1 << np.arange(bits, dtype=np.int64)
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "collisions": 0, "invalidations": 0}
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def bucket(self, vector: np.ndarray) -> int:
+        """SimHash bucket of an embedding"""
+        signs = (self._planes @ np.asarray(vector, dtype=np.float32)) > 0
+        return int(signs.astype(np.int64) @ self._weights)
+
+    def get(self, vector: np.ndarray, offense_type: Optional[str], top_k: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results for a query
+
+        Args:
+            vector: Query embedding
+            offense_type: Offense type filter of the search
+            top_k: Requested result count
+
+        Returns:
+            Copy of the cached results, or None on miss
+        """
+        key = (self.bucket(vector), offense_type, top_k)
+        query = self._normalize(vector)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] < time.monotonic():
+                self._stats["misses"] += 1
+                return None
+            if float(entry["vector"] @ query) < self.min_similarity:
+                self._stats["collisions"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return [dict(result) for result in entry["results"]]
+
+    def set(self, vector: np.ndarray, offense_type: Optional[str], top_k: int, results: List[Dict[str, Any]]):
+        """
+        Cache results for a query
+
+        Args:
+            vector: Query embedding
+            offense_type: Offense type filter of the search
+            top_k: Requested result count
+            results: Search results
+        """
+        key = (self.bucket(vector), offense_type, top_k)
+        with self._lock:
+            self._entries[key] = {
+                "vector": self._normalize(vector),
+                "results": [dict(result) for result in results],
+                "expires_at": time.monotonic() + self.ttl_seconds,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every entry (the section corpus changed)"""
+        with self._lock:
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,180 @@
+"""
+Legal Section Ingestion Helpers
+Streaming JSONL/CSV readers and content hashing for bulk vector store loads
+"""
+import csv
+import hashlib
+import json
+import logging
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+# Columns stored as top-level payload fields; anything else goes in as metadata
+SECTION_FIELDS = (
+    "act_name",
+    "section_number",
+    "section_title",
+    "section_description",
+    "offense_type",
+)
+
+BOOLEAN_FIELDS = ("is_cognizable", "is_bailable")
+
+
+def section_text(section: Dict[str, Any]) -> str:
+    """
+    Text that is embedded for a section (same format as add_legal_section)
+
+    Args:
+        section: Section record
+
+    Returns:
+        Embedding text
+    """
+    return (
+        f"{section['act_name']} Section {section['section_number']}: "
+        f"{section['section_title']}. {section['section_description']}"
+    )
+
+
+def section_id(section: Dict[str, Any]) -> Union[int, str]:
+    """
+    Stable point id for a section
+
+    Qdrant only accepts unsigned integers and UUIDs as point ids. A
+    record's own id is kept when it is one of those (digit strings from
+    CSV become integers); any other string id is mapped to a UUID derived
+    from it. Without an id, the UUID is derived from act and section
+    number, so re-ingesting the same section updates it.
+
+    Args:
+        section: Section record
+
+    Returns:
+        Point id (int or UUID string)
+    """
+    record_id = section.get("id")
+    if record_id is None or record_id == "":
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"legal-section:{section['act_name']}:{section['section_number']}"))
+    if isinstance(record_id, int) and not isinstance(record_id, bool) and record_id >= 0:
+        return record_id
+
+    text = str(record_id).strip()
+    if text.isdigit():
+        return int(text)
+    try:
+        return str(uuid.UUID(text))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"legal-section-id:{text}"))
+
+
+def content_hash(section: Dict[str, Any]) -> str:
+    """
+    Hash of everything stored for a section
+
+    Args:
+        section: Section record
+
+    Returns:
+        Hex digest; unchanged sections hash identically
+    """
+    payload = section_payload(section)
+    payload.pop("content_hash", None)
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def section_payload(section: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the vector store payload for a section
+
+    Args:
+        section: Section record
+
+    Returns:
+        Payload with section fields and metadata flattened
+    """
+    payload = {field: section.get(field) for field in SECTION_FIELDS}
+    for key, value in section.items():
+        if key not in SECTION_FIELDS and key not in ("id", "metadata"):
+            payload[key] = value
+    payload.update(section.get("metadata") or {})
+    return payload
+
+
+def _parse_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool) or value is None:
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "yes", "1", "y"):
+        return True
+    if text in ("false", "no", "0", "n"):
+        return False
+    return None
+
+
+def _normalize(record: Dict[str, Any], line_number: int) -> Optional[Dict[str, Any]]:
+    """Validate a raw record, returning None if it is unusable"""
+    record = {k.strip(): v for k, v in record.items() if k is not None}
+    missing = [f for f in ("act_name", "section_number", "section_title", "section_description") if not record.get(f)]
+    if missing:
+        logger.warning(f"Skipping section on line {line_number}: missing {', '.join(missing)}")
+        return None
+    if not record.get("offense_type"):
+        record["offense_type"] = None
+    for field in BOOLEAN_FIELDS:
+        if field in record:
+            record[field] = _parse_bool(record[field])
+    return record
+
+
+def read_sections(lines: Iterable[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream section records from JSONL or CSV text
+
+    Args:
+        lines: Text lines (e.g. an open file)
+        fmt: "jsonl" or "csv"
+
+    Yields:
+        Section records; invalid rows are logged and skipped
+    """
+    if fmt == "jsonl":
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                logger.warning(f"Skipping invalid JSON on line {line_number}: {e}")
+                continue
+            record = _normalize(record, line_number)
+            if record is not None:
+                yield record
+    elif fmt == "csv":
+        for line_number, row in enumerate(csv.DictReader(lines), start=2):
+            record = _normalize({k: v for k, v in row.items() if v != ""}, line_number)
+            if record is not None:
+                yield record
+    else:
+        raise ValueError(f"Unsupported section format: {fmt}")
+
+
+def detect_format(filename: str) -> str:
+    """Infer the section file format from its extension"""
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+
+def chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group records into lists of at most size items"""
+    chunk: List[Dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
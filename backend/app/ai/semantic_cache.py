@@ -0,0 +1,150 @@
+"""
+Semantic Cache for Incident Analyses
+Reuses recent analyses whose incident embeddings are near-identical
+"""
+import copy
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Small in-process vector index of recent analyses
+
+    Entries are unit-normalized embeddings, so cosine similarity is a single
+    matrix-vector product over the stored rows.
+    """
+
+    EVICTION_POLICIES = ("lru", "fifo")
+
+    def __init__(
+        self,
+        dimension: int = 384,
+        capacity: int = 1000,
+        threshold: float = 0.95,
+        ttl_seconds: int = 3600,
+        eviction_policy: str = "lru"
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            dimension: Embedding dimension
+            capacity: Maximum cached analyses
+            threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Entry lifetime
+            eviction_policy: "lru" (least recently hit) or "fifo" (oldest insert)
+        """
+        if eviction_policy not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.eviction_policy = eviction_policy
+
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "inserts": 0, "evictions": 0}
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, vector: np.ndarray, partition: str = "") -> Optional[Any]:
+        """
+        Find a cached value for a similar embedding
+
+        Args:
+            vector: Query embedding
+            partition: Exact-match discriminator (e.g. request context)
+
+        Returns:
+            Deep copy of the cached value, or None on miss
+        """
+        query = self._normalize(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            similarities = self._vectors @ query
+            for slot in np.argsort(-similarities):
+                if similarities[slot] < self.threshold:
+                    break
+                entry = self._entries[slot]
+                if entry is None or entry["partition"] != partition:
+                    continue
+                if entry["expires_at"] < now:
+                    self._evict(slot)
+                    continue
+                entry["last_used"] = now
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry["value"])
+
+            self._stats["misses"] += 1
+            return None
+
+    def insert(self, vector: np.ndarray, value: Any, partition: str = ""):
+        """
+        Cache a value under an embedding
+
+        Args:
+            vector: Incident embedding
+            value: Value to cache (stored as a deep copy)
+            partition: Exact-match discriminator (e.g. request context)
+        """
+        now = time.monotonic()
+        with self._lock:
+            slot = self._free_slot(now)
+            self._vectors[slot] = self._normalize(vector)
+            self._entries[slot] = {
+                "value": copy.deepcopy(value),
+                "partition": partition,
+                "inserted_at": now,
+                "last_used": now,
+                "expires_at": now + self.ttl_seconds,
+            }
+            self._stats["inserts"] += 1
+
+    def _free_slot(self, now: float) -> int:
+        """Pick an empty or expired slot, otherwise evict per policy"""
+        victim, victim_age = 0, None
+        order_key = "last_used" if self.eviction_policy == "lru" else "inserted_at"
+
+        for slot, entry in enumerate(self._entries):
+            if entry is None:
+                return slot
+            if entry["expires_at"] < now:
+                self._evict(slot)
+                return slot
+            if victim_age is None or entry[order_key] < victim_age:
+                victim, victim_age = slot, entry[order_key]
+
+        self._evict(victim)
+        return victim
+
+    def _evict(self, slot: int):
+        """Clear a slot"""
+        self._entries[slot] = None
+        self._vectors[slot] = 0.0
+        self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": sum(1 for entry in self._entries if entry is not None),
+            "capacity": self.capacity,
+            "threshold": self.threshold,
+            "eviction_policy": self.eviction_policy,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,60 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers with the same key share one in-flight computation
+"""
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async calls by key
+
+    The shared work runs in its own task, so a caller disconnecting does not
+    cancel the computation for the others still waiting on it.
+    """
+
+    def __init__(self, name: str = "singleflight", copy_results: bool = False):
+        """
+        Initialize coalescer
+
+        Args:
+            name: Name used in logs and stats
+            copy_results: Deep-copy the result for followers (for mutable results)
+        """
+        self.name = name
+        self.copy_results = copy_results
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once per key among concurrent callers
+
+        Args:
+            key: Deduplication key
+            func: Zero-argument coroutine factory
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            logger.debug(f"{self.name}: coalesced duplicate call")
+            result = await asyncio.shield(task)
+            return copy.deepcopy(result) if self.copy_results else result
+
+        self._stats["leaders"] += 1
+        task = asyncio.ensure_future(func())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing counters"""
+        return {**self._stats, "inflight": len(self._inflight)}
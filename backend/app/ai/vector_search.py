@@ -1,20 +1,66 @@
 """
 Vector Search for Legal Sections
-Uses Qdrant for semantic similarity search
+Uses Qdrant (or the embedded local index) for semantic similarity search
 """
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
-from sentence_transformers import SentenceTransformer
+import time
+from typing import List, Dict, Any, Iterable, Optional, Union
+import httpx
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    QuantizationSearchParams,
+    PayloadSchemaType,
+)
 import numpy as np
 
 from app.config import settings
+from app.ai.embedding_service import get_embedding_service
+from app.ai.local_index import LocalVectorIndex
+from app.ai.bm25_index import BM25Index, reciprocal_rank_fusion
+from app.ai.retrieval_cache import RetrievalCache
+from app.ai.section_ingest import chunked, content_hash, section_id, section_payload, section_text
 from app.ai.legal_extraction import LegalSection
 from app.core.exceptions import AIProcessingError
 
 logger = logging.getLogger(__name__)
 
+# gRPC status codes worth retrying (server restarting, overloaded or slow)
+RETRYABLE_GRPC_CODES = frozenset({"UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED", "ABORTED"})
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether a Qdrant call failure is worth retrying
+    
+    Args:
+        error: Exception raised by the client
+        
+    Returns:
+        True for connection failures, timeouts, 429 and 5xx responses
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 429 or error.status_code >= 500
+    code = getattr(error, "code", None)
+    if callable(code):
+        # grpc.aio.AioRpcError
+        try:
+            return code().name in RETRYABLE_GRPC_CODES
+        except Exception:
+            return False
+    return isinstance(error, (ResponseHandlingException, httpx.TransportError, ConnectionError, TimeoutError))
+
 
 class VectorSearch:
     """
@@ -24,47 +70,222 @@ class VectorSearch:
     def __init__(self):
         """Initialize vector search"""
         self.client = None
-        self.encoder = None
+        self.local_index = None
+        self.keyword_index = None
+        self._keyword_index_loaded = False
+        self._keyword_index_lock = asyncio.Lock()
+        self.retrieval_cache = None
+        self._collection_ready = False
+        self._collection_lock = asyncio.Lock()
+        self.embeddings = None
+        self.backend = settings.VECTOR_BACKEND
         self.collection_name = settings.QDRANT_COLLECTION_NAME
         self._initialize()
     
     def _initialize(self):
-        """Initialize Qdrant client and encoder"""
+        """Initialize vector store and encoder"""
         try:
-            # Initialize Qdrant client
-            self.client = QdrantClient(
-                url=settings.QDRANT_URL,
-                api_key=settings.QDRANT_API_KEY if settings.QDRANT_API_KEY else None
-            )
+            # Shared sentence transformer behind the batching embedding service
+            # (the model itself is loaded off the loop on first use)
+            self.embeddings = get_embedding_service()
             
-            # Initialize sentence transformer
-            self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+            if self.backend == "local":
+                self.local_index = LocalVectorIndex(
+                    settings.LOCAL_INDEX_DIR,
+                    dimension=384,  # all-MiniLM-L6-v2 dimension
+                    hnsw_threshold=settings.LOCAL_INDEX_HNSW_THRESHOLD,
+                    quantization=settings.VECTOR_QUANTIZATION,
+                    rescore_oversampling=settings.VECTOR_RESCORE_OVERSAMPLING,
+                    quantization_min_points=settings.VECTOR_QUANTIZATION_MIN_POINTS
+                )
+            else:
+                # One async client for the process: with gRPC every call is
+                # multiplexed over a single HTTP/2 channel; the REST fallback
+                # keeps a bounded keep-alive pool
+                self.client = AsyncQdrantClient(
+                    url=settings.QDRANT_URL,
+                    api_key=settings.QDRANT_API_KEY if settings.QDRANT_API_KEY else None,
+                    prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                    grpc_port=settings.QDRANT_GRPC_PORT,
+                    timeout=settings.QDRANT_TIMEOUT,
+                    limits=httpx.Limits(
+                        max_connections=settings.QDRANT_POOL_SIZE,
+                        max_keepalive_connections=settings.QDRANT_POOL_SIZE
+                    )
+                )
+                # The collection is ensured lazily on first use (needs a running loop)
+            
+            if settings.RETRIEVAL_MODE == "hybrid":
+                self.keyword_index = BM25Index()
             
-            # Create collection if it doesn't exist
-            self._ensure_collection_exists()
+            if settings.RETRIEVAL_CACHE_ENABLED:
+                self.retrieval_cache = RetrievalCache(
+                    dimension=384,
+                    bits=settings.RETRIEVAL_CACHE_BITS,
+                    min_similarity=settings.RETRIEVAL_CACHE_MIN_SIMILARITY,
+                    ttl_seconds=settings.RETRIEVAL_CACHE_TTL,
+                    capacity=settings.RETRIEVAL_CACHE_MAXSIZE
+                )
             
-            logger.info("Vector search initialized successfully")
+            logger.info(f"Vector search initialized successfully ({self.backend} backend)")
         except Exception as e:
             logger.error(f"Failed to initialize vector search: {e}")
             # Don't raise - allow graceful degradation
     
-    def _ensure_collection_exists(self):
-        """Create collection if it doesn't exist"""
+    async def _qdrant(self, method: str, **kwargs) -> Any:
+        """
+        Call an AsyncQdrantClient method, retrying transient failures
+        
+        Args:
+            method: Client method name
+            **kwargs: Method arguments
+            
+        Returns:
+            Method result
+        """
+        attempts = settings.QDRANT_MAX_RETRIES + 1
+        for attempt in range(attempts):
+            try:
+                return await getattr(self.client, method)(**kwargs)
+            except Exception as e:
+                if attempt == attempts - 1 or not is_transient_error(e):
+                    raise
+                delay = settings.QDRANT_RETRY_BACKOFF * (2 ** attempt)
+                logger.warning(f"Qdrant {method} failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+    
+    async def _ensure_ready(self):
+        """Ensure the Qdrant collection exists before the first call (retried until it succeeds)"""
+        if self._collection_ready or not self.client:
+            return
+        async with self._collection_lock:
+            if not self._collection_ready:
+                self._collection_ready = await self._ensure_collection_exists()
+    
+    async def close(self):
+        """Close the Qdrant client's channel and connection pool"""
+        if self.client is not None:
+            try:
+                await self.client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Qdrant client: {e}")
+    
+    async def _ensure_payload_index(self) -> bool:
+        """
+        Index offense_type as a keyword field
+        
+        Every search filters on offense_type; with a keyword index Qdrant
+        resolves the filter from the index and only scores matching points
+        instead of checking the payload of every candidate.
+        
+        Returns:
+            True if the index exists
+        """
+        try:
+            info = await self._qdrant("get_collection", collection_name=self.collection_name)
+            if "offense_type" not in (info.payload_schema or {}):
+                await self._qdrant(
+                    "create_payload_index",
+                    collection_name=self.collection_name,
+                    field_name="offense_type",
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+                logger.info("Created offense_type payload index")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not create offense_type payload index: {e}")
+            return False
+    
+    @property
+    def _has_store(self) -> bool:
+        """Check whether a vector store is configured (an empty local index counts)"""
+        return self.client is not None or self.local_index is not None
+    
+    def _quantization_config(self) -> Optional[ScalarQuantization]:
+        """Qdrant quantization config for VECTOR_QUANTIZATION"""
+        if settings.VECTOR_QUANTIZATION != "int8":
+            return None
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True
+            )
+        )
+    
+    def _search_params(self) -> Optional[SearchParams]:
+        """Rescore quantized candidates against the original float32 vectors"""
+        if settings.VECTOR_QUANTIZATION != "int8":
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=True,
+                oversampling=settings.VECTOR_RESCORE_OVERSAMPLING
+            )
+        )
+    
+    async def _ensure_collection_exists(self) -> bool:
+        """
+        Create collection if it doesn't exist
+        
+        Returns:
+            True if the collection, payload index and quantization are set up
+        """
         try:
-            collections = self.client.get_collections().collections
+            collections = (await self._qdrant("get_collections")).collections
             collection_names = [c.name for c in collections]
+            quantization_config = self._quantization_config()
             
             if self.collection_name not in collection_names:
-                self.client.create_collection(
+                await self._qdrant(
+                    "create_collection",
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=384,  # all-MiniLM-L6-v2 dimension
                         distance=Distance.COSINE
-                    )
+                    ),
+                    quantization_config=quantization_config
                 )
                 logger.info(f"Created collection: {self.collection_name}")
+            
+            if not await self._ensure_payload_index():
+                return False
+            
+            if quantization_config is not None:
+                info = await self._qdrant("get_collection", collection_name=self.collection_name)
+                if info.config.quantization_config is None:
+                    # Qdrant quantizes the existing points in the background
+                    await self._qdrant(
+                        "update_collection",
+                        collection_name=self.collection_name,
+                        quantization_config=quantization_config
+                    )
+                    logger.info(f"Enabled int8 quantization on collection: {self.collection_name}")
+            return True
         except Exception as e:
             logger.warning(f"Could not ensure collection exists: {e}")
+            return False
+    
+    async def _encoder_ready(self) -> bool:
+        """Check whether an encoder is available, loading it off the loop on first use"""
+        return self.embeddings is not None and await self.embeddings.load()
+    
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Encode text into a sentence embedding off the event loop
+        
+        Concurrent calls are batched into a single encode on the embedding
+        worker thread.
+        
+        Args:
+            text: Text to encode
+            
+        Returns:
+            Embedding vector, or None when the encoder is unavailable
+        """
+        if not self.embeddings:
+            return None
+        return await self.embeddings.embed(text)
     
     async def search_legal_sections(
         self,
@@ -75,6 +296,15 @@ class VectorSearch:
         """
         Search for relevant legal sections
         
+        In hybrid mode the vector query and a BM25 keyword query over section
+        titles and descriptions run concurrently and are fused with
+        reciprocal-rank fusion, so exact section numbers and statutory terms
+        rank alongside semantic matches.
+        
+        Results are memoized by the retrieval cache: a query whose embedding
+        lands in the same LSH bucket as a recent, near-identical query reuses
+        its results without another store round-trip.
+        
         Args:
             query_text: Query text (incident description)
             offense_type: Optional offense type filter
@@ -83,13 +313,99 @@ class VectorSearch:
         Returns:
             List of legal section results with scores
         """
-        if not self.client or not self.encoder:
+        query_vector = None
+        if self.retrieval_cache is not None and self._has_store:
+            # Embedded once here and reused by the vector search below
+            query_vector = await self.embed(query_text)
+            if query_vector is not None:
+                cached = self.retrieval_cache.get(query_vector, offense_type, top_k)
+                if cached is not None:
+                    return cached
+        
+        results = await self._retrieve(query_text, query_vector, offense_type, top_k)
+        
+        if query_vector is not None and results and not self._is_fallback(results):
+            self.retrieval_cache.set(query_vector, offense_type, top_k, results)
+        return results
+    
+    async def _retrieve(
+        self,
+        query_text: str,
+        query_vector: Optional[np.ndarray],
+        offense_type: Optional[str],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Run vector (and in hybrid mode keyword) retrieval
+        
+        Args:
+            query_text: Query text (incident description)
+            query_vector: Precomputed query embedding, if any
+            offense_type: Optional offense type filter
+            top_k: Number of results to return
+            
+        Returns:
+            List of legal section results with scores
+        """
+        if self.keyword_index is None:
+            return await self._vector_search(query_text, offense_type, top_k, query_vector)
+        
+        await self._ensure_keyword_index()
+        # Fetch deeper lists from both retrievers so fusion has overlap to work with
+        vector_results, keyword_results = await asyncio.gather(
+            self._vector_search(query_text, offense_type, top_k * 2, query_vector),
+            asyncio.to_thread(self.keyword_index.search, query_text, offense_type, top_k * 2)
+        )
+        if not keyword_results:
+            return vector_results[:top_k]
+        
+        return reciprocal_rank_fusion(
+            [vector_results, keyword_results],
+            k=settings.RRF_K,
+            top_k=top_k
+        )
+    
+    @staticmethod
+    def _is_fallback(results: List[Dict[str, Any]]) -> bool:
+        """Check whether results came from the static fallback list"""
+        return any(str(result["id"]).startswith("fallback_") for result in results)
+    
+    def invalidate_retrieval_cache(self):
+        """Drop memoized search results after the section corpus changes"""
+        if self.retrieval_cache is not None:
+            self.retrieval_cache.invalidate()
+    
+    async def _vector_search(
+        self,
+        query_text: str,
+        offense_type: Optional[str],
+        top_k: int,
+        query_vector: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Semantic search against the vector store
+        
+        Args:
+            query_text: Query text (incident description)
+            offense_type: Optional offense type filter
+            top_k: Number of results to return
+            query_vector: Precomputed query embedding, if any
+            
+        Returns:
+            List of legal section results with scores
+        """
+        if not self._has_store or not await self._encoder_ready():
             logger.warning("Vector search not available, returning empty results")
             return self._get_fallback_sections(offense_type)
         
+        if self.local_index is not None:
+            return await self._search_local(query_text, offense_type, top_k, query_vector)
+        
         try:
             # Encode query
-            query_vector = self.encoder.encode(query_text).tolist()
+            if query_vector is None:
+                query_vector = await self.embed(query_text)
+            query_vector = query_vector.tolist()
             
             # Build filter
             search_filter = None
@@ -104,10 +420,13 @@ class VectorSearch:
                 )
             
             # Search
-            results = self.client.search(
+            await self._ensure_ready()
+            results = await self._qdrant(
+                "search",
                 collection_name=self.collection_name,
                 query_vector=query_vector,
                 query_filter=search_filter,
+                search_params=self._search_params(),
                 limit=top_k
             )
             
@@ -126,6 +445,77 @@ class VectorSearch:
             logger.error(f"Vector search failed: {e}")
             return self._get_fallback_sections(offense_type)
     
+    async def _ensure_keyword_index(self):
+        """Build the keyword index from the vector store on first successful use"""
+        if self._keyword_index_loaded:
+            return
+        async with self._keyword_index_lock:
+            if self._keyword_index_loaded:
+                return
+            try:
+                points = await self._load_points()
+            except Exception as e:
+                # Left unset so the next query retries once the store is back
+                logger.warning(f"Could not build keyword index, using vector results only: {e}")
+                return
+            for point_id, payload in points:
+                self.keyword_index.upsert(point_id, payload)
+            logger.info(f"Built keyword index over {len(points)} legal sections")
+            self._keyword_index_loaded = True
+    
+    async def _load_points(self) -> List[tuple]:
+        """Read every (id, payload) pair from the vector store"""
+        if self.local_index is not None:
+            return await asyncio.to_thread(self.local_index.points)
+        if not self.client:
+            return []
+        
+        await self._ensure_ready()
+        points, offset = [], None
+        while True:
+            records, offset = await self._qdrant(
+                "scroll",
+                collection_name=self.collection_name,
+                limit=1000,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            points.extend((record.id, record.payload or {}) for record in records)
+            if offset is None:
+                return points
+    
+    async def _search_local(
+        self,
+        query_text: str,
+        offense_type: Optional[str],
+        top_k: int,
+        query_vector: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the embedded local index
+        
+        Args:
+            query_text: Query text (incident description)
+            offense_type: Optional offense type filter
+            top_k: Number of results to return
+            query_vector: Precomputed query embedding, if any
+            
+        Returns:
+            List of legal section results with scores
+        """
+        if len(self.local_index) == 0:
+            logger.warning("Local vector index is empty, using fallback sections")
+            return self._get_fallback_sections(offense_type)
+        
+        try:
+            if query_vector is None:
+                query_vector = await self.embed(query_text)
+            return await asyncio.to_thread(self.local_index.search, query_vector, offense_type, top_k)
+        except Exception as e:
+            logger.error(f"Local vector search failed: {e}")
+            return self._get_fallback_sections(offense_type)
+    
     def _get_fallback_sections(self, offense_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get fallback legal sections when vector search is unavailable
@@ -255,7 +645,7 @@ class VectorSearch:
             offense_type: Offense type
             metadata: Additional metadata
         """
-        if not self.client or not self.encoder:
+        if not self._has_store or not await self._encoder_ready():
             logger.warning("Vector search not available, cannot add section")
             return
         
@@ -264,7 +654,7 @@ class VectorSearch:
             text = f"{act_name} Section {section_number}: {section_title}. {section_description}"
             
             # Generate embedding
-            vector = self.encoder.encode(text).tolist()
+            vector = (await self.embed(text)).tolist()
             
             # Prepare payload
             payload = {
@@ -276,8 +666,16 @@ class VectorSearch:
                 **(metadata or {})
             }
             
+            if self.local_index is not None:
+                await asyncio.to_thread(self.local_index.upsert, [section_id], [vector], [payload])
+                self._sections_stored([section_id], [payload])
+                logger.info(f"Added legal section: {act_name} {section_number}")
+                return
+            
             # Add to collection
-            self.client.upsert(
+            await self._ensure_ready()
+            await self._qdrant(
+                "upsert",
                 collection_name=self.collection_name,
                 points=[
                     PointStruct(
@@ -288,7 +686,163 @@ class VectorSearch:
                 ]
             )
             
+            self._sections_stored([section_id], [payload])
             logger.info(f"Added legal section: {act_name} {section_number}")
             
         except Exception as e:
             logger.error(f"Failed to add legal section: {e}")
+    
+    async def add_legal_sections_bulk(
+        self,
+        sections: Iterable[Dict[str, Any]],
+        chunk_size: int = 256,
+        workers: int = 4,
+        skip_unchanged: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Add many legal sections, batching encodes and upserts
+        
+        Sections are processed in chunks; up to `workers` chunks are in
+        flight at once so store writes overlap with encoding. A section
+        whose stored content hash matches is skipped without re-encoding.
+        
+        Args:
+            sections: Section records (see app.ai.section_ingest)
+            chunk_size: Sections per encode/upsert batch
+            workers: Chunks processed concurrently
+            skip_unchanged: Skip sections whose content hash is unchanged
+            
+        Returns:
+            Counters: total, upserted, skipped, failed, seconds, sections_per_second
+        """
+        if not self._has_store or not await self._encoder_ready():
+            raise AIProcessingError("Vector search not available, cannot ingest sections")
+        
+        await self._ensure_ready()
+        stats = {"total": 0, "upserted": 0, "skipped": 0, "failed": 0}
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(workers)
+        pending = set()
+        
+        async def ingest_chunk(chunk: List[Dict[str, Any]]):
+            try:
+                upserted, skipped = await self._ingest_chunk(chunk, skip_unchanged)
+                stats["upserted"] += upserted
+                stats["skipped"] += skipped
+            except Exception as e:
+                logger.error(f"Failed to ingest chunk of {len(chunk)} sections: {e}")
+                stats["failed"] += len(chunk)
+            finally:
+                semaphore.release()
+        
+        for chunk in chunked(sections, chunk_size):
+            stats["total"] += len(chunk)
+            await semaphore.acquire()
+            task = asyncio.create_task(ingest_chunk(chunk))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        
+        if pending:
+            await asyncio.gather(*pending)
+        
+        elapsed = time.perf_counter() - started
+        stats["seconds"] = round(elapsed, 3)
+        stats["sections_per_second"] = round(stats["total"] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"Ingested {stats['upserted']} sections ({stats['skipped']} unchanged, "
+            f"{stats['failed']} failed) in {elapsed:.1f}s"
+        )
+        return stats
+    
+    async def _ingest_chunk(self, chunk: List[Dict[str, Any]], skip_unchanged: bool):
+        """
+        Encode and upsert one chunk of sections
+        
+        Args:
+            chunk: Section records
+            skip_unchanged: Skip sections whose content hash is unchanged
+            
+        Returns:
+            Tuple of (upserted count, skipped count)
+        """
+        ids = [section_id(section) for section in chunk]
+        payloads = []
+        for section in chunk:
+            payload = section_payload(section)
+            payload["content_hash"] = content_hash(section)
+            payloads.append(payload)
+        
+        if skip_unchanged:
+            stored = await self._stored_hashes(ids)
+            keep = [i for i, point_id in enumerate(ids) if stored.get(point_id) != payloads[i]["content_hash"]]
+        else:
+            keep = list(range(len(chunk)))
+        
+        if not keep:
+            return 0, len(chunk)
+        
+        ids = [ids[i] for i in keep]
+        payloads = [payloads[i] for i in keep]
+        vectors = await self.embeddings.embed_many([section_text(chunk[i]) for i in keep])
+        
+        if self.local_index is not None:
+            await asyncio.to_thread(self.local_index.upsert, ids, vectors, payloads)
+        else:
+            points = [
+                PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+                for point_id, vector, payload in zip(ids, vectors, payloads)
+            ]
+            await self._qdrant(
+                "upsert",
+                collection_name=self.collection_name,
+                points=points,
+                wait=True
+            )
+        
+        self._sections_stored(ids, payloads)
+        return len(keep), len(chunk) - len(keep)
+    
+    def _sections_stored(self, ids: List[Union[int, str]], payloads: List[Dict[str, Any]]):
+        """
+        Update the keyword index and drop cached retrievals
+        
+        Only called once the vector store write succeeded, so BM25 never
+        returns a section that vector search and payload lookup lack.
+        
+        Args:
+            ids: Stored point ids
+            payloads: Their payloads
+        """
+        if self.keyword_index is not None:
+            for point_id, payload in zip(ids, payloads):
+                self.keyword_index.upsert(point_id, payload)
+        self.invalidate_retrieval_cache()
+    
+    async def _stored_hashes(self, ids: List[Union[int, str]]) -> Dict[Union[int, str], str]:
+        """
+        Fetch stored content hashes for point ids
+        
+        Args:
+            ids: Point ids
+            
+        Returns:
+            Mapping of id to content hash for points that exist
+        """
+        if self.local_index is not None:
+            # Reads the index log for rows other processes added
+            payloads = await asyncio.to_thread(self.local_index.get_payloads, ids)
+            return {
+                point_id: payloads[str(point_id)].get("content_hash")
+                for point_id in ids
+                if str(point_id) in payloads
+            }
+        
+        await self._ensure_ready()
+        records = await self._qdrant(
+            "retrieve",
+            collection_name=self.collection_name,
+            ids=ids,
+            with_payload=["content_hash"],
+            with_vectors=False
+        )
+        return {record.id: (record.payload or {}).get("content_hash") for record in records}
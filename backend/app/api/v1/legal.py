@@ -2,18 +2,28 @@
 Legal AI API Routes
 Handles incident analysis and legal section extraction
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, File, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Any, Optional, List
 from pydantic import BaseModel, Field
+from dataclasses import asdict
 from datetime import datetime
+import asyncio
+import io
+import json
 import logging
 import requests
+import time
 
 from app.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, require_role
+from app.core.rate_limit import rate_limit
 from app.core.exceptions import AIProcessingError, NotFoundError
 from app.ai.legal_extraction import get_legal_extraction_engine, LegalAnalysisResult
+from app.ai.llm_cache import get_llm_cache
+from app.ai.llm_scheduler import scheduler_stats
+from app.ai.section_ingest import detect_format, read_sections
 
 logger = logging.getLogger(__name__)
 
@@ -97,80 +107,54 @@ def get_nearest_police_station(lat: float, lng: float) -> str:
     return ""
 
 
-async def search_ecourts_judgments(
-    classification: dict,
-    keywords: List[str],
-    legal_sections: List[dict],
-    incident_text: str = ""
-) -> List[dict]:
+def get_fallback_judgments(classification: dict) -> List[dict]:
     """
-    Search for relevant previous judgments using LLM reasoning to simulate dynamic retrieval.
-    This replaces static mocks with AI-hallucinated but realistic case precedents based on training data.
+    Static precedent judgments used when LLM judgment generation is unavailable.
     """
-    try:
-        # Try LLM generation first (Dynamic)
-        engine = get_legal_extraction_engine()
-        judgments = await engine.llm_client.generate_relevant_judgments(
-            incident_text=incident_text,
-            offense_type=classification.get('offense_type', ''),
-            legal_sections=legal_sections
-        )
-        
-        if judgments and len(judgments) > 0:
-            logger.info(f"LLM generated {len(judgments)} judgemnts")
-            return judgments
-
-        # Fallback to Mock Logic if LLM fails
-        logger.warning("LLM judgment generation failed/empty, falling back to mocks")
-        
-        # Generate search keywords based on offense type
-        offense_type = classification.get('offense_type', '').lower()
-        
-        judgments = []
-        
-        # Use strict allowlist for fallback judgments
-        # Only provide mocks for specific, clear legal categories
-        # Prevent fallback for invalid queries
-        if 'non-legal' in offense_type:
-             return []
-
-        if 'theft' in offense_type or 'robbery' in offense_type:
-            judgments.append({
-                "case_title": "State of Maharashtra v. Rajesh Kumar",
-                "case_number": "Criminal Appeal No. 1234/2022",
-                "court": "Bombay High Court",
-                "judgment_date": "15-Mar-2023",
-                "summary": "The court held that theft under Section 303 BNS (Section 379 IPC) requires dishonest intention to take movable property.",
-                "relevance": "Establishes burden of proof for theft.",
-                "url": "https://indiankanoon.org/search/?formInput=theft"
-            })
-        elif 'assault' in offense_type or 'battery' in offense_type:
-             judgments.append({
-                "case_title": "State vs. Anokhilal",
-                "case_number": "Criminal Appeal 678/2021",
-                "court": "Supreme Court of India",
-                "judgment_date": "20-Dec-2021",
-                "summary": "Detailed the medical evidence requirements for proving assault charges.",
-                "relevance": "Relevant for evidentiary standards in assault cases.",
-                "url": "https://indiankanoon.org/search/?formInput=assault"
-            })
-        elif 'cyber' in offense_type or 'fraud' in offense_type:
-             judgments.append({
-                "case_title": "Shreya Singhal v. Union of India",
-                "case_number": "Writ Petition (Criminal) No. 167 of 2012",
-                "court": "Supreme Court of India",
-                "judgment_date": "24-Mar-2015",
-                "summary": "Landmark judgment on online speech and Section 66A of IT Act (struck down), relevant for cyber law principles.",
-                "relevance": "Foundational case for cyber law interpretation.",
-                "url": "https://indiankanoon.org/doc/110813550/"
-            })
-        
-        # If no specific category matched, return empty instead of generic "Landmark Judgment on General"
-        return judgments
-        
-    except Exception as e:
-        logger.error(f"Error searching eCourts judgments: {e}")
-        return []
+    # Generate search keywords based on offense type
+    offense_type = classification.get('offense_type', '').lower()
+    
+    judgments = []
+    
+    # Use strict allowlist for fallback judgments
+    # Only provide mocks for specific, clear legal categories
+    # Prevent fallback for invalid queries
+    if 'non-legal' in offense_type:
+         return []
+
+    if 'theft' in offense_type or 'robbery' in offense_type:
+        judgments.append({
+            "case_title": "State of Maharashtra v. Rajesh Kumar",
+            "case_number": "Criminal Appeal No. 1234/2022",
+            "court": "Bombay High Court",
+            "judgment_date": "15-Mar-2023",
+            "summary": "The court held that theft under Section 303 BNS (Section 379 IPC) requires dishonest intention to take movable property.",
+            "relevance": "Establishes burden of proof for theft.",
+            "url": "https://indiankanoon.org/search/?formInput=theft"
+        })
+    elif 'assault' in offense_type or 'battery' in offense_type:
+         judgments.append({
+            "case_title": "State vs. Anokhilal",
+            "case_number": "Criminal Appeal 678/2021",
+            "court": "Supreme Court of India",
+            "judgment_date": "20-Dec-2021",
+            "summary": "Detailed the medical evidence requirements for proving assault charges.",
+            "relevance": "Relevant for evidentiary standards in assault cases.",
+            "url": "https://indiankanoon.org/search/?formInput=assault"
+        })
+    elif 'cyber' in offense_type or 'fraud' in offense_type:
+         judgments.append({
+            "case_title": "Shreya Singhal v. Union of India",
+            "case_number": "Writ Petition (Criminal) No. 167 of 2012",
+            "court": "Supreme Court of India",
+            "judgment_date": "24-Mar-2015",
+            "summary": "Landmark judgment on online speech and Section 66A of IT Act (struck down), relevant for cyber law principles.",
+            "relevance": "Foundational case for cyber law interpretation.",
+            "url": "https://indiankanoon.org/doc/110813550/"
+        })
+    
+    # If no specific category matched, return empty instead of generic "Landmark Judgment on General"
+    return judgments
 
 
 class PreviousJudgmentResponse(BaseModel):
@@ -214,7 +198,119 @@ class DraftFIRResponse(BaseModel):
     created_at: datetime
 
 
-@router.post("/analyze", response_model=AnalysisResponse, status_code=status.HTTP_201_CREATED)
+def build_classification_response(classification) -> ClassificationResponse:
+    """Convert an IncidentClassification into its response model"""
+    return ClassificationResponse(
+        offense_type=classification.offense_type,
+        offense_category=classification.offense_category,
+        severity_level=classification.severity_level,
+        confidence_score=classification.confidence_score,
+        keywords=classification.keywords,
+        threat_indicators=classification.threat_indicators
+    )
+
+
+def build_entity_responses(entities) -> List[EntityResponse]:
+    """Convert extracted entities into response models"""
+    return [
+        EntityResponse(
+            entity_type=e.entity_type,
+            entity_value=e.entity_value,
+            confidence=e.confidence
+        )
+        for e in entities
+    ]
+
+
+def build_section_responses(legal_sections) -> List[LegalSectionResponse]:
+    """Convert legal sections into response models"""
+    return [
+        LegalSectionResponse(
+            act_name=s.act_name,
+            section_number=s.section_number,
+            section_title=s.section_title,
+            section_description=s.section_description,
+            relevance_score=s.relevance_score,
+            reasoning=s.reasoning,
+            is_cognizable=s.is_cognizable,
+            is_bailable=s.is_bailable,
+            punishment_description=s.punishment_description
+        )
+        for s in legal_sections
+    ]
+
+
+def build_judgment_responses(offense_type: str, judgments: List[dict]) -> List[PreviousJudgmentResponse]:
+    """
+    Convert generated judgments into response models, falling back to mocks
+    """
+    # Previous judgments are generated concurrently inside the analysis pipeline
+    if not judgments and offense_type != "non-legal":
+        logger.warning("LLM judgment generation failed/empty, falling back to mocks")
+        judgments = get_fallback_judgments({'offense_type': offense_type})
+    
+    return [PreviousJudgmentResponse(**judgment) for judgment in judgments]
+
+
+def build_analysis_response(analysis: LegalAnalysisResult, incident_id: str) -> AnalysisResponse:
+    """Convert a LegalAnalysisResult into the API response"""
+    return AnalysisResponse(
+        incident_id=incident_id,
+        classification=build_classification_response(analysis.classification),
+        entities=build_entity_responses(analysis.entities),
+        legal_sections=build_section_responses(analysis.legal_sections),
+        required_documents=analysis.required_documents,
+        next_steps=analysis.next_steps,
+        ai_summary=analysis.ai_summary,
+        previous_judgments=build_judgment_responses(
+            analysis.classification.offense_type,
+            analysis.previous_judgments
+        ),
+        created_at=datetime.utcnow()
+    )
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format a Server-Sent Events message
+    
+    Args:
+        event: Event name
+        data: JSON-serializable payload or pydantic model(s)
+        
+    Returns:
+        SSE wire-format message
+    """
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    elif isinstance(data, list):
+        data = [item.model_dump(mode="json") if isinstance(item, BaseModel) else item for item in data]
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def resolve_police_station_context(request: AnalyzeIncidentRequest) -> str:
+    """Look up the nearest police station off the event loop"""
+    if not (request.user_lat and request.user_lng):
+        return ""
+    try:
+        station_name = await asyncio.to_thread(
+            get_nearest_police_station,
+            request.user_lat,
+            request.user_lng
+        )
+        if station_name:
+            return f"The nearest police station detected is {station_name}."
+    except Exception as e:
+        logger.warning(f"Police station detection error: {e}")
+    return ""
+
+
+@router.post(
+    "/analyze",
+    response_model=AnalysisResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit)]
+)
 async def analyze_incident(
     request: AnalyzeIncidentRequest,
     background_tasks: BackgroundTasks,
@@ -247,14 +343,7 @@ async def analyze_incident(
         engine = get_legal_extraction_engine()
         
         # Detect Nearest Police Station if location provided
-        station_context = ""
-        if request.user_lat and request.user_lng:
-            try:
-                station_name = get_nearest_police_station(request.user_lat, request.user_lng)
-                if station_name:
-                    station_context = f"The nearest police station detected is {station_name}."
-            except Exception as e:
-                logger.warning(f"Police station detection error: {e}")
+        station_context = await resolve_police_station_context(request)
 
         analysis = await engine.analyze_incident(
             incident_text=request.incident_text,
@@ -272,72 +361,8 @@ async def analyze_incident(
         # db.add(incident)
         # db.commit()
         
-        # Search for relevant previous judgments
-        classification_dict = {
-            'offense_type': analysis.classification.offense_type,
-            'offense_category': analysis.classification.offense_category,
-            'severity_level': analysis.classification.severity_level
-        }
-        
-        legal_sections_dict = [
-            {
-                'act_name': s.act_name,
-                'section_number': s.section_number
-            }
-            for s in analysis.legal_sections
-        ]
-        
-        previous_judgments_data = []
-        if analysis.classification.offense_type != "non-legal":
-            previous_judgments_data = await search_ecourts_judgments(
-                classification=classification_dict,
-                keywords=analysis.classification.keywords,
-                legal_sections=legal_sections_dict,
-                incident_text=request.incident_text
-            )
-        
         # Prepare response
-        response = AnalysisResponse(
-            incident_id=incident_id,
-            classification=ClassificationResponse(
-                offense_type=analysis.classification.offense_type,
-                offense_category=analysis.classification.offense_category,
-                severity_level=analysis.classification.severity_level,
-                confidence_score=analysis.classification.confidence_score,
-                keywords=analysis.classification.keywords,
-                threat_indicators=analysis.classification.threat_indicators
-            ),
-            entities=[
-                EntityResponse(
-                    entity_type=e.entity_type,
-                    entity_value=e.entity_value,
-                    confidence=e.confidence
-                )
-                for e in analysis.entities
-            ],
-            legal_sections=[
-                LegalSectionResponse(
-                    act_name=s.act_name,
-                    section_number=s.section_number,
-                    section_title=s.section_title,
-                    section_description=s.section_description,
-                    relevance_score=s.relevance_score,
-                    reasoning=s.reasoning,
-                    is_cognizable=s.is_cognizable,
-                    is_bailable=s.is_bailable,
-                    punishment_description=s.punishment_description
-                )
-                for s in analysis.legal_sections
-            ],
-            required_documents=analysis.required_documents,
-            next_steps=analysis.next_steps,
-            ai_summary=analysis.ai_summary,
-            previous_judgments=[
-                PreviousJudgmentResponse(**judgment)
-                for judgment in previous_judgments_data
-            ],
-            created_at=datetime.utcnow()
-        )
+        response = build_analysis_response(analysis, incident_id)
         
         logger.info(f"Analysis completed for incident {incident_id}")
         
@@ -357,6 +382,69 @@ async def analyze_incident(
         )
 
 
+@router.post("/analyze/stream", dependencies=[Depends(rate_limit)])
+async def analyze_incident_stream(request: AnalyzeIncidentRequest):
+    """
+    Analyze an incident, streaming partial results as Server-Sent Events
+    
+    Events, in order of availability:
+    - start: incident_id
+    - entities / classification: as soon as local extraction finishes
+    - sections: refined legal sections
+    - summary_delta: ai_summary tokens as the provider generates them
+    - summary_replace: full fallback summary replacing earlier deltas
+    - judgments: previous judgments
+    - complete: the full AnalysisResponse
+    - error: analysis failed
+    
+    Args:
+        request: Incident details
+        
+    Returns:
+        text/event-stream response
+    """
+    incident_id = "inc_" + datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    
+    async def event_stream():
+        yield format_sse("start", {"incident_id": incident_id})
+        try:
+            engine = get_legal_extraction_engine()
+            station_context = await resolve_police_station_context(request)
+            
+            async for event, payload in engine.analyze_incident_stream(
+                incident_text=request.incident_text,
+                location=request.location,
+                incident_date=request.incident_date,
+                police_station_context=station_context
+            ):
+                if event == "entities":
+                    yield format_sse(event, build_entity_responses(payload))
+                elif event == "classification":
+                    yield format_sse(event, build_classification_response(payload))
+                elif event == "sections":
+                    yield format_sse(event, build_section_responses(payload))
+                elif event == "summary_delta":
+                    yield format_sse(event, {"text": payload})
+                elif event == "summary_fallback":
+                    yield format_sse("summary_replace", {"text": payload})
+                elif event == "complete":
+                    response = build_analysis_response(payload, incident_id)
+                    yield format_sse("judgments", response.previous_judgments)
+                    yield format_sse("complete", response)
+            
+            logger.info(f"Streaming analysis completed for incident {incident_id}")
+            
+        except Exception as e:
+            logger.error(f"Error during streaming analysis: {e}", exc_info=True)
+            yield format_sse("error", {"message": "Failed to analyze incident"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/sections/{incident_id}", response_model=List[LegalSectionResponse])
 async def get_legal_sections(
     incident_id: str,
@@ -393,7 +481,51 @@ async def get_legal_sections(
         )
 
 
-@router.post("/draft-fir", response_model=DraftFIRResponse)
+def build_fir_inputs(request: DraftFIRRequest) -> dict:
+    """
+    Prepare generate_fir_draft arguments from a draft request
+    """
+    # Import data structures
+    from app.ai.legal_extraction import IncidentClassification, LegalSection
+    
+    # Prepare data from request (Dynamic)
+    incident_text = request.incident_text or "Details not provided."
+    
+    legal_sections = []
+    if request.legal_sections:
+        for s in request.legal_sections:
+            legal_sections.append(LegalSection(
+                act_name=s.get('act_name', ''),
+                section_number=s.get('section_number', ''),
+                section_title=s.get('section_title', ''),
+                section_description='',
+                relevance_score=1.0,
+                reasoning=''
+            ))
+    
+    # Dummy classification (not used in updated prompt)
+    classification = IncidentClassification(
+        offense_type="reported offense",
+        offense_category="criminal",
+        severity_level="medium",
+        confidence_score=0.0,
+        keywords=[],
+        threat_indicators=[]
+    )
+    
+    return {
+        "incident_text": incident_text,
+        "classification": classification,
+        "legal_sections": legal_sections,
+        "user_details": {
+            "name": request.user_name,
+            "address": request.user_address,
+            "phone": request.user_phone
+        }
+    }
+
+
+@router.post("/draft-fir", response_model=DraftFIRResponse, dependencies=[Depends(rate_limit)])
 async def draft_fir(
     request: DraftFIRRequest,
     db: Session = Depends(get_db)
@@ -415,45 +547,8 @@ async def draft_fir(
         # Get legal extraction engine
         engine = get_legal_extraction_engine()
         
-        # Import data structures
-        from app.ai.legal_extraction import IncidentClassification, LegalSection
-        
-        # Prepare data from request (Dynamic)
-        incident_text = request.incident_text or "Details not provided."
-        
-        legal_sections = []
-        if request.legal_sections:
-            for s in request.legal_sections:
-                legal_sections.append(LegalSection(
-                    act_name=s.get('act_name', ''),
-                    section_number=s.get('section_number', ''),
-                    section_title=s.get('section_title', ''),
-                    section_description='',
-                    relevance_score=1.0,
-                    reasoning=''
-                ))
-        
-        # Dummy classification (not used in updated prompt)
-        classification = IncidentClassification(
-            offense_type="reported offense",
-            offense_category="criminal",
-            severity_level="medium",
-            confidence_score=0.0,
-            keywords=[],
-            threat_indicators=[]
-        )
-        
         # Generate FIR draft
-        fir_draft = await engine.llm_client.generate_fir_draft(
-            incident_text=incident_text,
-            classification=classification,
-            legal_sections=legal_sections,
-            user_details={
-                "name": request.user_name,
-                "address": request.user_address,
-                "phone": request.user_phone
-            }
-        )
+        fir_draft = await engine.llm_client.generate_fir_draft(**build_fir_inputs(request))
         
         response = DraftFIRResponse(
             fir_draft=fir_draft,
@@ -475,6 +570,195 @@ async def draft_fir(
         )
 
 
+@router.post("/draft-fir/stream", dependencies=[Depends(rate_limit)])
+async def draft_fir_stream(request: DraftFIRRequest):
+    """
+    Generate FIR draft, streaming tokens as Server-Sent Events
+    
+    Events:
+    - delta: next chunk of the draft
+    - replace: full fallback draft replacing earlier deltas (provider failed)
+    - complete: incident_id and created_at
+    - error: generation failed
+    
+    Args:
+        request: FIR draft request
+        
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"Streaming FIR draft for incident {request.incident_id}")
+    
+    async def event_stream():
+        try:
+            engine = get_legal_extraction_engine()
+            async for event, text in engine.llm_client.stream_fir_draft(**build_fir_inputs(request)):
+                yield format_sse("replace" if event == "fallback" else "delta", {"text": text})
+            
+            yield format_sse("complete", {
+                "incident_id": request.incident_id,
+                "created_at": datetime.utcnow().isoformat()
+            })
+            logger.info(f"FIR draft streamed for incident {request.incident_id}")
+            
+        except Exception as e:
+            logger.error(f"Error streaming FIR draft: {e}", exc_info=True)
+            yield format_sse("error", {"message": "Failed to generate FIR draft"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/sections/bulk")
+async def bulk_ingest_sections(
+    file: UploadFile = File(..., description="Sections as JSONL or CSV"),
+    chunk_size: int = 256,
+    workers: int = 4,
+    skip_unchanged: bool = True,
+    current_user: dict = Depends(require_role("admin"))
+):
+    """
+    Bulk-load legal sections into the vector store (admin only)
+    
+    Args:
+        file: JSONL (one section object per line) or CSV upload
+        chunk_size: Sections per encode/upsert batch
+        workers: Chunks processed concurrently
+        skip_unchanged: Skip sections whose content hash is unchanged
+        
+    Returns:
+        Ingestion counters and throughput
+    """
+    engine = get_legal_extraction_engine()
+    fmt = detect_format(file.filename or "")
+    
+    def parse_upload():
+        lines = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+        return list(read_sections(lines, fmt))
+    
+    # Reading the spooled upload blocks, so parse it off the event loop
+    sections = await asyncio.to_thread(parse_upload)
+    
+    try:
+        stats = await engine.vector_search.add_legal_sections_bulk(
+            sections,
+            chunk_size=max(1, chunk_size),
+            workers=max(1, workers),
+            skip_unchanged=skip_unchanged
+        )
+    except AIProcessingError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    
+    logger.info(f"Bulk section ingest by {current_user['id']}: {stats}")
+    return {"format": fmt, **stats}
+
+
+class BatchClassifyRequest(BaseModel):
+    """Request model for bulk incident classification"""
+    texts: List[str] = Field(..., min_length=1, max_length=50000, description="Incident descriptions")
+
+
+@router.post("/classify/batch")
+async def classify_batch(
+    request: BatchClassifyRequest,
+    current_user: dict = Depends(require_role("admin"))
+):
+    """
+    Classify many incident descriptions in one call (admin only)
+    
+    Args:
+        request: Incident descriptions
+        
+    Returns:
+        Classifications in input order with throughput
+    """
+    engine = get_legal_extraction_engine()
+    if engine.classification_model is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Classification model not available"
+        )
+    
+    started = time.perf_counter()
+    # Scoring is CPU-bound; keep the event loop free
+    results = await asyncio.to_thread(engine.classification_model.classify_batch, request.texts)
+    elapsed = time.perf_counter() - started
+    
+    logger.info(f"Batch classification by {current_user['id']}: {len(results)} texts in {elapsed:.3f}s")
+    return {
+        "count": len(results),
+        "seconds": round(elapsed, 4),
+        "texts_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+        "results": [asdict(result) for result in results]
+    }
+
+
+@router.post("/classifier/reload")
+async def reload_offense_classifier(
+    force: bool = False,
+    current_user: dict = Depends(require_role("admin"))
+):
+    """
+    Load a new offense classifier artifact without a restart (admin only)
+    
+    Args:
+        force: Reload even if the artifact file is unchanged
+        
+    Returns:
+        Whether a new model was loaded and the active model stats
+    """
+    engine = get_legal_extraction_engine()
+    model = engine.classification_model
+    if model is None or model.offense_classifier is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Offense classifier not enabled"
+        )
+    
+    reloaded = await asyncio.to_thread(model.offense_classifier.reload, force)
+    stats = model.offense_classifier.stats()
+    logger.info(f"Offense classifier reload by {current_user['id']}: reloaded={reloaded}, version={stats['version']}")
+    return {"reloaded": reloaded, **stats}
+
+
+@router.get("/metrics")
+async def ai_metrics(current_user: dict = Depends(require_role("admin"))):
+    """Cache and throughput counters for the legal AI service (admin only)"""
+    llm_cache = get_llm_cache()
+    engine = get_legal_extraction_engine()
+    return {
+        "llm_cache": llm_cache.stats() if llm_cache else None,
+        "semantic_cache": engine.semantic_cache.stats() if engine.semantic_cache else None,
+        "analysis_coalescing": engine.inflight.stats(),
+        "llm_coalescing": engine.llm_client.inflight.stats(),
+        "llm_providers": (
+            engine.llm_client.client.stats()
+            if hasattr(engine.llm_client.client, "stats") else None
+        ),
+        "llm_scheduler": scheduler_stats(),
+        "embeddings": (
+            engine.vector_search.embeddings.stats()
+            if engine.vector_search.embeddings else None
+        ),
+        "ner": (
+            engine.ner_model.service.stats()
+            if engine.ner_model and engine.ner_model.service else None
+        ),
+        "offense_classifier": (
+            engine.classification_model.offense_classifier.stats()
+            if engine.classification_model and engine.classification_model.offense_classifier else None
+        ),
+        "retrieval_cache": (
+            engine.vector_search.retrieval_cache.stats()
+            if engine.vector_search.retrieval_cache else None
+        ),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint for legal AI service"""
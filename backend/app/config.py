@@ -2,7 +2,7 @@
 Configuration management for the India Legal Assistance AI Platform
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Dict, List
 from functools import lru_cache
 
 
@@ -24,10 +24,60 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600
     
+    # LLM response cache (backend: redis, memory or none)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_BACKEND: str = "redis"
+    LLM_CACHE_LOCAL_MAXSIZE: int = 512
+    LLM_CACHE_TTLS: Dict[str, int] = {
+        "refine_legal_sections": 86400,
+        "generate_analysis_summary": 3600,
+        "generate_fir_draft": 3600,
+        "generate_practical_guidance": 3600,
+        "generate_structured_analysis": 3600,
+        "generate_relevant_judgments": 86400,
+        "analyze_client_intake": 0,
+    }
+    
+    # Semantic cache for incident analyses (eviction: lru or fifo)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_CAPACITY: int = 1000
+    SEMANTIC_CACHE_TTL: int = 3600
+    SEMANTIC_CACHE_EVICTION: str = "lru"
+    
     # Qdrant Vector Database
     QDRANT_URL: str = "http://localhost:6333"
     QDRANT_API_KEY: str = ""
     QDRANT_COLLECTION_NAME: str = "legal_sections"
+    QDRANT_PREFER_GRPC: bool = True
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_TIMEOUT: int = 10  # seconds per call
+    QDRANT_MAX_RETRIES: int = 2
+    QDRANT_RETRY_BACKOFF: float = 0.2  # seconds, doubled per retry
+    QDRANT_POOL_SIZE: int = 32  # REST keep-alive connections
+    
+    # Vector store backend: qdrant or local (embedded index, no server)
+    VECTOR_BACKEND: str = "qdrant"
+    LOCAL_INDEX_DIR: str = "./data/vector_index"
+    LOCAL_INDEX_HNSW_THRESHOLD: int = 20000  # needs hnswlib; exact search without it
+    
+    # Vector quantization: none or int8 (top candidates rescored in float32).
+    # Local index: float32 rows are kept for rescoring, so int8 adds ~25% storage
+    # and only speeds up exact scans past the crossover below (slower under ~50k rows)
+    VECTOR_QUANTIZATION: str = "none"
+    VECTOR_RESCORE_OVERSAMPLING: float = 4.0
+    VECTOR_QUANTIZATION_MIN_POINTS: int = 100000  # local index scans smaller than this use float32
+    
+    # Section retrieval: vector or hybrid (vector + BM25 fused with RRF)
+    RETRIEVAL_MODE: str = "hybrid"
+    RRF_K: int = 60
+    
+    # Retrieval result cache (LSH buckets over query embeddings)
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_TTL: int = 600  # seconds
+    RETRIEVAL_CACHE_BITS: int = 12
+    RETRIEVAL_CACHE_MIN_SIMILARITY: float = 0.92
+    RETRIEVAL_CACHE_MAXSIZE: int = 2048
     
     # JWT Authentication
     SECRET_KEY: str = "development_secret_key"
@@ -40,8 +90,77 @@ class Settings(BaseSettings):
     GOOGLE_AI_API_KEY: str = ""
     GROQ_API_KEY: str = ""
     AI_MODEL: str = "gpt-3.5-turbo"
+    # Per-provider model ids; empty uses AI_MODEL for the primary provider only,
+    # and a secondary provider without its own model is left out of failover
+    GROQ_MODEL: str = ""
+    OPENAI_MODEL: str = ""
+    GOOGLE_AI_MODEL: str = "gemini-pro"
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     
+    # Local sentence encoder (preload loads it before workers fork)
+    ENCODER_MODEL: str = "all-MiniLM-L6-v2"
+    ENCODER_PRELOAD: bool = False
+    ENCODER_WARMUP_ENABLED: bool = True
+    ENCODER_WARMUP_BATCH_SIZE: int = 8
+    
+    # spaCy NER (tok2vec + ner only), batched on a worker thread
+    NER_SPACY_MODEL: str = "en_core_web_sm"
+    NER_BATCH_MAX_SIZE: int = 16
+    NER_BATCH_MAX_WAIT_MS: float = 5.0
+    NER_THREADS: int = 1
+    
+    # Trained offense classifier (keyword matching is the fallback)
+    OFFENSE_CLASSIFIER_ENABLED: bool = True
+    OFFENSE_CLASSIFIER_PATH: str = "./data/models/offense_classifier.npz"
+    OFFENSE_CLASSIFIER_MIN_CONFIDENCE: float = 0.5
+    OFFENSE_CLASSIFIER_RELOAD_INTERVAL: float = 5.0  # seconds between artifact checks, 0 disables
+    
+    # Query embedding micro-batching
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_THREADS: int = 1
+    
+    # Persistent embedding cache (dtype: float16 or float32)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: str = "./data/embeddings"
+    EMBEDDING_CACHE_DTYPE: str = "float16"
+    EMBEDDING_CACHE_LRU_SIZE: int = 4096
+    OPENAI_BASE_URL: str = ""
+    GROQ_BASE_URL: str = ""
+    
+    # LLM HTTP client
+    LLM_REQUEST_TIMEOUT: float = 60.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    
+    # LLM provider routing (failover, hedging, circuit breakers)
+    LLM_ROUTER_ENABLED: bool = True
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_QUANTILE: float = 0.95  # of the same provider's latency for the same method
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # methods with fewer samples are not hedged
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_MIN_REQUESTS: int = 5
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_COOLDOWN: float = 30.0
+    
+    # LLM request scheduling (per-provider budgets; 0 disables a budget)
+    LLM_SCHEDULER_ENABLED: bool = True
+    # Provider account limits, opt-in: providers not listed are only bounded by
+    # adaptive concurrency. Limits depend on the account tier, so set them from
+    # your plan, e.g. LLM_RATE_LIMITS='{"groq": {"rpm": 30, "tpm": 6000}}' for
+    # groq's free tier
+    LLM_RATE_LIMITS: Dict[str, Dict[str, int]] = {}
+    LLM_CONCURRENCY_INITIAL: int = 8
+    LLM_CONCURRENCY_MAX: int = 32
+    LLM_SCHEDULER_MAX_WAIT: float = 30.0
+    # Completion tokens reserved per call (capped by max_tokens, settled on release)
+    LLM_COMPLETION_TOKEN_ESTIMATE: int = 400
+    # Methods not listed are "interactive"
+    LLM_METHOD_PRIORITIES: Dict[str, str] = {
+        "analyze_client_intake": "background",
+        "generate_relevant_judgments": "background",
+    }
+    
     # External APIs
     GOOGLE_MAPS_API_KEY: str = ""
     ECOURTS_API_KEY: str = ""
@@ -0,0 +1,90 @@
+"""
+Per-client request rate limiting
+"""
+import threading
+import time
+from typing import Dict, Tuple
+
+from fastapi import Request
+
+from app.config import settings
+from app.core.exceptions import RateLimitError
+
+
+class RateLimiter:
+    """
+    Fixed-window request counter per client
+
+    Counts are kept in process memory, so with several worker processes
+    each enforces the limits separately.
+    """
+
+    def __init__(self, per_minute: int, per_hour: int):
+        """
+        Initialize rate limiter
+
+        Args:
+            per_minute: Requests allowed per client per minute (0 disables)
+            per_hour: Requests allowed per client per hour (0 disables)
+        """
+        self.windows = tuple((seconds, limit) for seconds, limit in ((60, per_minute), (3600, per_hour)) if limit > 0)
+        # (client, window seconds) -> (window start, requests counted)
+        self._counts: Dict[Tuple[str, int], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def _prune(self, now: float):
+        """Drop counters whose window has ended"""
+        self._counts = {
+            key: (start, count)
+            for key, (start, count) in self._counts.items()
+            if now - start < key[1]
+        }
+        self._last_prune = now
+
+    def hit(self, client: str):
+        """
+        Count one request from a client
+
+        Args:
+            client: Client identifier
+
+        Raises:
+            RateLimitError: If the client exceeded a limit
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_prune >= 60:
+                self._prune(now)
+
+            updated = {}
+            for seconds, limit in self.windows:
+                start, count = self._counts.get((client, seconds), (now, 0))
+                if now - start >= seconds:
+                    start, count = now, 0
+                if count >= limit:
+                    raise RateLimitError(details={
+                        "limit": limit,
+                        "window_seconds": seconds,
+                        "retry_after": int(start + seconds - now) + 1
+                    })
+                updated[(client, seconds)] = (start, count + 1)
+            # Only counted once every window allows it
+            self._counts.update(updated)
+
+
+_rate_limiter = RateLimiter(settings.RATE_LIMIT_PER_MINUTE, settings.RATE_LIMIT_PER_HOUR)
+
+
+async def rate_limit(request: Request):
+    """
+    Dependency limiting requests per client IP address
+
+    Args:
+        request: Incoming request
+
+    Raises:
+        RateLimitError: If the client exceeded RATE_LIMIT_PER_MINUTE or RATE_LIMIT_PER_HOUR
+    """
+    client = request.client.host if request.client else "unknown"
+    _rate_limiter.hit(client)
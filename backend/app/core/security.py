@@ -7,11 +7,9 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
 import secrets
 
 from app.config import settings
-from app.database import get_db
 from app.core.exceptions import AuthenticationError, AuthorizationError
 
 # Password hashing context
@@ -123,16 +121,16 @@ def generate_anonymous_token() -> str:
     return secrets.token_urlsafe(32)
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
     """
     Get current authenticated user from token
     
+    There is no user table yet (auth issues stub tokens), so the user is
+    read from the signed token claims. Roles other than "user" come only
+    from tokens minted with the server secret (scripts/create_admin_token.py).
+    
     Args:
         token: JWT token from request
-        db: Database session
         
     Returns:
         User data
@@ -142,25 +140,18 @@ async def get_current_user(
     """
     payload = decode_token(token)
     
+    if payload.get("type", "access") != "access":
+        raise AuthenticationError(message="Access token required")
+    
     user_id: str = payload.get("sub")
     if user_id is None:
         raise AuthenticationError(message="Invalid token payload")
     
-    # Import here to avoid circular dependency
-    from app.models.user import User
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise AuthenticationError(message="User not found")
-    
-    if not user.is_active:
-        raise AuthenticationError(message="User account is inactive")
-    
     return {
-        "id": str(user.id),
-        "email": user.email,
-        "role": user.role,
-        "is_anonymous": user.is_anonymous
+        "id": str(user_id),
+        "email": payload.get("email"),
+        "role": payload.get("role", "user"),
+        "is_anonymous": bool(payload.get("is_anonymous", False))
     }
 
 
@@ -7,6 +7,7 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 from typing import AsyncGenerator
@@ -15,6 +16,9 @@ from app.config import settings
 from app.database import init_db, close_db
 from app.core.logging import setup_logging
 from app.core.exceptions import APIException
+from app.ai.llm_providers import close_http_client
+from app.ai.legal_extraction import close_legal_extraction_engine
+from app.ai import encoder
 
 # Import routers
 from app.api.v1 import (
@@ -32,6 +36,10 @@ from app.api.v1 import (
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Load the encoder in the parent process so forked workers share it
+if settings.ENCODER_PRELOAD:
+    encoder.preload()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
@@ -50,10 +58,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Warm the encoder in the background; /health reports 503 until it is ready
+    warmup_task = None
+    if settings.ENCODER_WARMUP_ENABLED and not encoder.is_ready():
+        warmup_task = asyncio.create_task(asyncio.to_thread(encoder.warm_up))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await close_http_client()
+    await close_legal_extraction_engine()
     close_db()
     logger.info("Application shutdown complete")
 
@@ -78,8 +95,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves Server-Sent Events streams uncompressed"""
+    
+    async def __call__(self, scope, receive, send):
+        # Compressing an event stream buffers it and defeats incremental delivery
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 # Add GZip middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1000)
 
 
 # Request timing middleware
@@ -137,13 +165,18 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "app_name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "environment": settings.ENVIRONMENT
-    }
+    """Health check endpoint (503 while the encoder is warming up)"""
+    ready = encoder.is_ready()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "healthy" if ready else "warming_up",
+            "app_name": settings.APP_NAME,
+            "version": settings.APP_VERSION,
+            "environment": settings.ENVIRONMENT,
+            "encoder": encoder.encoder_status()
+        }
+    )
 
 
 # Root endpoint
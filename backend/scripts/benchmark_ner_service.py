@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+NER Service Benchmark
+Compares the full spaCy pipeline on the event loop with the trimmed,
+batched NERService under concurrent load
+
+Usage:
+    python scripts/benchmark_ner_service.py --requests 200 --concurrency 16
+
+Baseline: every request runs the complete en_core_web_sm pipeline with
+nlp(text) directly in the coroutine, as NERModel did before. Service: the
+same requests go through NERService (tok2vec + ner only, nlp.pipe batches
+on a worker thread). Reports per-request latency and throughput.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ai.ner_service import NERService
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+SAMPLE_INCIDENTS = [
+    "On 12 March 2024 Ramesh Kumar from Pune threatened my father outside the State Bank of India branch.",
+    "A caller claiming to be from Paytm took Rs. 45,000 from my account on Monday evening.",
+    "My landlord Suresh Verma in Bengaluru refuses to return the deposit of two months rent.",
+    "Two men on a motorcycle snatched my wife's gold chain near Connaught Place in Delhi last Friday.",
+    "Infosys has not paid my salary for the last three months despite emails to the HR department.",
+]
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+async def run_load(extract, texts, concurrency: int):
+    """Issue requests with bounded concurrency, returning latencies and wall time"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text: str):
+        async with semaphore:
+            started = time.perf_counter()
+            await extract(text)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    return latencies, time.perf_counter() - started
+
+
+def report(name: str, latencies, wall: float):
+    print(
+        f"{name:<10} {percentile(latencies, 0.5):>9.1f} {percentile(latencies, 0.95):>9.1f} "
+        f"{len(latencies) / wall:>10.1f}"
+    )
+
+
+async def main_async(args):
+    import spacy
+
+    texts = [SAMPLE_INCIDENTS[i % len(SAMPLE_INCIDENTS)] for i in range(args.requests)]
+
+    full = spacy.load(args.model)
+    logger.info(f"Full pipeline components: {', '.join(full.pipe_names)}")
+
+    async def baseline(text: str):
+        return [(ent.label_, ent.text) for ent in full(text).ents]
+
+    service = NERService(
+        model_name=args.model,
+        max_batch_size=args.batch_size,
+        max_wait_ms=args.max_wait_ms,
+        threads=args.threads
+    )
+    if not service.available:
+        print("spaCy model not available")
+        sys.exit(1)
+
+    # Warm both pipelines before timing
+    await baseline(texts[0])
+    await service.extract(texts[0])
+
+    base_latencies, base_wall = await run_load(baseline, texts, args.concurrency)
+    service_latencies, service_wall = await run_load(service.extract, texts, args.concurrency)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'pipeline':<10} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>10}")
+    report("full", base_latencies, base_wall)
+    report("service", service_latencies, service_wall)
+    stats = service.stats()
+    print(f"Service components: {', '.join(stats['components'])}; avg batch {stats['avg_batch']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batched NER service")
+    parser.add_argument("--model", default="en_core_web_sm", help="spaCy model package")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--batch-size", type=int, default=16, help="Largest nlp.pipe batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Batch fill wait")
+    parser.add_argument("--threads", type=int, default=1, help="NER worker threads")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Quantization Benchmark
+Compares float32 and int8 (with float32 rescoring) exact search in the local index
+
+Usage:
+    python scripts/benchmark_quantization.py --points 100000 --queries 200
+    python scripts/benchmark_quantization.py --points 20000 50000 100000 200000
+
+Vectors are synthetic: unit-normalized points scattered around random
+cluster centres, which resembles the cluster structure of sentence
+embeddings. For each size, reports bytes scanned per query, index files on
+disk, mean query latency and recall@k of the int8 index against float32
+exact search. Use the smallest size where int8 is faster as
+VECTOR_QUANTIZATION_MIN_POINTS. Measured at 384 dimensions, int8 was about
+2x slower at 20k points and broke even between 50k and 100k.
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ai.local_index import LocalVectorIndex
+
+
+def make_vectors(rng, count: int, dimension: int, clusters: int, spread: float) -> np.ndarray:
+    """Clustered unit vectors"""
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, count)]
+    vectors += spread * rng.standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_index(directory: str, vectors: np.ndarray, quantization: str, oversampling: float) -> LocalVectorIndex:
+    """Load vectors into a fresh local index"""
+    index = LocalVectorIndex(
+        directory,
+        dimension=vectors.shape[1],
+        hnsw_threshold=len(vectors) + 1,  # Keep both indexes on exact scans
+        quantization=quantization,
+        rescore_oversampling=oversampling,
+        quantization_min_points=0  # Always scan the codes to measure them
+    )
+    for start in range(0, len(vectors), 10000):
+        end = min(start + 10000, len(vectors))
+        index.upsert(
+            [str(i) for i in range(start, end)],
+            vectors[start:end],
+            [{"offense_type": None}] * (end - start)
+        )
+    return index
+
+
+def disk_bytes(directory: str) -> int:
+    """Total size of the index files"""
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def run_queries(index: LocalVectorIndex, queries: np.ndarray, top_k: int):
+    """Return (result id lists, mean latency in ms)"""
+    results = []
+    started = time.perf_counter()
+    for query in queries:
+        results.append([r["id"] for r in index.search(query, top_k=top_k)])
+    return results, (time.perf_counter() - started) / len(queries) * 1000
+
+
+def compare(args, points: int):
+    """Benchmark float32 against int8 at one corpus size"""
+    rng = np.random.default_rng(args.seed)
+    vectors = make_vectors(rng, points, args.dimension, args.clusters, args.spread)
+    queries = vectors[rng.integers(0, points, args.queries)]
+    queries = queries + args.spread * rng.standard_normal(queries.shape).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as f32_dir, tempfile.TemporaryDirectory() as int8_dir:
+        f32_index = build_index(f32_dir, vectors, "none", args.oversampling)
+        int8_index = build_index(int8_dir, vectors, "int8", args.oversampling)
+
+        # Warm the page cache and code paths
+        run_queries(f32_index, queries[:10], args.top_k)
+        run_queries(int8_index, queries[:10], args.top_k)
+
+        exact, f32_ms = run_queries(f32_index, queries, args.top_k)
+        approx, int8_ms = run_queries(int8_index, queries, args.top_k)
+
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+
+        print(f"points={points} dim={args.dimension} top_k={args.top_k} oversampling={args.oversampling}")
+        print(f"{'mode':<8}{'scan MB':>10}{'disk MB':>10}{'ms/query':>12}{'recall@k':>12}")
+        print(
+            f"{'float32':<8}{f32_index.stats()['scan_bytes'] / 1e6:>10.1f}"
+            f"{disk_bytes(f32_dir) / 1e6:>10.1f}{f32_ms:>12.2f}{1.0:>12.4f}"
+        )
+        print(
+            f"{'int8':<8}{int8_index.stats()['scan_bytes'] / 1e6:>10.1f}"
+            f"{disk_bytes(int8_dir) / 1e6:>10.1f}{int8_ms:>12.2f}{recall:>12.4f}"
+        )
+        return int8_ms < f32_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark int8 quantized local vector search")
+    parser.add_argument("--points", type=int, nargs="+", default=[50000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--spread", type=float, default=0.08)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    faster = [points for points in sorted(args.points) if compare(args, points)]
+    if faster:
+        print(f"int8 faster from {faster[0]} points (VECTOR_QUANTIZATION_MIN_POINTS)")
+    else:
+        print("int8 not faster at any measured size; keep VECTOR_QUANTIZATION=none")
+
+
+if __name__ == "__main__":
+    main()
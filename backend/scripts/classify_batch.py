@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Bulk Incident Classification Script
+Reclassifies many incident descriptions with ClassificationModel.classify_batch
+
+Usage:
+    python scripts/classify_batch.py descriptions.jsonl -o classified.jsonl
+    python scripts/classify_batch.py --from-cases -o cases_classified.jsonl
+
+Input is JSONL (one object per line with a "text" or "description" field)
+or plain text (one description per line). With --from-cases the stored
+case descriptions are read from the database instead. Each output line is
+the input id (line number or case id) plus its classification.
+"""
+import sys
+import os
+import argparse
+import json
+import time
+from dataclasses import asdict
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ai.classification import ClassificationModel
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def read_file(path: str):
+    """Yield (id, text) pairs from a JSONL or plain-text file"""
+    jsonl = path.endswith((".jsonl", ".ndjson"))
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if not jsonl:
+                yield line_number, line
+                continue
+            record = json.loads(line)
+            text = record.get("text") or record.get("description")
+            if text is None:
+                logger.warning(f"Line {line_number}: no text or description field, skipped")
+                continue
+            yield record.get("id", line_number), text
+
+
+def read_cases():
+    """Yield (case id, description) pairs for every stored case"""
+    from app.database import SessionLocal
+    from app.models import Case
+
+    db = SessionLocal()
+    try:
+        for case_id, description in db.query(Case.id, Case.description).yield_per(1000):
+            yield case_id, description
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify incident descriptions in bulk")
+    parser.add_argument("path", nargs="?", help="JSONL or text file of descriptions")
+    parser.add_argument("--from-cases", action="store_true", help="Classify stored case descriptions")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Texts per classify_batch call")
+    args = parser.parse_args()
+
+    if bool(args.path) == args.from_cases:
+        parser.error("give either a file path or --from-cases")
+
+    records = read_cases() if args.from_cases else read_file(args.path)
+    model = ClassificationModel()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    total = 0
+    busy = 0.0
+
+    def flush(batch):
+        nonlocal total, busy
+        started = time.perf_counter()
+        results = model.classify_batch([text for _, text in batch])
+        busy += time.perf_counter() - started
+        for (record_id, _), result in zip(batch, results):
+            out.write(json.dumps({"id": record_id, **asdict(result)}) + "\n")
+        total += len(batch)
+
+    try:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= args.batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    rate = f"{total / busy:.0f} texts/s" if busy else "n/a"
+    logger.info(f"Classified {total} descriptions in {busy:.2f}s of scoring ({rate})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Admin Token Script
+Mints an access token with the admin role for the admin-only endpoints
+(/legal/sections/bulk, /legal/classify/batch, /legal/classifier/reload,
+/legal/metrics)
+
+Usage:
+    python scripts/create_admin_token.py ops@example.com
+    python scripts/create_admin_token.py ops@example.com --minutes 60
+
+The token is signed with SECRET_KEY, so run this where the server's
+configuration is available and pass the token as a Bearer header.
+"""
+import sys
+import os
+import argparse
+from datetime import timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.security import create_access_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create an admin access token")
+    parser.add_argument("email", help="Operator the token is issued to")
+    parser.add_argument("--minutes", type=int, default=30, help="Token lifetime")
+    args = parser.parse_args()
+
+    token = create_access_token(
+        {"sub": f"admin:{args.email}", "email": args.email, "role": "admin"},
+        expires_delta=timedelta(minutes=args.minutes)
+    )
+    print(token)
+
+
+if __name__ == "__main__":
+    main()
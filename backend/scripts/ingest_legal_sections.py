@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Legal Section Ingestion Script
+Bulk-loads legal sections from JSONL or CSV into the configured vector store
+
+Usage:
+    python scripts/ingest_legal_sections.py sections.jsonl
+    python scripts/ingest_legal_sections.py bns.csv --chunk-size 512 --workers 8
+
+Each record needs act_name, section_number, section_title and
+section_description; offense_type, id, is_cognizable, is_bailable,
+punishment_description and any other columns are stored in the payload.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ai.vector_search import VectorSearch
+from app.ai.section_ingest import detect_format, read_sections
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def ingest(path: str, fmt: str, chunk_size: int, workers: int, skip_unchanged: bool):
+    """Stream sections from a file into the vector store"""
+    vector_search = VectorSearch()
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return await vector_search.add_legal_sections_bulk(
+                read_sections(f, fmt),
+                chunk_size=chunk_size,
+                workers=workers,
+                skip_unchanged=skip_unchanged
+            )
+    finally:
+        await vector_search.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load legal sections into the vector store")
+    parser.add_argument("path", help="JSONL or CSV file of sections")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="File format (default: from extension)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Sections per encode/upsert batch")
+    parser.add_argument("--workers", type=int, default=4, help="Chunks processed concurrently")
+    parser.add_argument("--force", action="store_true", help="Re-encode sections even if unchanged")
+    args = parser.parse_args()
+
+    stats = asyncio.run(ingest(
+        args.path,
+        args.format or detect_format(args.path),
+        args.chunk_size,
+        args.workers,
+        not args.force
+    ))
+    logger.info(f"✅ Ingestion finished: {json.dumps(stats)}")
+    if stats["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
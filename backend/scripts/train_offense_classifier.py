@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Offense Classifier Training Script
+Trains a TF-IDF + logistic regression offense classifier and writes a
+versioned artifact that running servers pick up without a restart
+
+Usage:
+    python scripts/train_offense_classifier.py labeled_incidents.jsonl
+    python scripts/train_offense_classifier.py labeled.jsonl --version 2024-06-a --no-activate
+
+Each input line is a JSON object with "text" (or "description") and
+"offense_type" (or "label"). The model is evaluated on a held-out split
+against the keyword matcher, then written as <name>-<version>.npz next to
+OFFENSE_CLASSIFIER_PATH and atomically copied over the active path (skip
+with --no-activate; copy an older versioned file back to roll back).
+"""
+import sys
+import os
+import argparse
+import json
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.ai.classification import ClassificationModel, KEYWORD_AUTOMATON
+from app.ai.offense_classifier import ARTIFACT_FORMAT, TOKEN_PATTERN, ClassifierArtifact, OffenseClassifier
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def read_examples(path: str):
+    """Load (text, label) pairs from JSONL"""
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.get("text") or record.get("description")
+            label = record.get("offense_type") or record.get("label")
+            if not text or not label:
+                logger.warning(f"Line {line_number}: missing text or label, skipped")
+                continue
+            texts.append(text)
+            labels.append(label)
+    return texts, labels
+
+
+def save_artifact(path: str, vectorizer, model, meta: dict):
+    """Write the vocabulary, idf and coefficients as an .npz artifact"""
+    coef = model.coef_
+    intercept = model.intercept_
+    if coef.shape[0] == 1:
+        # Binary models keep one weight row; split it so softmax gives the sigmoid
+        coef = np.vstack([-coef[0] / 2, coef[0] / 2])
+        intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            meta=np.array(json.dumps(meta)),
+            terms=np.array(vectorizer.get_feature_names_out().tolist(), dtype=str),
+            idf=vectorizer.idf_.astype(np.float32),
+            coef=coef.astype(np.float32),
+            intercept=intercept.astype(np.float32),
+            labels=np.array([str(label) for label in model.classes_], dtype=str)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the offense type classifier")
+    parser.add_argument("path", help="Labeled JSONL file")
+    parser.add_argument("--output", default=settings.OFFENSE_CLASSIFIER_PATH, help="Active artifact path")
+    parser.add_argument("--version", help="Artifact version (default: UTC timestamp)")
+    parser.add_argument("--ngram-max", type=int, default=2, help="Longest word n-gram")
+    parser.add_argument("--min-df", type=int, default=2, help="Minimum document frequency of a term")
+    parser.add_argument("--C", type=float, default=4.0, help="Inverse regularization strength")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Held-out fraction")
+    parser.add_argument("--seed", type=int, default=0, help="Split seed")
+    parser.add_argument("--no-activate", action="store_true", help="Only write the versioned artifact")
+    args = parser.parse_args()
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.model_selection import train_test_split
+
+    texts, labels = read_examples(args.path)
+    if len(set(labels)) < 2:
+        logger.error("Need examples of at least two offense types")
+        sys.exit(1)
+    logger.info(f"Loaded {len(texts)} examples, {len(set(labels))} offense types")
+
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=args.test_size, random_state=args.seed
+    )
+
+    vectorizer = TfidfVectorizer(
+        token_pattern=TOKEN_PATTERN,
+        ngram_range=(1, args.ngram_max),
+        min_df=args.min_df,
+        sublinear_tf=True
+    )
+    model = LogisticRegression(C=args.C, max_iter=2000)
+    model.fit(vectorizer.fit_transform(train_texts), train_labels)
+
+    predicted = model.predict(vectorizer.transform(test_texts))
+    keywords = ClassificationModel()
+    baseline = [keywords._classify_offense_type(KEYWORD_AUTOMATON.find(text.lower()))[0] for text in test_texts]
+    metrics = {
+        "train_size": len(train_texts),
+        "test_size": len(test_texts),
+        "accuracy": round(accuracy_score(test_labels, predicted), 4),
+        "macro_f1": round(f1_score(test_labels, predicted, average="macro"), 4),
+        "keyword_accuracy": round(accuracy_score(test_labels, baseline), 4),
+        "keyword_macro_f1": round(f1_score(test_labels, baseline, average="macro"), 4),
+    }
+
+    version = args.version or datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    meta = {
+        "format": ARTIFACT_FORMAT,
+        "version": version,
+        "trained_at": datetime.utcnow().isoformat(),
+        "token_pattern": TOKEN_PATTERN,
+        "ngram_max": args.ngram_max,
+        "sublinear_tf": True,
+        "metrics": metrics,
+    }
+
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.output))[0]
+    versioned = os.path.join(output_dir, f"{stem}-{version}.npz")
+    save_artifact(versioned, vectorizer, model, meta)
+
+    # The served scorer must agree with scikit-learn on the held-out texts
+    artifact = ClassifierArtifact(versioned)
+    expected = model.predict_proba(vectorizer.transform(test_texts[:200]))
+    for text, probabilities in zip(test_texts[:200], expected):
+        columns, weights = artifact.features(text)
+        if columns and not np.allclose(artifact.probabilities(columns, weights), probabilities, atol=1e-4):
+            logger.error("Artifact scoring differs from scikit-learn, not activating")
+            sys.exit(1)
+
+    scorer = OffenseClassifier(versioned, min_confidence=0.0, reload_interval=0)
+    started = time.perf_counter()
+    for text in test_texts:
+        scorer.predict(text)
+    latency_us = (time.perf_counter() - started) / len(test_texts) * 1e6
+
+    if not args.no_activate:
+        # Copy then rename so a reloading server never reads a partial file
+        staging = args.output + ".tmp"
+        shutil.copyfile(versioned, staging)
+        os.replace(staging, args.output)
+
+    print(f"Version {version}: {versioned}" + ("" if args.no_activate else f" -> {args.output}"))
+    print(f"{'model':<10} {'accuracy':>9} {'macro F1':>9}")
+    print(f"{'tfidf+lr':<10} {metrics['accuracy']:>9.3f} {metrics['macro_f1']:>9.3f}")
+    print(f"{'keywords':<10} {metrics['keyword_accuracy']:>9.3f} {metrics['keyword_macro_f1']:>9.3f}")
+    print(f"Scoring: {latency_us:.0f} us per text")
+
+
+if __name__ == "__main__":
+    main()
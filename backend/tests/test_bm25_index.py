@@ -0,0 +1,73 @@
+"""
+Tests for keyword retrieval helpers
+"""
+import pytest
+
+from app.ai.bm25_index import reciprocal_rank_fusion, tokenize
+
+
+def ranked(*ids):
+    return [{"id": i, "score": 1.0 / (rank + 1), "payload": {"id": i}} for rank, i in enumerate(ids)]
+
+
+def test_first_in_every_list_scores_one():
+    fused = reciprocal_rank_fusion([ranked("a", "b"), ranked("a", "c")])
+
+    assert fused[0]["id"] == "a"
+    assert fused[0]["score"] == 1.0
+
+
+def test_results_in_both_lists_outrank_single_list_results():
+    vector = ranked("a", "b", "c")
+    keyword = ranked("d", "c", "e")
+
+    fused = reciprocal_rank_fusion([vector, keyword])
+
+    assert fused[0]["id"] == "c"
+    assert [r["id"] for r in fused[1:3]] == ["a", "d"]
+    assert all(0 < r["score"] < 1 for r in fused)
+
+
+def test_fused_order_follows_rrf_formula():
+    k = 60
+    fused = reciprocal_rank_fusion([ranked("a", "b"), ranked("b", "a", "c")], k=k)
+    scale = (k + 1) / 2
+
+    expected = {
+        "a": (1 / (k + 1) + 1 / (k + 2)) * scale,
+        "b": (1 / (k + 2) + 1 / (k + 1)) * scale,
+        "c": (1 / (k + 3)) * scale,
+    }
+    assert {r["id"]: r["score"] for r in fused} == pytest.approx(expected, abs=1e-4)
+    assert fused[-1]["id"] == "c"
+
+
+def test_ids_of_different_types_are_merged():
+    fused = reciprocal_rank_fusion([ranked(7), ranked("7")])
+
+    assert len(fused) == 1
+    assert fused[0]["id"] == 7
+    assert fused[0]["score"] == 1.0
+
+
+def test_top_k_and_payload_from_first_occurrence():
+    vector = [{"id": "a", "score": 0.9, "payload": {"source": "vector"}}]
+    keyword = [{"id": "a", "score": 7.1, "payload": {"source": "keyword"}}]
+
+    fused = reciprocal_rank_fusion([vector, keyword, ranked("x", "y", "z")], top_k=2)
+
+    assert len(fused) == 2
+    assert fused[0]["payload"] == {"source": "vector"}
+
+
+def test_empty_inputs():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_tokenize_keeps_section_numbers_whole():
+    terms = tokenize("Section 303(2) of the BNS and IT Act 66C")
+
+    assert "303(2)" in terms
+    assert {"303", "2", "66c", "it", "bns"} <= set(terms)
+    assert "the" not in terms
@@ -0,0 +1,75 @@
+"""
+Tests for the rule-based entity scanner
+"""
+import re
+
+import pytest
+
+from app.ai.entity_scanner import ENTITY_RULES, EntityScanner
+
+
+def finditer_entities(text):
+    """Reference result: one plain re.finditer pass per rule"""
+    entities = []
+    for rule in ENTITY_RULES:
+        pattern = re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+        for match in pattern.finditer(text):
+            value = match.group(0)
+            entities.append((
+                rule.entity_type,
+                "XXXX XXXX " + value[-4:] if rule.mask else value,
+                match.start(),
+                match.end()
+            ))
+    return entities
+
+
+def as_tuples(entities):
+    return [(e.entity_type, e.entity_value, e.start_pos, e.end_pos) for e in entities]
+
+
+@pytest.fixture(scope="module")
+def scanner():
+    return EntityScanner()
+
+
+def test_extracts_each_entity_type(scanner):
+    text = (
+        "On 12/03/2024 someone took Rs. 5,000 from me. Call 9876543210 or mail "
+        "victim@example.com. Aadhaar 1234 5678 9012, PAN ABCDE1234F, vehicle "
+        "MH 12 AB 1234, FIR No. 45/2024, reported on March 14, 2024."
+    )
+    found = {(e.entity_type, e.entity_value) for e in scanner.scan(text)}
+
+    assert ("MONEY", "Rs. 5,000") in found
+    assert ("DATE", "12/03/2024") in found
+    assert ("DATE", "March 14, 2024") in found
+    assert ("PHONE", "9876543210") in found
+    assert ("EMAIL", "victim@example.com") in found
+    assert ("AADHAAR", "XXXX XXXX 9012") in found
+    assert ("PAN", "ABCDE1234F") in found
+    assert ("VEHICLE_NUMBER", "MH 12 AB 1234") in found
+    assert ("CASE_NUMBER", "FIR No. 45/2024") in found
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "No entities here at all.",
+    "inr 250 and INR 1,200.50 and ₹99 were taken",
+    "case 12 complaint number 7/2023 fir 3",
+    "phones +919876543210 09876543210 98765432101234",
+    "dates 2024-1-5 and 5-1-24 and jan 5 2024 and DECEMBER 31, 1999",
+    "İnr 40 and ſep 3, 2021 fold under IGNORECASE",
+    "overlapping 1234 5678 9012 3456 7890 digits",
+    "no at sign so the email rule is skipped: user.example.com",
+])
+def test_matches_plain_finditer(scanner, text):
+    assert as_tuples(scanner.scan(text)) == finditer_entities(text)
+
+
+def test_matches_plain_finditer_on_long_text(scanner):
+    text = " ".join(
+        f"Paid Rs {i},000 on {i % 28 + 1}/0{i % 9 + 1}/2023 to 98765{i:05d}, FIR {i}/2024."
+        for i in range(200)
+    )
+    assert as_tuples(scanner.scan(text)) == finditer_entities(text)
@@ -0,0 +1,57 @@
+"""
+Tests for the keyword trie automaton
+"""
+import re
+
+import pytest
+
+from app.ai.classification import KEYWORD_AUTOMATON
+from app.ai.keyword_automaton import KeywordAutomaton
+
+
+def search_keywords(keywords, text):
+    """Reference result: one regex search per keyword, anchored at a word start"""
+    return {keyword for keyword in keywords if re.search(r"\b" + re.escape(keyword), text)}
+
+
+def test_matches_only_at_word_starts():
+    automaton = KeywordAutomaton(["hit", "harass"])
+
+    assert automaton.find("he hit me") == {"hit"}
+    assert automaton.find("a white car") == set()
+    assert automaton.find("i was harassed daily") == {"harass"}
+
+
+def test_reports_every_keyword_sharing_a_prefix():
+    automaton = KeywordAutomaton(["cheat", "cheating", "cheat on"])
+
+    assert automaton.find("he was cheating customers") == {"cheat", "cheating"}
+    assert automaton.find("did she cheat on the exam") == {"cheat", "cheat on"}
+
+
+def test_multiword_and_punctuated_keywords():
+    automaton = KeywordAutomaton(["credit card", "e-mail", "o.t.p"])
+
+    assert automaton.find("my credit card and e-mail were used, o.t.p shared") == {
+        "credit card", "e-mail", "o.t.p"
+    }
+    assert automaton.find("credit and card") == set()
+
+
+def test_len_and_duplicates():
+    automaton = KeywordAutomaton(["theft", "theft", "robbery"])
+
+    assert len(automaton) == 2
+    assert automaton.keywords == ["robbery", "theft"]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "someone stole my phone and threatened to kill me if i told the police",
+    "online fraud: they asked for my otp and debited money from my bank account",
+    "my husband beats me and demands dowry; yesterday he attacked me with a knife",
+    "the seller refuses to refund for the defective product",
+    "whitehat hitchhiker theftless stalkerware",
+])
+def test_classification_keywords_match_per_keyword_search(text):
+    assert KEYWORD_AUTOMATON.find(text) == search_keywords(KEYWORD_AUTOMATON.keywords, text)
@@ -0,0 +1,159 @@
+"""
+Tests for LLM request scheduling
+"""
+import asyncio
+
+import pytest
+
+from app.ai import llm_scheduler
+from app.ai.llm_scheduler import ProviderScheduler, SchedulerTimeout, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_starts_full_and_refills(clock):
+    bucket = TokenBucket(60)
+
+    assert bucket.wait_time(60) == 0.0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+    clock.now += 30
+    assert bucket.wait_time(30) == 0.0
+    assert bucket.wait_time(31) == pytest.approx(1.0)
+
+
+def test_token_bucket_give_is_capped_at_capacity(clock):
+    bucket = TokenBucket(10)
+    bucket.take(4)
+    bucket.give(100)
+
+    assert bucket.level == 10
+
+
+def test_token_bucket_oversized_request_waits_for_full_bucket(clock):
+    bucket = TokenBucket(10)
+    bucket.take(5)
+
+    # Asking for more than the bucket holds waits for a full bucket, not forever
+    assert bucket.wait_time(1000) == pytest.approx(30.0)
+
+
+async def admitted(task, timeout: float = 0.5) -> bool:
+    """Wait briefly for an acquire task to be admitted"""
+    done, _ = await asyncio.wait([task], timeout=timeout)
+    return bool(done)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_excess_requests():
+    scheduler = ProviderScheduler("test", initial_concurrency=2)
+    first = asyncio.create_task(scheduler.acquire("interactive", 10))
+    second = asyncio.create_task(scheduler.acquire("interactive", 10))
+    third = asyncio.create_task(scheduler.acquire("interactive", 10))
+    assert await admitted(first) and await admitted(second)
+    assert not await admitted(third, timeout=0.05)
+    assert scheduler.stats()["queued"] == 1
+
+    scheduler.release(10, 10, succeeded=True)
+    assert await admitted(third)
+    assert scheduler.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_are_admitted_before_background():
+    scheduler = ProviderScheduler("test", initial_concurrency=1, max_concurrency=1)
+    await scheduler.acquire("interactive", 10)
+
+    background = asyncio.create_task(scheduler.acquire("background", 10))
+    interactive = asyncio.create_task(scheduler.acquire("interactive", 10))
+    await asyncio.sleep(0)
+
+    scheduler.release(10, 10, succeeded=True)
+    assert await admitted(interactive)
+    assert not await admitted(background, timeout=0.05)
+
+    scheduler.release(10, 10, succeeded=True)
+    assert await admitted(background)
+
+
+@pytest.mark.asyncio
+async def test_queued_request_times_out():
+    scheduler = ProviderScheduler("test", initial_concurrency=1, max_wait_seconds=0.05)
+    await scheduler.acquire("interactive", 10)
+
+    with pytest.raises(SchedulerTimeout):
+        await scheduler.acquire("interactive", 10)
+    assert scheduler.stats()["timeouts"] == 1
+    assert scheduler.stats()["queued"] == 0
+    assert scheduler.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_take_a_slot():
+    scheduler = ProviderScheduler("test", initial_concurrency=1)
+    await scheduler.acquire("interactive", 10)
+    waiter = asyncio.create_task(scheduler.acquire("interactive", 10))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    scheduler.release(10, 10, succeeded=True)
+
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_request_budget_delays_admission():
+    # 600 requests per minute: one request every 0.1s once the burst is spent
+    scheduler = ProviderScheduler("test", requests_per_minute=600, initial_concurrency=1000)
+    scheduler.rpm.take(600)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await scheduler.acquire("interactive", 10)
+
+    assert loop.time() - started >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_aimd_limit_grows_on_success_and_halves_on_rate_limit():
+    scheduler = ProviderScheduler("test", initial_concurrency=8, max_concurrency=32)
+    for _ in range(8):
+        await scheduler.acquire("interactive", 10)
+        scheduler.release(10, 10, succeeded=True)
+    assert scheduler.stats()["concurrency_limit"] == 8
+    assert scheduler.limit > 8.9
+
+    await scheduler.acquire("interactive", 10)
+    scheduler.release(10, 0, succeeded=False, rate_limited=True)
+    assert scheduler.stats()["concurrency_limit"] == 4
+    assert scheduler.stats()["rate_limited"] == 1
+
+    # A burst of 429s counts as one decrease
+    await scheduler.acquire("interactive", 10)
+    scheduler.release(10, 0, succeeded=False, rate_limited=True)
+    assert scheduler.stats()["concurrency_limit"] == 4
+
+
+@pytest.mark.asyncio
+async def test_unused_reserved_tokens_are_returned():
+    scheduler = ProviderScheduler("test", tokens_per_minute=1000)
+    await scheduler.acquire("interactive", 400)
+    scheduler.release(400, 100, succeeded=True)
+
+    assert scheduler.tpm.level == pytest.approx(900, abs=1)
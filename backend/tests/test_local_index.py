@@ -0,0 +1,123 @@
+"""
+Tests for the embedded local vector index
+"""
+import numpy as np
+import pytest
+
+from app.ai.local_index import LocalVectorIndex
+
+DIMENSION = 8
+
+
+def random_vectors(count, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, DIMENSION)).astype(np.float32)
+
+
+def make_points(count, seed=0):
+    ids = [f"sec_{i}" for i in range(count)]
+    payloads = [{"section_number": str(i), "offense_type": "theft" if i % 2 else "fraud"} for i in range(count)]
+    return ids, random_vectors(count, seed), payloads
+
+
+def open_index(directory, **kwargs):
+    return LocalVectorIndex(str(directory), dimension=DIMENSION, initial_capacity=4, **kwargs)
+
+
+def test_points_survive_reopen(tmp_path):
+    ids, vectors, payloads = make_points(10)
+    index = open_index(tmp_path)
+    index.upsert(ids, vectors, payloads)
+    expected = index.search(vectors[3], top_k=3)
+
+    reopened = open_index(tmp_path)
+
+    assert len(reopened) == 10
+    assert reopened.points() == list(zip(ids, payloads))
+    assert reopened.search(vectors[3], top_k=3) == expected
+    assert expected[0]["id"] == "sec_3"
+    assert expected[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_upsert_replaces_existing_point_in_place(tmp_path):
+    ids, vectors, payloads = make_points(5)
+    index = open_index(tmp_path)
+    index.upsert(ids, vectors, payloads)
+
+    replacement = random_vectors(1, seed=42)
+    index.upsert(["sec_2"], replacement, [{"section_number": "2", "offense_type": "assault"}])
+    reopened = open_index(tmp_path)
+
+    for current in (index, reopened):
+        assert len(current) == 5
+        assert current.get_payloads(["sec_2"])["sec_2"]["offense_type"] == "assault"
+        assert current.search(replacement[0], top_k=1)[0]["id"] == "sec_2"
+
+
+def test_offense_type_filter(tmp_path):
+    ids, vectors, payloads = make_points(10)
+    index = open_index(tmp_path)
+    index.upsert(ids, vectors, payloads)
+
+    results = open_index(tmp_path).search(vectors[0], offense_type="theft", top_k=10)
+
+    assert {r["id"] for r in results} == {f"sec_{i}" for i in range(1, 10, 2)}
+    assert open_index(tmp_path).search(vectors[0], offense_type="unknown") == []
+
+
+def test_torn_record_is_skipped(tmp_path):
+    ids, vectors, payloads = make_points(3)
+    index = open_index(tmp_path)
+    index.upsert(ids, vectors, payloads)
+
+    # A writer interrupted mid-record leaves an unterminated line
+    with open(tmp_path / "records.jsonl", "ab") as f:
+        f.write(b'{"id": "sec_torn", "row": 3, "pay')
+
+    reopened = open_index(tmp_path)
+    assert len(reopened) == 3
+
+    _, more_vectors, more_payloads = make_points(2, seed=1)
+    reopened.upsert(["sec_a", "sec_b"], more_vectors, more_payloads)
+
+    final = open_index(tmp_path)
+    assert len(final) == 5
+    assert "sec_torn" not in dict(final.points())
+    assert final.search(more_vectors[1], top_k=1)[0]["id"] == "sec_b"
+
+
+def test_second_instance_sees_other_writers(tmp_path):
+    reader = open_index(tmp_path)
+    writer = open_index(tmp_path)
+    ids, vectors, payloads = make_points(20)
+
+    writer.upsert(ids[:10], vectors[:10], payloads[:10])
+    assert reader.search(vectors[4], top_k=1)[0]["id"] == "sec_4"
+
+    # Rows the reader has not seen yet are not handed out again
+    reader.upsert(ids[10:], vectors[10:], payloads[10:])
+    assert len(writer.get_payloads(ids)) == 20
+    assert writer.search(vectors[15], top_k=1)[0]["id"] == "sec_15"
+
+
+def test_int8_codes_survive_reopen(tmp_path):
+    ids, vectors, payloads = make_points(50)
+    index = open_index(tmp_path, quantization="int8", quantization_min_points=0)
+    index.upsert(ids, vectors, payloads)
+
+    reopened = open_index(tmp_path, quantization="int8", quantization_min_points=0)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    for i in (0, 17, 49):
+        exact_ids = [ids[row] for row in np.argsort(-(normalized @ normalized[i]))[:5]]
+        assert [r["id"] for r in reopened.search(vectors[i], top_k=5)] == exact_ids
+
+
+def test_quantization_off_drops_stale_codes(tmp_path):
+    ids, vectors, payloads = make_points(5)
+    open_index(tmp_path, quantization="int8").upsert(ids, vectors, payloads)
+    assert (tmp_path / "vectors.i8").exists()
+
+    open_index(tmp_path)
+
+    assert not (tmp_path / "vectors.i8").exists()
+    assert not (tmp_path / "scales.f32").exists()
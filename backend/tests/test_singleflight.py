@@ -0,0 +1,116 @@
+"""
+Tests for single-flight request coalescing
+"""
+import asyncio
+
+import pytest
+
+from app.ai.singleflight import SingleFlight
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def work(self, value="result"):
+        self.calls += 1
+        await self.release.wait()
+        return value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    counter = Counter()
+
+    tasks = [asyncio.create_task(flight.do("key", counter.work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    counter.release.set()
+
+    assert await asyncio.gather(*tasks) == ["result"] * 5
+    assert counter.calls == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 4, "inflight": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    counter = Counter()
+    counter.release.set()
+
+    results = await asyncio.gather(
+        flight.do("a", lambda: counter.work("a")),
+        flight.do("b", lambda: counter.work("b"))
+    )
+
+    assert results == ["a", "b"]
+    assert counter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_finished_key_runs_again():
+    flight = SingleFlight()
+    counter = Counter()
+    counter.release.set()
+
+    await flight.do("key", counter.work)
+    await flight.do("key", counter.work)
+
+    assert counter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise ValueError("provider down")
+
+    tasks = [asyncio.create_task(flight.do("key", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    counter = Counter()
+
+    leader = asyncio.create_task(flight.do("key", counter.work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", counter.work))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    counter.release.set()
+
+    assert await follower == "result"
+    assert counter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_copy_results_gives_followers_their_own_copy():
+    flight = SingleFlight(copy_results=True)
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return {"sections": []}
+
+    leader = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    release.set()
+
+    leader_result, follower_result = await asyncio.gather(leader, follower)
+    follower_result["sections"].append("mutated")
+
+    assert leader_result == {"sections": []}